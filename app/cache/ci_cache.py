@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import logging, settings
+from app.models.responses import CiMetadata, CiMetadataRecord
+
+logger = logging.getLogger(__name__)
+
+
+class CiCache:
+    """
+    In-memory cache of CI metadata and schemas shared by all requests handled by a worker.
+
+    Entries expire after `ttl_seconds` so that changes made by other instances are eventually
+    picked up. Schemas are keyed by their bucket location and bounded to `max_schemas` entries,
+    evicting the least recently used schema first. A schema stored gzip compressed can be cached together with
+    its stored bytes, so it can be sent to clients accepting gzip without being compressed again.
+    """
+
+    def __init__(self, enabled: bool, ttl_seconds: int, max_schemas: int) -> None:
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_schemas = max_schemas
+        self.warm = False
+        # Set once the first pre-warm has finished, whether it succeeded or is being retried
+        self.prewarm_attempted = False
+        self._lock = threading.Lock()
+        self._metadata: dict[str, tuple[float, CiMetadata]] = {}
+        self._latest: dict[tuple[str, str, str, str], tuple[float, CiMetadata]] = {}
+        self._schemas: OrderedDict[str, tuple[float, tuple[dict, bytes | None]]] = OrderedDict()
+
+    @staticmethod
+    def latest_key(survey_id: str, classifier_type: str, classifier_value: str, language: str) -> tuple[str, str, str, str]:
+        """
+        Build the key identifying the latest version of a CI
+
+        Parameters:
+        survey_id (str): the survey id of the CI.
+        classifier_type (str): the classifier type of the CI.
+        classifier_value (str): the classifier value of the CI.
+        language (str): the language of the CI.
+        """
+        return (survey_id, str(classifier_type), classifier_value, language)
+
+    def get_metadata(self, guid: str) -> CiMetadata | None:
+        """
+        Get cached CI metadata by guid, returning a copy so callers can safely modify it
+
+        Parameters:
+        guid (str): the guid of the CI metadata.
+        """
+        with self._lock:
+            entry = self._get_live_entry(self._metadata, guid)
+        return entry.model_copy() if entry else None
+
+    def put_metadata(self, ci_metadata: CiMetadata) -> None:
+        """
+        Cache CI metadata by guid
+
+        Parameters:
+        ci_metadata (CiMetadata): the CI metadata being cached.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._metadata[ci_metadata.guid] = (self._expiry(), ci_metadata.model_copy())
+
+    def get_latest(self, survey_id: str, classifier_type: str, classifier_value: str, language: str) -> CiMetadata | None:
+        """
+        Get the cached metadata of the latest CI version
+
+        Parameters:
+        survey_id (str): the survey id of the CI.
+        classifier_type (str): the classifier type of the CI.
+        classifier_value (str): the classifier value of the CI.
+        language (str): the language of the CI.
+        """
+        key = self.latest_key(survey_id, classifier_type, classifier_value, language)
+        with self._lock:
+            entry = self._get_live_entry(self._latest, key)
+        return entry.model_copy() if entry else None
+
+    def put_latest(self, ci_metadata: CiMetadata) -> None:
+        """
+        Cache CI metadata as the latest version for its survey, classifier and language
+
+        Parameters:
+        ci_metadata (CiMetadata): the CI metadata being cached.
+        """
+        if not self.enabled:
+            return
+        key = self.latest_key(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        with self._lock:
+            self._latest[key] = (self._expiry(), ci_metadata.model_copy())
+
+    def get_schema(self, location: str) -> dict | None:
+        """
+        Get a cached CI schema by its bucket location
+
+        Parameters:
+        location (str): the bucket location of the schema.
+        """
+        entry = self._get_schema_entry(location)
+        return entry[0] if entry else None
+
+    def get_gzipped_schema(self, location: str) -> bytes | None:
+        """
+        Get the stored bytes of a cached CI schema by its bucket location, if it was cached stored gzipped
+
+        Parameters:
+        location (str): the bucket location of the schema.
+        """
+        entry = self._get_schema_entry(location)
+        return entry[1] if entry else None
+
+    def put_schema(self, location: str, schema: dict, gzipped_schema: bytes | None = None) -> None:
+        """
+        Cache a CI schema by its bucket location, evicting the least recently used schema if full
+
+        Parameters:
+        location (str): the bucket location of the schema.
+        schema (dict): the CI schema being cached.
+        gzipped_schema (bytes | None): the stored bytes of the schema, if it was stored gzip compressed.
+        """
+        if not self.enabled or self.max_schemas <= 0:
+            return
+        with self._lock:
+            self._schemas[location] = (self._expiry(), (schema, gzipped_schema))
+            self._schemas.move_to_end(location)
+            while len(self._schemas) > self.max_schemas:
+                self._schemas.popitem(last=False)
+
+    def invalidate_metadata(self, ci_metadata: CiMetadata | CiMetadataRecord) -> None:
+        """
+        Remove CI metadata from the cache, including the latest version entry if it refers to the same CI
+
+        Parameters:
+        ci_metadata (CiMetadata | CiMetadataRecord): the CI metadata being invalidated.
+        """
+        key = self.latest_key(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        with self._lock:
+            self._metadata.pop(ci_metadata.guid, None)
+            latest = self._latest.get(key)
+            if latest and latest[1].guid == ci_metadata.guid:
+                del self._latest[key]
+
+    def invalidate_latest(self, ci_metadata: CiMetadata | CiMetadataRecord) -> None:
+        """
+        Remove the latest version entry for the survey, classifier and language of a CI, whichever CI it refers to
+
+        Parameters:
+        ci_metadata (CiMetadata | CiMetadataRecord): the CI metadata whose latest version entry is being invalidated.
+        """
+        key = self.latest_key(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        with self._lock:
+            self._latest.pop(key, None)
+
+    def invalidate_schema(self, location: str) -> None:
+        """
+        Remove a CI schema from the cache
+
+        Parameters:
+        location (str): the bucket location of the schema.
+        """
+        with self._lock:
+            self._schemas.pop(location, None)
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache and mark it as cold and not yet pre-warmed
+        """
+        with self._lock:
+            self._metadata.clear()
+            self._latest.clear()
+            self._schemas.clear()
+            self.warm = False
+            self.prewarm_attempted = False
+
+    def _get_schema_entry(self, location: str) -> tuple[dict, bytes | None] | None:
+        """
+        For internal use only - returns the cached schema and stored bytes at `location`, marking them as the
+        most recently used
+        """
+        with self._lock:
+            entry = self._get_live_entry(self._schemas, location)
+            if entry is not None:
+                self._schemas.move_to_end(location)
+        return entry
+
+    def _expiry(self) -> float:
+        return time.monotonic() + self.ttl_seconds
+
+    def _get_live_entry(self, entries: dict, key):
+        """
+        For internal use only - returns the cached value for `key`, dropping it if it has expired.
+        Must be called while holding the lock.
+        """
+        if not self.enabled:
+            return None
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        return value
+
+
+ci_cache = CiCache(
+    enabled=settings.CI_CACHE_ENABLED,
+    ttl_seconds=settings.CI_CACHE_TTL_SECONDS,
+    max_schemas=settings.CI_CACHE_MAX_SCHEMAS,
+)
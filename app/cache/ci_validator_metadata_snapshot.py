@@ -0,0 +1,106 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.config import logging, settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ValidatorMetadataSnapshot:
+    """The validator metadata of every CI, serialised as a json response body"""
+
+    content: bytes
+    row_count: int
+    built_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.built_at
+
+
+class CiValidatorMetadataSnapshotCache:
+    """
+    Holds the latest snapshot of the validator metadata of every CI shared by all requests handled by a worker.
+
+    A snapshot older than `refresh_seconds` is still served while a single background thread rebuilds it, so
+    requests only wait for a build when there is no snapshot yet or it has been invalidated by a CI change.
+    """
+
+    def __init__(self, enabled: bool, refresh_seconds: int) -> None:
+        self.enabled = enabled
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._snapshot: ValidatorMetadataSnapshot | None = None
+        # Bumped on invalidation, so a snapshot built from data read before a change is never kept
+        self._generation = 0
+
+    def get(self, build: Callable[[], ValidatorMetadataSnapshot]) -> ValidatorMetadataSnapshot:
+        """
+        Get the current snapshot, building it if there is none and starting a rebuild if it is stale
+
+        Parameters:
+        build (Callable[[], ValidatorMetadataSnapshot]): reads the validator metadata and serialises it.
+        """
+        if not self.enabled:
+            return build()
+
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            return self._rebuild(build)
+
+        if snapshot.age_seconds >= self.refresh_seconds and self._build_lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild_in_background, args=(build,), daemon=True).start()
+        return snapshot
+
+    def invalidate(self) -> None:
+        """
+        Drop the current snapshot, so the next request waits for one that includes the latest changes
+        """
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _rebuild(self, build: Callable[[], ValidatorMetadataSnapshot]) -> ValidatorMetadataSnapshot:
+        """
+        For internal use only - builds a snapshot, unless another request built one while this one waited
+        """
+        with self._build_lock:
+            with self._lock:
+                if self._snapshot is not None:
+                    return self._snapshot
+            return self._build_and_store(build)
+
+    def _rebuild_in_background(self, build: Callable[[], ValidatorMetadataSnapshot]) -> None:
+        """
+        For internal use only - rebuilds a stale snapshot, with the build lock already held by the caller
+        """
+        try:
+            self._build_and_store(build)
+        except Exception as exc:
+            logger.error("Rebuilding validator metadata snapshot: exception raised: %s", exc)
+        finally:
+            self._build_lock.release()
+
+    def _build_and_store(self, build: Callable[[], ValidatorMetadataSnapshot]) -> ValidatorMetadataSnapshot:
+        """
+        For internal use only - must be called while holding the build lock
+        """
+        with self._lock:
+            generation = self._generation
+        snapshot = build()
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+        logger.info("Validator metadata snapshot built with %s CIs", snapshot.row_count)
+        return snapshot
+
+
+ci_validator_metadata_snapshot = CiValidatorMetadataSnapshotCache(
+    enabled=settings.CI_VALIDATOR_METADATA_SNAPSHOT_ENABLED,
+    refresh_seconds=settings.CI_VALIDATOR_METADATA_SNAPSHOT_REFRESH_SECONDS,
+)
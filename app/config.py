@@ -1,13 +1,26 @@
-import logging
+import logging  # noqa: F401 - re-exported so modules can use `from app.config import logging`
 
 from pydantic_settings import BaseSettings
 
+from app.telemetry.structured_logging import configure_logging
+
 
 class Settings(BaseSettings):
     """Application settings"""
 
     CONF: str = ""
     CI_FIRESTORE_COLLECTION_NAME: str = "ons-collection-instruments"
+    # Deleted CI metadata kept for the change feed, expired by a firestore TTL policy on `expire_at`
+    CI_TOMBSTONE_FIRESTORE_COLLECTION_NAME: str = "ons-collection-instrument-tombstones"
+    CI_TOMBSTONE_RETENTION_DAYS: int = 30
+    # Holds the last position given to a change in the change feed, which every change reserves in its transaction
+    CI_CHANGE_SEQUENCE_FIRESTORE_COLLECTION_NAME: str = "ons-collection-instrument-change-sequence"
+    # Default and maximum number of changes returned by the change feed
+    CI_CHANGES_PAGE_SIZE: int = 500
+    # The metadata of the latest version of each CI, kept up to date when CIs are created and deleted
+    CI_LATEST_FIRESTORE_COLLECTION_NAME: str = "ons-collection-instrument-latest"
+    # A summary of the CIs of each survey, kept up to date when CIs are created, updated and deleted
+    CI_SURVEY_SUMMARY_FIRESTORE_COLLECTION_NAME: str = "ons-collection-instrument-survey-summaries"
     CI_STORAGE_BUCKET_NAME: str = "emulated-ci-bucket"
     DEFAULT_HOSTNAME: str = "only required for integration tests"
     FIRESTORE_DB_NAME: str = "(default)"
@@ -19,14 +32,79 @@ class Settings(BaseSettings):
     FIRESTORE_EMULATOR_HOST: str = "only required for local development environment"
     SUBSCRIPTION_ID: str = "ons-cir-subscription-cir"
     PUBLISH_CI_TOPIC_ID: str = "ons-cir-publish-ci"
+    # Publish CI validator version updates and deletes to `PUBLISH_CI_TOPIC_ID` as well as new CIs
+    CI_CHANGE_EVENTS_ENABLED: bool = False
+    # Client side batching of published messages
+    PUBSUB_BATCH_MAX_MESSAGES: int = 100
+    PUBSUB_BATCH_MAX_LATENCY_SECONDS: float = 0.01
     URL_SCHEME: str = "only required for integration tests"
     CIR_APPLICATION_VERSION: str = "development"
+    # In-memory caching of CI metadata and schemas
+    CI_CACHE_ENABLED: bool = False
+    CI_CACHE_TTL_SECONDS: int = 300
+    CI_CACHE_MAX_SCHEMAS: int = 100
+    CI_CACHE_PREWARM_ENABLED: bool = False
+    CI_CACHE_PREWARM_SCHEMA_COUNT: int = 0
+    # Delay before retrying a failed pre-warm in the background, doubled after each failure up to the maximum
+    CI_CACHE_PREWARM_RETRY_SECONDS: float = 5
+    CI_CACHE_PREWARM_RETRY_MAX_SECONDS: float = 300
+    # Invalidate the cache from CI change events published by other instances to `PUBLISH_CI_TOPIC_ID`, which
+    # also enables publishing change events
+    CI_CACHE_INVALIDATION_ENABLED: bool = False
+    # Serve the validator metadata of every CI from an in-memory snapshot, rebuilt in the background once it is
+    # older than the refresh interval and dropped when a CI changes
+    CI_VALIDATOR_METADATA_SNAPSHOT_ENABLED: bool = False
+    CI_VALIDATOR_METADATA_SNAPSHOT_REFRESH_SECONDS: int = 60
+    # Dependency probes for the `/ready` endpoint
+    READINESS_MAX_PROBE_LATENCY_MS: int = 1000
+    # OpenTelemetry tracing, exported via OTLP to `OTEL_EXPORTER_OTLP_ENDPOINT`
+    OTEL_TRACING_ENABLED: bool = False
+    OTEL_SERVICE_NAME: str = "cir"
+    # Log output, `text` or `json`, with long messages truncated and DEBUG records sampled
+    LOG_FORMAT: str = "text"
+    LOG_MAX_PAYLOAD_CHARS: int = 10000
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+    # Format of schemas written to the bucket: `json-pretty`, `json`, `gzip` or `zstd`
+    CI_SCHEMA_STORAGE_CODEC: str = "json-pretty"
+    CI_SCHEMA_COMPRESSION_LEVEL: int = 6
+    # Let schema downloads be redirected to a short-lived V4 signed url of the stored schema, signed locally with
+    # the private key of the service account key file `CI_SCHEMA_SIGNING_KEY_FILE`
+    CI_SCHEMA_SIGNED_URL_ENABLED: bool = False
+    CI_SCHEMA_SIGNING_KEY_FILE: str = ""
+    CI_SCHEMA_SIGNED_URL_EXPIRATION_SECONDS: int = 300
+    # Also store these top-level fields of posted CIs as separate blobs under `<guid>/`, with a manifest of the
+    # remaining fields, so requests for parts of a schema only download the blobs they need
+    CI_SCHEMA_SPLIT_STORAGE_ENABLED: bool = False
+    CI_SCHEMA_SPLIT_FIELDS: list[str] = ["sections", "metadata", "navigation", "questionnaire_flow"]
+    # Store posted schemas once per distinct content, as `schemas/<sha256>.json`, shared by every CI with that
+    # content. Blobs no longer referenced are removed by `make collect-unreferenced-ci-schemas`
+    CI_SCHEMA_CONTENT_ADDRESSED_ENABLED: bool = False
+    # Size of each part of a streamed CI upload held in memory before it is sent to the bucket, a multiple of 256 KiB
+    CI_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # Compression of responses of at least `RESPONSE_COMPRESSION_MINIMUM_SIZE` bytes
+    RESPONSE_COMPRESSION_ENABLED: bool = False
+    RESPONSE_COMPRESSION_MINIMUM_SIZE: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4
+    # Server profile used by `app.server`, `production` or `development`
+    SERVER_PROFILE: str = "production"
+    SERVER_HOST: str = "0.0.0.0"  # noqa: S104 - the server runs in a container
+    PORT: int = 3030
+    # Each worker has its own cache, pre-warmed separately, so memory use and startup reads grow with the count
+    SERVER_WORKERS: int = 1
+    SERVER_BACKLOG: int = 2048
+    # Longer than the 600 second keep-alive of Google Cloud load balancers, so they never reuse a closed connection
+    SERVER_KEEP_ALIVE_SECONDS: int = 620
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 10
+    SERVER_ACCESS_LOG: bool = False
 
 
 settings = Settings()
 
 
-logging.basicConfig(
+configure_logging(
     level=settings.LOG_LEVEL,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    log_format=settings.LOG_FORMAT,
+    max_payload_chars=settings.LOG_MAX_PAYLOAD_CHARS,
+    debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE,
 )
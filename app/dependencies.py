@@ -1,23 +1,47 @@
+from functools import lru_cache
+
 from fastapi import Depends
-from google.cloud import firestore, storage
-from google.cloud.pubsub_v1 import PublisherClient
 
 from app.config import settings
 from app.events.publisher import Publisher
+from app.events.subscriber import CiEventSubscriber
 from app.repositories.buckets.bucket_loader import BucketLoader
 from app.repositories.firebase.firebase_loader import FirebaseLoader
 from app.services.ci_processor_service import CiProcessorService
 
 
+# Clients are pooled per worker: they hold gRPC channels and HTTP connection pools that are
+# expensive to establish, so they are created on first use and shared by every request.
+# The google cloud libraries are slow to import, so they are also only imported on first use.
+@lru_cache(maxsize=1)
 def get_publisher_service() -> Publisher:
-    return Publisher(PublisherClient())
+    from google.cloud.pubsub_v1 import PublisherClient, types  # noqa: PLC0415
+
+    batch_settings = types.BatchSettings(
+        max_messages=settings.PUBSUB_BATCH_MAX_MESSAGES,
+        max_latency=settings.PUBSUB_BATCH_MAX_LATENCY_SECONDS,
+    )
+    return Publisher(PublisherClient(batch_settings=batch_settings))
+
+
+@lru_cache(maxsize=1)
+def get_ci_event_subscriber() -> CiEventSubscriber:
+    from google.cloud.pubsub_v1 import SubscriberClient  # noqa: PLC0415
 
+    return CiEventSubscriber(SubscriberClient())
 
+
+@lru_cache(maxsize=1)
 def get_bucket_loader() -> BucketLoader:
+    from google.cloud import storage  # noqa: PLC0415
+
     return BucketLoader(storage.Client(project=settings.PROJECT_ID))
 
 
+@lru_cache(maxsize=1)
 def get_firebase_loader() -> FirebaseLoader:
+    from google.cloud import firestore  # noqa: PLC0415
+
     return FirebaseLoader(firestore.Client(project=settings.PROJECT_ID, database=settings.FIRESTORE_DB_NAME))
 
 
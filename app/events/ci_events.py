@@ -0,0 +1,18 @@
+import uuid
+from enum import StrEnum
+
+
+class CiEventType(StrEnum):
+    """
+    Values of the `event_type` attribute of messages published to the CI topic. Messages published before the
+    attribute was added are `CREATED` events.
+    """
+
+    CREATED = "ci_created"
+    UPDATED = "ci_updated"
+    DELETED = "ci_deleted"
+
+
+# Identifies the worker process that published a message, in the `origin` attribute, so a worker can ignore
+# its own events
+INSTANCE_ID = uuid.uuid4().hex[:12]
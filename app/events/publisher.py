@@ -1,21 +1,25 @@
 import json
-
-from google.cloud import exceptions
-from google.cloud.pubsub_v1 import PublisherClient
-from google.cloud.pubsub_v1.publisher import exceptions as pubsub_exceptions
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
 from app.config import logging, settings
+from app.events.ci_events import INSTANCE_ID, CiEventType
 from app.exception.exceptions import ExceptionTopicNotFound
-from app.models.responses import CiMetadata
+from app.models.responses import CiMetadata, CiMetadataRecord
+from app.telemetry.metrics import observe_backend_latency
+from app.telemetry.tracing import set_span_attributes, traced
+
+if TYPE_CHECKING:
+    from google.cloud.pubsub_v1 import PublisherClient
 
 logger = logging.getLogger(__name__)
 
 
 class Publisher:
     """Methods to publish pub/sub messages using the `pubsub_v1.PublisherClient()`"""
-    publisher_client: PublisherClient
+    publisher_client: "PublisherClient"
 
-    def __init__(self, publisher_client: PublisherClient) -> None:
+    def __init__(self, publisher_client: "PublisherClient") -> None:
         self.publisher_client = publisher_client
 
         topic_path = self.publisher_client.topic_path(settings.PROJECT_ID, settings.PUBLISH_CI_TOPIC_ID)
@@ -24,35 +28,96 @@ class Publisher:
         if settings.CONF == "local-docker" and not self._verify_topic_exists(topic_path):
             self._create_topic(topic_path)
 
-    def publish_message(self, event_msg: CiMetadata) -> None:
-        """Publishes an event message to a Pub/Sub topic."""
+    @traced("Publisher")
+    @observe_backend_latency("Publisher")
+    def publish_message(
+        self, event_msg: CiMetadata | CiMetadataRecord, event_type: CiEventType = CiEventType.CREATED
+    ) -> None:
+        """
+        Publishes an event message to a Pub/Sub topic.
+
+        Parameters:
+        event_msg (CiMetadata | CiMetadataRecord): the metadata of the CI the event is about.
+        event_type (CiEventType): the type of change, sent in the `event_type` attribute.
+        """
 
         # Get the topic path
         topic_path = self.publisher_client.topic_path(settings.PROJECT_ID, settings.PUBLISH_CI_TOPIC_ID)
         # Verify if the topic exists - if not, raise an exception
         self._verify_topic_exists(topic_path)
 
-        # Convert the event object to a JSON string using `model_dump`, which excludes `sds_schema`
-        # key if this field is not filled
-        data_str = json.dumps(event_msg.model_dump())
+        message_size = self._publish(topic_path, [event_msg], event_type)
+        set_span_attributes(guid=event_msg.guid, message_size=message_size, event_type=event_type)
+
+    @traced("Publisher")
+    @observe_backend_latency("Publisher")
+    def publish_messages(
+        self, event_msgs: Sequence[CiMetadata | CiMetadataRecord], event_type: CiEventType
+    ) -> None:
+        """
+        Publishes event messages of the same type to a Pub/Sub topic. The messages are all handed to the client
+        before waiting for any of them, so they are sent in as few requests as the client's batch settings allow.
+
+        Parameters:
+        event_msgs (Sequence[CiMetadata | CiMetadataRecord]): the metadata of the CIs the events are about.
+        event_type (CiEventType): the type of change, sent in the `event_type` attribute of every message.
+        """
+        if not event_msgs:
+            return
+
+        topic_path = self.publisher_client.topic_path(settings.PROJECT_ID, settings.PUBLISH_CI_TOPIC_ID)
+        self._verify_topic_exists(topic_path)
+
+        message_size = self._publish(topic_path, event_msgs, event_type)
+        set_span_attributes(message_count=len(event_msgs), message_size=message_size, event_type=event_type)
+
+    @traced("Publisher")
+    @observe_backend_latency("Publisher")
+    def topic_exists(self) -> bool:
+        """
+        Checks the publish topic can be reached, raising `ExceptionTopicNotFound` if it does not exist.
+        """
+        topic_path = self.publisher_client.topic_path(settings.PROJECT_ID, settings.PUBLISH_CI_TOPIC_ID)
+        return self._verify_topic_exists(topic_path)
 
-        # Data must be a bytestring
-        data = data_str.encode("utf-8")
+    def _publish(
+        self, topic_path: str, event_msgs: Sequence[CiMetadata | CiMetadataRecord], event_type: CiEventType
+    ) -> int:
+        """
+        For internal use only - publishes the event messages and waits until all of them have been published,
+        returning their total size in bytes.
+        """
+        # Deferred to keep startup fast
+        from google.cloud.pubsub_v1.publisher import exceptions as pubsub_exceptions  # noqa: PLC0415
 
-        # Publishes a message
+        message_size = 0
         try:
-            future = self.publisher_client.publish(topic_path, data=data)
-            result = future.result()  # Verify the publishing succeeded
-            logger.debug(f"Message published. {result}")
+            futures = []
+            for event_msg in event_msgs:
+                # Convert the event object to a JSON string using `model_dump`, which excludes `sds_schema`
+                # key if this field is not filled. Data must be a bytestring
+                data = json.dumps(event_msg.model_dump()).encode("utf-8")
+                message_size += len(data)
+                futures.append(
+                    self.publisher_client.publish(
+                        topic_path, data=data, event_type=event_type.value, origin=INSTANCE_ID
+                    )
+                )
+            for future in futures:
+                result = future.result()  # Verify the publishing succeeded
+                logger.debug("Message published. %s", result)
         except (RuntimeError, pubsub_exceptions.MessageTooLargeError) as exc:
             logger.debug(exc)
 
             raise RuntimeError("Error publishing message") from exc
+        return message_size
 
     def _verify_topic_exists(self, topic_path: str) -> bool:
         """
         If the topic does not exist raises 500 global error.
         """
+        from google.cloud import exceptions  # noqa: PLC0415 - deferred to keep startup fast
+
         try:
             self.publisher_client.get_topic(request={"topic": topic_path})
             return True
@@ -67,4 +132,4 @@ class Publisher:
     def _create_topic(self, topic_path: str) -> None:
         """Creates a Pub/Sub topic."""
         self.publisher_client.create_topic(request={"name": topic_path})
-        logger.debug(f"Topic created: {topic_path}")
+        logger.debug("Topic created: %s", topic_path)
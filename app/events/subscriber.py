@@ -0,0 +1,98 @@
+import json
+from typing import TYPE_CHECKING
+
+from app.cache.ci_cache import ci_cache
+from app.cache.ci_validator_metadata_snapshot import ci_validator_metadata_snapshot
+from app.config import logging, settings
+from app.events.ci_events import INSTANCE_ID, CiEventType
+from app.models.responses import CiMetadataRecord
+from app.services.ci_schema_location_service import CiSchemaLocationService
+
+if TYPE_CHECKING:
+    from google.cloud.pubsub_v1 import SubscriberClient
+    from google.cloud.pubsub_v1.subscriber.futures import StreamingPullFuture
+    from google.cloud.pubsub_v1.subscriber.message import Message
+
+logger = logging.getLogger(__name__)
+
+# Subscriptions left behind by workers that did not shut down cleanly are deleted by Pub/Sub after a day idle
+SUBSCRIPTION_EXPIRATION_TTL = {"seconds": 24 * 60 * 60}
+# Events are only useful while the cached entries they invalidate could still be live
+SUBSCRIPTION_MESSAGE_RETENTION = {"seconds": 10 * 60}
+
+
+class CiEventSubscriber:
+    """
+    Streaming pull subscriber invalidating the CI cache of this worker when a CI is created, updated or deleted
+    by another worker.
+
+    Every worker needs to see every event, so each one creates its own subscription to `PUBLISH_CI_TOPIC_ID`,
+    filtered to leave out the events it published itself, and deletes it when it stops.
+    """
+
+    subscriber_client: "SubscriberClient"
+
+    def __init__(self, subscriber_client: "SubscriberClient") -> None:
+        self.subscriber_client = subscriber_client
+        self.subscription_path = self.subscriber_client.subscription_path(
+            settings.PROJECT_ID, f"{settings.SUBSCRIPTION_ID}-cache-{INSTANCE_ID}"
+        )
+        self._streaming_pull_future: StreamingPullFuture | None = None
+
+    def start(self) -> None:
+        """
+        Create this worker's subscription and start receiving events on the client's background threads
+        """
+        topic_path = self.subscriber_client.topic_path(settings.PROJECT_ID, settings.PUBLISH_CI_TOPIC_ID)
+        self.subscriber_client.create_subscription(
+            request={
+                "name": self.subscription_path,
+                "topic": topic_path,
+                "filter": f'attributes.origin != "{INSTANCE_ID}"',
+                "expiration_policy": {"ttl": SUBSCRIPTION_EXPIRATION_TTL},
+                "message_retention_duration": SUBSCRIPTION_MESSAGE_RETENTION,
+            }
+        )
+        self._streaming_pull_future = self.subscriber_client.subscribe(
+            self.subscription_path, callback=self.handle_message
+        )
+        logger.info("Subscribed to CI events: %s", self.subscription_path)
+
+    def stop(self) -> None:
+        """
+        Stop receiving events and delete this worker's subscription
+        """
+        if self._streaming_pull_future is not None:
+            self._streaming_pull_future.cancel()
+            self._streaming_pull_future = None
+        try:
+            self.subscriber_client.delete_subscription(request={"subscription": self.subscription_path})
+        except Exception as exc:
+            logger.warning("Deleting subscription %s: exception raised: %s", self.subscription_path, exc)
+        self.subscriber_client.close()
+
+    def handle_message(self, message: "Message") -> None:
+        """
+        Invalidate the cache entries affected by a CI event. A new CI version only replaces the cached latest
+        version, while an updated or deleted CI also drops its own metadata and schema. Every event drops the
+        validator metadata snapshot. Messages are always
+        acknowledged, as redelivering an event that could not be handled would not change the outcome.
+
+        Parameters:
+        message (Message): the received Pub/Sub message, with the CI metadata as its data.
+        """
+        try:
+            event_type = message.attributes.get("event_type", CiEventType.CREATED)
+            ci_metadata = CiMetadataRecord.from_document(json.loads(message.data))
+
+            if event_type == CiEventType.CREATED:
+                ci_cache.invalidate_latest(ci_metadata)
+            else:
+                ci_cache.invalidate_metadata(ci_metadata)
+                ci_cache.invalidate_schema(CiSchemaLocationService.get_ci_schema_location(ci_metadata))
+            ci_validator_metadata_snapshot.invalidate()
+            logger.debug("CI cache invalidated by %s event for %s", event_type, ci_metadata.guid)
+        except Exception as exc:
+            logger.error("Handling CI event: exception raised: %s", exc)
+        finally:
+            message.ack()
@@ -1,47 +1,47 @@
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 import app.exception.exception_response_models as erm
 from app.exception.exception_responder import ExceptionResponder
 
 
 class ExceptionInterceptor:
-    def throw_500_global_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_500_global_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When an exception is raised and a global error 500 HTTP response is returned.
         """
         er = ExceptionResponder(status.HTTP_500_INTERNAL_SERVER_ERROR, erm.erm_500_global_exception)
         return er.throw_er_with_json()
 
-    def throw_400_validation_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_validation_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When a validation fails and a 400 HTTP response is returned.
         """
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_validation_exception)
         return er.throw_er_with_json()
 
-    def throw_404_no_ci_metadata_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_404_no_ci_metadata_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is no schema metadata and a 404 HTTP response is returned.
         """
         er = ExceptionResponder(status.HTTP_404_NOT_FOUND, erm.erm_404_no_results_exception)
         return er.throw_er_with_json()
 
-    def throw_404_no_ci_validator_metadata_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_404_no_ci_validator_metadata_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is no CI validator metadata and a 404 HTTP response is returned.
         """
         er = ExceptionResponder(status.HTTP_404_NOT_FOUND, erm.erm_404_no_ci_validator_metadata_exception)
         return er.throw_er_with_json()
 
-    def throw_400_no_validator_provided_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_no_validator_provided_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is no validator version provided a 400 HTTP response is returned.
         """
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_no_validator_version_exception)
         return er.throw_er_with_json()
 
-    def throw_404_no_ci_to_delete(request: Request, exc: Exception) -> JSONResponse:
+    def throw_404_no_ci_to_delete(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is No CI found and a 404 HTTP response is returned
         Triggered when either schema metadata or schema json file is not found
@@ -49,7 +49,7 @@ class ExceptionInterceptor:
         er = ExceptionResponder(status.HTTP_404_NOT_FOUND, erm.erm_404_no_ci_to_delete)
         return er.throw_er_with_json()
 
-    def throw_404_no_ci_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_404_no_ci_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is No CI found and a 404 HTTP response is returned
         Triggered when either schema metadata or schema json file is not found
@@ -57,7 +57,7 @@ class ExceptionInterceptor:
         er = ExceptionResponder(status.HTTP_404_NOT_FOUND, erm.erm_404_no_ci_exception)
         return er.throw_er_with_json()
 
-    def throw_400_invalid_clasifier_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_invalid_clasifier_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is No CI found and a 404 HTTP response is returned
         Triggered when either schema metadata or schema json file is not found
@@ -65,7 +65,7 @@ class ExceptionInterceptor:
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_invalid_classifier)
         return er.throw_er_with_json()
 
-    def throw_400_incorrect_key_names_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_incorrect_key_names_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is No CI found and a 400 HTTP response is returned
         Triggered when either schema metadata or schema json file is not found
@@ -73,19 +73,33 @@ class ExceptionInterceptor:
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_incorrect_key_names_exception)
         return er.throw_er_with_json()
 
-    def throw_400_invalid_guid_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_invalid_guid_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is no GUID found and a 400 HTTP response is returned
         """
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_invalid_guid_exception)
         return er.throw_er_with_json()
 
-    def throw_400_ci_version_invalid_exception(request: Request, exc: Exception) -> JSONResponse:
+    def throw_400_ci_version_invalid_exception(request: Request, exc: Exception) -> ORJSONResponse:
         """
         When there is no valid CI found and a 400 HTTP response is returned
         """
         er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_invalid_ci_version_exception)
         return er.throw_er_with_json()
 
+    def throw_400_invalid_json_pointer_exception(request: Request, exc: Exception) -> ORJSONResponse:
+        """
+        When a requested CI field is not a valid JSON Pointer and a 400 HTTP response is returned
+        """
+        er = ExceptionResponder(status.HTTP_400_BAD_REQUEST, erm.erm_400_invalid_json_pointer_exception)
+        return er.throw_er_with_json()
+
+    def throw_404_no_ci_field_exception(request: Request, exc: Exception) -> ORJSONResponse:
+        """
+        When a requested CI field is not found in the CI schema and a 404 HTTP response is returned
+        """
+        er = ExceptionResponder(status.HTTP_404_NOT_FOUND, erm.erm_404_no_ci_field_exception)
+        return er.throw_er_with_json()
+
 
 exception_interceptor = ExceptionInterceptor()
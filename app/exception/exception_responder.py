@@ -1,4 +1,4 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.exception.exception_response_models import ExceptionResponseModel
 
@@ -11,8 +11,8 @@ class ExceptionResponder:
         self.status_code = status_code
         self.response = response
 
-    def throw_er_with_json(self) -> JSONResponse:
-        return JSONResponse(
+    def throw_er_with_json(self) -> ORJSONResponse:
+        return ORJSONResponse(
             status_code=self.status_code,
             content=self.response.__dict__,
         )
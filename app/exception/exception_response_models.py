@@ -20,3 +20,5 @@ erm_404_no_ci_validator_metadata_exception = ExceptionResponseModel(
 )
 erm_400_invalid_guid_exception = ExceptionResponseModel(status="error", message="Invalid GUID provided")
 erm_400_invalid_ci_version_exception = ExceptionResponseModel(status="error", message="Invalid ci_version provided")
+erm_400_invalid_json_pointer_exception = ExceptionResponseModel(status="error", message="Invalid JSON Pointer provided")
+erm_404_no_ci_field_exception = ExceptionResponseModel(status="error", message="No CI field found")
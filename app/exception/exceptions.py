@@ -37,6 +37,14 @@ class ExceptionInvalidClassifier(Exception):
     pass
 
 
+class ExceptionInvalidJsonPointer(Exception):
+    pass
+
+
+class ExceptionNoCIField(Exception):
+    pass
+
+
 class GlobalException(Exception):
     pass
 
@@ -1,14 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 
-from app.config import Settings, logging
+from app.cache.ci_cache import ci_cache
+from app.cache.ci_validator_metadata_snapshot import ci_validator_metadata_snapshot
+from app.config import logging, settings
+from app.dependencies import (
+    get_bucket_loader,
+    get_ci_event_subscriber,
+    get_ci_processor_service,
+    get_firebase_loader,
+    get_publisher_service,
+)
 from app.exception import exceptions
 from app.exception.exception_interceptor import ExceptionInterceptor
-from app.routers import ci_router, ci_router_restful, status_router, validator_router, validator_router_restful
+from app.middleware.compression import CompressionMiddleware
+from app.routers import (
+    ci_router,
+    ci_router_restful,
+    metrics_router,
+    status_router,
+    validator_router,
+    validator_router_restful,
+)
+from app.telemetry.metrics import PrometheusMiddleware
+from app.telemetry.tracing import TracingMiddleware, configure_tracing
 
-app = FastAPI()
 logger = logging.getLogger(__name__)
-settings = Settings()
+
+
+def prewarm_ci_cache() -> bool:
+    """
+    Load the latest CI metadata, and optionally the most recently published schemas, into the
+    in-memory cache. A failure leaves the cache cold rather than preventing the worker from starting.
+
+    Returns:
+    bool: whether the cache was pre-warmed
+    """
+    try:
+        ci_processor_service = get_ci_processor_service(
+            bucket_loader=get_bucket_loader(),
+            firebase_loader=get_firebase_loader(),
+            publisher=get_publisher_service(),
+        )
+        ci_processor_service.prewarm_cache(settings.CI_CACHE_PREWARM_SCHEMA_COUNT)
+        return True
+    except Exception as exc:
+        logger.error("Pre-warming CI cache: exception raised: %s", exc)
+        return False
+
+
+async def retry_prewarm_ci_cache() -> None:
+    """
+    Retry pre-warming the CI cache in the background until it succeeds, waiting
+    `CI_CACHE_PREWARM_RETRY_SECONDS` before the first retry and twice as long after each failure, up to
+    `CI_CACHE_PREWARM_RETRY_MAX_SECONDS`. Requests are served from the cold cache in the meantime.
+    """
+    delay = settings.CI_CACHE_PREWARM_RETRY_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        logger.info("Retrying pre-warming CI cache...")
+        if await run_in_threadpool(prewarm_ci_cache):
+            return
+        delay = min(delay * 2, settings.CI_CACHE_PREWARM_RETRY_MAX_SECONDS)
+
+
+def start_ci_event_subscriber() -> bool:
+    """
+    Subscribe to CI change events to invalidate the cache when other instances change a CI. A failure leaves
+    cached entries to expire after `CI_CACHE_TTL_SECONDS` rather than preventing the worker from starting.
+    """
+    try:
+        get_ci_event_subscriber().start()
+        return True
+    except Exception as exc:
+        logger.error("Subscribing to CI events: exception raised: %s", exc)
+        return False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs before the worker starts accepting requests, so the cache is warm by the time `/status`
+    is reachable by the load balancer, unless pre-warming fails and is retried in the background
+    """
+    subscribed = False
+    if (ci_cache.enabled or ci_validator_metadata_snapshot.enabled) and settings.CI_CACHE_INVALIDATION_ENABLED:
+        # Subscribe before pre-warming, so changes made while the cache is loading are not missed
+        subscribed = await run_in_threadpool(start_ci_event_subscriber)
+    prewarm_retry = None
+    if ci_cache.enabled and settings.CI_CACHE_PREWARM_ENABLED:
+        if not await run_in_threadpool(prewarm_ci_cache):
+            prewarm_retry = asyncio.create_task(retry_prewarm_ci_cache())
+        # The cache fills on demand while pre-warming is retried, so readiness only waits for the first attempt
+        ci_cache.prewarm_attempted = True
+    yield
+    if prewarm_retry is not None:
+        prewarm_retry.cancel()
+    if subscribed:
+        await run_in_threadpool(get_ci_event_subscriber().stop)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 app.description = "Open api schema for CIR"
@@ -16,6 +113,19 @@ app.openapi_version = "3.0.1"
 app.title = "Collection Instrumentation Register"
 app.version = "1.0.0"
 
+if settings.OTEL_TRACING_ENABLED:
+    configure_tracing()
+
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(TracingMiddleware)
+
 app.add_exception_handler(
     exceptions.ExceptionNoValidator,
     ExceptionInterceptor.throw_400_no_validator_provided_exception,
@@ -68,6 +178,14 @@ app.add_exception_handler(
     exceptions.ExceptionInvalidCiVersion,
     ExceptionInterceptor.throw_400_ci_version_invalid_exception,
 )
+app.add_exception_handler(
+    exceptions.ExceptionInvalidJsonPointer,
+    ExceptionInterceptor.throw_400_invalid_json_pointer_exception,
+)
+app.add_exception_handler(
+    exceptions.ExceptionNoCIField,
+    ExceptionInterceptor.throw_404_no_ci_field_exception,
+)
 
 
 @app.exception_handler(500)
@@ -91,6 +209,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 app.include_router(ci_router.router)
 app.include_router(status_router.router)
+app.include_router(metrics_router.router)
 app.include_router(validator_router.router)
 
 # Version 2 routers, refactored to be more RESTful
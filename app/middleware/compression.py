@@ -0,0 +1,101 @@
+from collections.abc import Sequence
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def get_encoding_quality(accept_encoding: str, encoding: str) -> float:
+    """
+    Get the quality an `Accept-Encoding` header gives a content coding, from its own entry or else from `*`.
+    Codings that are not listed, and entries with an invalid quality, have a quality of 0.
+
+    Parameters:
+    accept_encoding (str): the value of the request `Accept-Encoding` header.
+    encoding (str): the content coding, e.g. `gzip` or `br`.
+    """
+    qualities = {}
+    for coding in accept_encoding.lower().split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = (part.strip() for part in param.partition("="))
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality if 0 <= quality <= 1 else 0.0
+    return qualities.get(encoding, qualities.get("*", 0.0))
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Check whether an `Accept-Encoding` header allows a response encoded with `encoding`
+
+    Parameters:
+    accept_encoding (str): the value of the request `Accept-Encoding` header.
+    encoding (str): the content coding, e.g. `gzip` or `br`.
+    """
+    return get_encoding_quality(accept_encoding, encoding) > 0
+
+
+def get_preferred_encoding(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    """
+    Get the content coding an `Accept-Encoding` header gives the highest quality, out of those it allows
+
+    Parameters:
+    accept_encoding (str): the value of the request `Accept-Encoding` header.
+    encodings (Sequence[str]): the content codings available, the earliest being used if qualities are equal.
+    """
+    qualities = {encoding: get_encoding_quality(accept_encoding, encoding) for encoding in encodings}
+    preferred_encoding = max(encodings, key=lambda encoding: qualities[encoding], default=None)
+    return preferred_encoding if preferred_encoding and qualities[preferred_encoding] > 0 else None
+
+
+class BrotliResponder(IdentityResponder):
+    """
+    Brotli equivalent of starlette's `GZipResponder`
+    """
+
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        return compressed + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least `minimum_size` bytes with the coding the client prefers out of brotli and gzip,
+    brotli if it has no preference.
+    Responses that already have a `Content-Encoding`, such as schemas sent as stored gzipped, are sent unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, gzip_level: int, brotli_quality: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        responder: ASGIApp
+        preferred_encoding = get_preferred_encoding(accept_encoding, ("br", "gzip"))
+        if preferred_encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif preferred_encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
@@ -20,6 +20,17 @@ class DeleteCiV1Params:
     survey_id: str = Query(default=None, description="The survey ID of the CI to be deleted.", example="123")
 
 
+@dataclass
+class GetCiChangesV1Params:
+    """Model for `get_collection_instrument_changes` request query params"""
+
+    since: str | None = Query(
+        default=None,
+        description="The `next_token` returned with the previous changes. Leave out to start from the earliest change.",
+    )
+    limit: int | None = Query(default=None, ge=1, description="The maximum number of changes to return", example=100)
+
+
 @dataclass
 class GetCiMetadataV1Params:
     """Model for `get_ci_metadata_v1` request query params"""
@@ -66,6 +77,22 @@ class GetCiMetadataV2Params:
         """
         return all(not getattr(self, key) for key in keys)
 
+
+@dataclass
+class GetCiLatestV1Params(GetCiMetadataV2Params):
+    """
+    Model for `get_latest_collection_instruments_metadata` request query params
+    All parameters are optional
+    """
+
+
+@dataclass
+class GetCiSurveySummaryV1Params:
+    """Model for `get_survey_summary` request query params"""
+
+    survey_id: str = Query(default=None, description=SURVEY_ID_DESC, example="123")
+
+
 @dataclass
 class GetCiMetadataV3Params:
     """
@@ -103,6 +130,29 @@ class GetCiSchemaV2Params:
     )
 
 
+@dataclass
+class GetCiSchemaV3Params:
+    """Model for `get_collection_instrument_schema_by_guid` request query params"""
+
+    guid: str = Query(
+        default=None,
+        description="The global unique ID of the CI",
+        example="428ae4d1-8e7f-4a9d-8bef-05a266bf81e7",
+    )
+    redirect: bool = Query(
+        default=False,
+        description="Redirect to a short-lived signed url of the stored schema instead of returning the schema",
+    )
+    fields: list[str] | SkipJsonSchema[None] = Query(
+        default=None,
+        description=(
+            "JSON Pointers to the parts of the schema to return, instead of the whole schema. "
+            "The response maps each pointer to the part it refers to."
+        ),
+        example=["/metadata", "/sections/0"],
+    )
+
+
 class PostCiSchemaV1Data(BaseModel):
     """
     Model for `post_ci_schema_v1` request post data
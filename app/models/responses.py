@@ -1,7 +1,7 @@
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import asdict, dataclass
+from typing import Any, Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
 
 from app.config import logging
@@ -33,6 +33,8 @@ class CiMetadata(BaseModel):
     title: str
     # Optional fields
     sds_schema: str | SkipJsonSchema[None] = ""
+    # Hash of the schema content, if it is stored content-addressed. Internal, so never dumped or returned
+    schema_hash: SkipJsonSchema[str | None] = Field(default=None, exclude=True)
 
     def model_dump(self, *args, **kwargs) -> dict[str, Any]:
         """
@@ -53,6 +55,175 @@ class CiMetadata(BaseModel):
         return super().model_dump(*args, **kwargs)
 
 
+@dataclass(slots=True)
+class CiMetadataRecord:
+    """
+    Lightweight, unvalidated representation of stored collection instrument metadata, used when listing
+    large numbers of documents. Data is only validated by `CiMetadata` when it is received through the API.
+    """
+
+    ci_version: int
+    data_version: str
+    validator_version: str
+    classifier_type: str
+    classifier_value: str
+    guid: str
+    language: str
+    published_at: str
+    survey_id: str
+    title: str
+    sds_schema: str = ""
+    schema_hash: str | None = None
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> Self:
+        """
+        Build a record from a firestore document, ignoring any fields that are not part of the metadata
+
+        Parameters:
+        document (dict): the firestore document data.
+        """
+        return cls(
+            document["ci_version"],
+            document["data_version"],
+            document["validator_version"],
+            document["classifier_type"],
+            document["classifier_value"],
+            document["guid"],
+            document["language"],
+            document["published_at"],
+            document["survey_id"],
+            document["title"],
+            document.get("sds_schema", ""),
+            document.get("schema_hash"),
+        )
+
+    def model_dump(self) -> dict[str, Any]:
+        """
+        Return the same dictionary as `CiMetadata.model_dump`, leaving out `sds_schema` if it is not filled
+        and `schema_hash`
+        """
+        data = {
+            "ci_version": self.ci_version,
+            "data_version": self.data_version,
+            "validator_version": self.validator_version,
+            "classifier_type": self.classifier_type,
+            "classifier_value": self.classifier_value,
+            "guid": self.guid,
+            "language": self.language,
+            "published_at": self.published_at,
+            "survey_id": self.survey_id,
+            "title": self.title,
+        }
+        if self.sds_schema:
+            data["sds_schema"] = self.sds_schema
+        return data
+
+
+@dataclass(slots=True)
+class CiChangeRecord:
+    """
+    A change to collection instrument metadata in the change feed. Deleted CIs are represented by the metadata
+    they had when they were deleted. `change_position` orders changes by when they were committed.
+    """
+
+    event_type: str
+    updated_at: str
+    change_position: int
+    ci_metadata: CiMetadataRecord
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> Self:
+        """
+        Build a change from a firestore CI metadata or tombstone document
+
+        Parameters:
+        document (dict): the firestore document data.
+        """
+        return cls(
+            document["event_type"],
+            document["updated_at"],
+            document["change_position"],
+            CiMetadataRecord.from_document(document),
+        )
+
+    def model_dump(self) -> dict[str, Any]:
+        return {
+            "event_type": self.event_type,
+            "updated_at": self.updated_at,
+            "ci_metadata": self.ci_metadata.model_dump(),
+        }
+
+
+@dataclass
+class CiChangeFeed:
+    """
+    Model for a page of the change feed. `next_token` is passed as `since` to get the following changes, and is
+    unchanged if there are no new changes.
+    """
+
+    changes: list[CiChangeRecord]
+    next_token: str | None
+    has_more: bool
+
+    def model_dump(self) -> dict[str, Any]:
+        return {
+            "changes": [change.model_dump() for change in self.changes],
+            "next_token": self.next_token,
+            "has_more": self.has_more,
+        }
+
+
+@dataclass(slots=True)
+class CiSurveySummaryEntry:
+    """Model for the versions of a single CI, identified by its classifier and language, in a survey summary"""
+
+    classifier_type: str
+    classifier_value: str
+    language: str
+    latest_guid: str
+    latest_ci_version: int
+    version_count: int
+
+
+@dataclass
+class CiSurveySummary:
+    """
+    Model for the summary of the CIs of a survey: the number of versions, the latest version of each CI and the
+    total size of their stored schemas in bytes
+    """
+
+    survey_id: str
+    version_count: int
+    schema_bytes: int
+    cis: list[CiSurveySummaryEntry]
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> Self:
+        """
+        Build a summary from a firestore survey summary document, ordering its CIs by classifier and language
+
+        Parameters:
+        document (dict): the firestore document data.
+        """
+        cis = [
+            CiSurveySummaryEntry(
+                entry["classifier_type"],
+                entry["classifier_value"],
+                entry["language"],
+                entry["latest_guid"],
+                entry["latest_ci_version"],
+                entry["version_count"],
+            )
+            for entry in document.get("cis", {}).values()
+        ]
+        cis.sort(key=lambda entry: (entry.classifier_type, entry.classifier_value, entry.language))
+        return cls(document["survey_id"], document["version_count"], document["schema_bytes"], cis)
+
+    def model_dump(self) -> dict[str, Any]:
+        return asdict(self)
+
+
 class CiValidatorMetadata(BaseModel):
     """Model for collection instrument validator metadata"""
     survey_id: str
@@ -68,3 +239,20 @@ class DeploymentStatus:
     """Model for Successful deployment response"""
     version: str
     status: str = "OK"
+
+
+@dataclass
+class DependencyReadiness:
+    """Model for the result of probing a backing service"""
+    connected: bool
+    latency_ms: float
+
+
+@dataclass
+class ReadinessStatus:
+    """Model for readiness response"""
+    ready: bool
+    cache_warm: bool
+    firestore: DependencyReadiness
+    storage: DependencyReadiness
+    pubsub: DependencyReadiness
@@ -1,27 +1,45 @@
-from google.cloud import exceptions, storage
+from typing import TYPE_CHECKING
 
 from app.config import logging, settings
 from app.exception.exceptions import ExceptionBucketNotFound
 
+if TYPE_CHECKING:
+    from google.cloud import storage
+    from google.oauth2 import service_account
+
 logger = logging.getLogger(__name__)
 
 
 class BucketLoader:
-    ci_schema_bucket: storage.Bucket | None = None
-    __storage_client: storage.Client
+    ci_schema_bucket: "storage.Bucket | None" = None
+    __storage_client: "storage.Client"
+    __signing_credentials: "service_account.Credentials | None" = None
 
-    def __init__(self, storage_client: storage.Client) -> None:
+    def __init__(self, storage_client: "storage.Client") -> None:
         self.__storage_client = storage_client
 
         self.ci_schema_bucket = self._initialise_bucket(settings.CI_STORAGE_BUCKET_NAME)
 
-    def get_ci_schema_bucket(self) -> storage.Bucket:
+    def get_ci_schema_bucket(self) -> "storage.Bucket":
         """
         Get the ci schema bucket from Google cloud
         """
         return self.ci_schema_bucket
 
-    def _create_bucket(self, bucket_name: str) -> storage.Bucket | None:
+    def get_ci_schema_signing_credentials(self) -> "service_account.Credentials":
+        """
+        Get the credentials ci schema urls are signed with, loaded from `CI_SCHEMA_SIGNING_KEY_FILE` on first use.
+        Urls are signed locally with their private key, without a request to the IAM API.
+        """
+        if self.__signing_credentials is None:
+            from google.oauth2 import service_account  # noqa: PLC0415 - deferred to keep startup fast
+
+            self.__signing_credentials = service_account.Credentials.from_service_account_file(
+                settings.CI_SCHEMA_SIGNING_KEY_FILE
+            )
+        return self.__signing_credentials
+
+    def _create_bucket(self, bucket_name: str) -> "storage.Bucket | None":
         """
         Create a bucket in Google cloud storage
 
@@ -31,13 +49,15 @@ class BucketLoader:
         Returns:
         storage.Bucket | None: The created bucket object or None if the bucket already exists
         """
+        from google.cloud import exceptions  # noqa: PLC0415 - deferred to keep startup fast
+
         try:
             bucket = self.__storage_client.create_bucket(
                 bucket_name,
                 project=settings.PROJECT_ID,
             )
 
-            logger.debug(f"Bucket created: {bucket_name}")
+            logger.debug("Bucket created: %s", bucket_name)
 
             return bucket
 
@@ -46,7 +66,7 @@ class BucketLoader:
 
             return None
 
-    def _initialise_bucket(self, bucket_name) -> storage.Bucket:
+    def _initialise_bucket(self, bucket_name) -> "storage.Bucket":
         """
         Connect to google cloud storage client using PROJECT_ID
         For local environment, if bucket does not exist, then create the bucket
@@ -58,6 +78,8 @@ class BucketLoader:
         Returns:
         storage.Bucket: The bucket object
         """
+        from google.cloud import exceptions  # noqa: PLC0415 - deferred to keep startup fast
+
         try:
             bucket = self.__storage_client.get_bucket(
                 bucket_name,
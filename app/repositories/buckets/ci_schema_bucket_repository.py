@@ -1,48 +1,196 @@
-import json
+from datetime import timedelta
+from typing import Any, BinaryIO
 
-from app.config import logging
+from app.config import logging, settings
 from app.repositories.buckets.bucket_loader import BucketLoader
+from app.services.ci_schema_codec_service import CiSchemaCodecService
+from app.services.ci_schema_location_service import CiSchemaLocationService
+from app.services.ci_schema_split_service import CiSchemaSplitService
+from app.services.datetime_service import DatetimeService
+from app.telemetry.metrics import STORED_SCHEMA_SIZE, observe_backend_latency
+from app.telemetry.tracing import set_span_attributes, traced
 
 logger = logging.getLogger(__name__)
 
 
 class CiSchemaBucketRepository:
     def __init__(self, bucket_loader: BucketLoader):
+        self.bucket_loader = bucket_loader
         self.bucket = bucket_loader.get_ci_schema_bucket()
 
-    def store_ci_schema(self, blob_name: str, schema: dict) -> None:
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def store_ci_schema(self, blob_name: str, schema: dict) -> int:
         """
-        Stores ci schema in google bucket as json.
+        Stores ci schema in google bucket as json, encoded with the `CI_SCHEMA_STORAGE_CODEC` codec.
+        Compressed schemas are stored with a `Content-Encoding` so they can still be served decompressed.
 
         Parameters:
         blob_name (str): filename of uploaded json schema.
         schema (Schema): ci schema being stored.
+
+        Returns:
+        int: the size of the stored schema in bytes
         """
         logger.info("attempting to store schema")
-        blob = self.bucket.blob(blob_name)
-        blob.upload_from_string(
-            json.dumps(schema, indent=2),
-            content_type="application/json",
+        size = self._upload_ci_schema_data(blob_name, schema)
+        STORED_SCHEMA_SIZE.observe(size)
+        logger.info("successfully stored: %s", blob_name)
+        return size
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def store_content_addressed_ci_schema(self, blob_name: str, schema: dict) -> int:
+        """
+        Stores a ci schema at the location of its content hash, unless a schema with the same content is already
+        stored there. A schema that is reused is marked as referenced, which stops
+        `scripts.collect_unreferenced_ci_schemas` deleting it before the metadata referring to it is committed.
+
+        Parameters:
+        blob_name (str): filename of the content-addressed json schema.
+        schema (Schema): ci schema being stored.
+
+        Returns:
+        int: the size of the stored schema in bytes
+        """
+        from google.api_core.exceptions import (  # noqa: PLC0415 - deferred to keep startup fast
+            NotFound,
+            PreconditionFailed,
         )
-        logger.info(f"successfully stored: {blob_name}")
 
+        blob = self.bucket.blob(blob_name)
+        blob.metadata = {"referenced_at": DatetimeService.get_current_date_and_time().isoformat()}
+        try:
+            blob.patch()
+            set_span_attributes(blob_name=blob_name, blob_size=blob.size)
+            logger.info("schema already stored, upload skipped: %s", blob_name)
+            return blob.size
+        except NotFound:
+            pass
+
+        logger.info("attempting to store content-addressed schema")
+        try:
+            size = self._upload_ci_schema_data(blob_name, schema, if_generation_match=0)
+        except PreconditionFailed:
+            # The same content was stored by another request since it was checked
+            blob.reload()
+            return blob.size
+        STORED_SCHEMA_SIZE.observe(size)
+        logger.info("successfully stored: %s", blob_name)
+        return size
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def store_split_ci_schema(self, guid: str, schema: dict) -> None:
+        """
+        Stores each of the `CI_SCHEMA_SPLIT_FIELDS` of a ci schema as a separate blob, followed by the manifest
+        of the schema. The manifest is written last, so it never lists a field that has not been stored.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        schema (dict): ci schema being stored.
+        """
+        logger.info("attempting to store split schema")
+        split_fields, manifest = CiSchemaSplitService.split_ci_schema(schema, settings.CI_SCHEMA_SPLIT_FIELDS)
+        for field_name, value in split_fields.items():
+            self._upload_ci_schema_data(CiSchemaLocationService.get_ci_schema_field_location(guid, field_name), value)
+        self._upload_ci_schema_data(CiSchemaLocationService.get_ci_schema_manifest_location(guid), manifest)
+        logger.info("successfully stored split schema: %s", guid)
+
+    def open_ci_schema_writer(self, blob_name: str, content_encoding: str | None) -> BinaryIO:
+        """
+        Open a resumable upload of a ci schema that is written in chunks. At most `CI_UPLOAD_CHUNK_SIZE` bytes
+        are held in memory before they are sent to the bucket, and the blob is created when the writer is closed.
+
+        Parameters:
+        blob_name (str): filename of the uploaded json schema.
+        content_encoding (str | None): the `Content-Encoding` of the data being written.
+        """
+        logger.info("attempting to stream schema")
+        set_span_attributes(blob_name=blob_name)
+        blob = self.bucket.blob(blob_name)
+        blob.content_encoding = content_encoding
+        return blob.open("wb", chunk_size=settings.CI_UPLOAD_CHUNK_SIZE, content_type="application/json")
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def copy_ci_schema(self, source_blob_name: str, destination_blob_name: str) -> None:
+        """
+        Copies a ci schema within the bucket. The copy is made by the bucket, so the schema is not downloaded.
+
+        Parameters:
+        source_blob_name (str): filename of the copied json schema.
+        destination_blob_name (str): filename of the copy.
+        """
+        logger.info("attempting to copy schema")
+        set_span_attributes(blob_name=destination_blob_name)
+        self.bucket.copy_blob(self.bucket.blob(source_blob_name), self.bucket, destination_blob_name)
+        logger.info("successfully copied: %s to %s", source_blob_name, destination_blob_name)
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
     def retrieve_ci_schema(self, blob_name: str) -> dict | None:
         """
         Get the CI schema from the ci schema bucket using the filename provided.
+        The blob is downloaded without transcoding and decoded with whichever codec it was stored with.
 
         Parameters:
         blob_name (str): filename of the retrieved json schema
         """
         logger.info("attempting to get schema")
-        logger.debug(f"get_schema blob_name: {blob_name}")
+        data = self._download_raw_ci_schema(blob_name)
+        if data is None:
+            return None
+        logger.debug("get_schema blob_name: %s, size: %s bytes", blob_name, len(data))
+        return CiSchemaCodecService.decode(data)
 
-        blob = self.bucket.blob(blob_name)
-        if not blob.exists():
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def retrieve_split_ci_schema_part(self, blob_name: str) -> Any | None:
+        """
+        Get the manifest or a split field of a split CI schema from the ci schema bucket
+
+        Parameters:
+        blob_name (str): filename of the retrieved json part
+        """
+        logger.info("attempting to get split schema part")
+        data = self._download_raw_ci_schema(blob_name)
+        if data is None:
             return None
-        data = blob.download_as_string()
-        logger.debug(f"get_schema data: {data}")
-        return json.loads(data)
+        return CiSchemaCodecService.decode(data)
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def retrieve_raw_ci_schema(self, blob_name: str) -> bytes | None:
+        """
+        Get the CI schema from the ci schema bucket exactly as it is stored, without decoding it.
+
+        Parameters:
+        blob_name (str): filename of the retrieved json schema
+        """
+        logger.info("attempting to get raw schema")
+        return self._download_raw_ci_schema(blob_name)
 
+    @traced("CiSchemaBucketRepository")
+    def generate_ci_schema_signed_url(self, blob_name: str) -> str:
+        """
+        Generate a V4 signed url to download a CI schema directly from the bucket, expiring after
+        `CI_SCHEMA_SIGNED_URL_EXPIRATION_SECONDS`. The url is signed locally, so the bucket is not called and
+        the schema is not checked to exist.
+
+        Parameters:
+        blob_name (str): filename of the json schema
+        """
+        set_span_attributes(blob_name=blob_name)
+        return self.bucket.blob(blob_name).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=settings.CI_SCHEMA_SIGNED_URL_EXPIRATION_SECONDS),
+            method="GET",
+            credentials=self.bucket_loader.get_ci_schema_signing_credentials(),
+        )
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
     def delete_ci_schema(self, blob_name: str) -> None:
         """
         Deletes the CI schema from the ci schema bucket using the filename provided.
@@ -52,7 +200,57 @@ class CiSchemaBucketRepository:
         """
         logger.info("attempting to delete schema")
 
-        logger.debug(f"delete_ci_schema: {blob_name}")
+        logger.debug("delete_ci_schema: %s", blob_name)
+        set_span_attributes(blob_name=blob_name)
         blob = self.bucket.blob(blob_name)
         blob.delete()
-        logger.info(f"successfully deleted: {blob_name}")
+        logger.info("successfully deleted: %s", blob_name)
+
+    @traced("CiSchemaBucketRepository")
+    @observe_backend_latency("CiSchemaBucketRepository")
+    def delete_split_ci_schema(self, guid: str) -> None:
+        """
+        Deletes the manifest and split fields of a CI schema from the ci schema bucket, if it was split.
+        The manifest is deleted first, so the fields it lists are never read once they start being deleted.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        """
+        logger.info("attempting to delete split schema")
+        set_span_attributes(guid=guid)
+        manifest_blob_name = CiSchemaLocationService.get_ci_schema_manifest_location(guid)
+        blobs = list(self.bucket.list_blobs(prefix=CiSchemaLocationService.get_ci_schema_parts_prefix(guid)))
+        for blob in sorted(blobs, key=lambda blob: blob.name != manifest_blob_name):
+            blob.delete()
+        logger.info("successfully deleted %s split schema blobs: %s", len(blobs), guid)
+
+    def _upload_ci_schema_data(self, blob_name: str, value: Any, **upload_kwargs) -> int:
+        """
+        For internal use only - uploads json data encoded with the `CI_SCHEMA_STORAGE_CODEC` codec, returning its
+        stored size in bytes
+        """
+        blob = self.bucket.blob(blob_name)
+        data, content_encoding = CiSchemaCodecService.encode(
+            value, settings.CI_SCHEMA_STORAGE_CODEC, settings.CI_SCHEMA_COMPRESSION_LEVEL
+        )
+        set_span_attributes(blob_name=blob_name, blob_size=len(data))
+        blob.content_encoding = content_encoding
+        blob.upload_from_string(
+            data,
+            content_type="application/json",
+            **upload_kwargs,
+        )
+        return len(data)
+
+    def _download_raw_ci_schema(self, blob_name: str) -> bytes | None:
+        """
+        For internal use only - downloads the stored bytes of the blob, or returns None if it does not exist
+        """
+        logger.debug("get_schema blob_name: %s", blob_name)
+        set_span_attributes(blob_name=blob_name)
+        blob = self.bucket.blob(blob_name)
+        if not blob.exists():
+            return None
+        data = blob.download_as_bytes(raw_download=True)
+        set_span_attributes(blob_size=len(data))
+        return data
@@ -1,17 +1,34 @@
-from firebase_admin import firestore
-from google.cloud.firestore import Query, Transaction
-
-from app.config import logging
-from app.models.responses import CiMetadata
+import hashlib
+import json
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from app.config import logging, settings
+from app.events.ci_events import CiEventType
+from app.models.responses import CiChangeRecord, CiMetadata, CiMetadataRecord, CiSurveySummary
 from app.repositories.buckets.bucket_loader import BucketLoader
 from app.repositories.buckets.ci_schema_bucket_repository import (
     CiSchemaBucketRepository,
 )
 from app.repositories.firebase.firebase_loader import FirebaseLoader
 from app.services.ci_schema_location_service import CiSchemaLocationService
+from app.services.datetime_service import DatetimeService
+from app.telemetry.metrics import observe_backend_latency
+from app.telemetry.tracing import set_span_attributes, traced
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import CollectionReference, Transaction
 
 logger = logging.getLogger(__name__)
 
+# The id of the document in the change sequence collection holding the position of the latest change
+CHANGE_SEQUENCE_DOCUMENT_ID = "ci-changes"
+
+# Equal to `google.cloud.firestore.Query.DESCENDING`, which is not imported so that the firestore
+# library is only loaded when the first client is created
+DESCENDING = "DESCENDING"
+
 
 class CiFirebaseRepository:
     """Provides methods to perform actions on firestore using the google firestore client"""
@@ -23,35 +40,78 @@ class CiFirebaseRepository:
         """
         self.firestore = firebase_loader
         self.ci_collection = firebase_loader.get_ci_collection()
+        self.ci_tombstone_collection = firebase_loader.get_ci_tombstone_collection()
+        self.ci_change_sequence_collection = firebase_loader.get_ci_change_sequence_collection()
+        self.ci_latest_collection = firebase_loader.get_ci_latest_collection()
+        self.ci_survey_summary_collection = firebase_loader.get_ci_survey_summary_collection()
         self.ci_bucket_repository = CiSchemaBucketRepository(bucket_loader)
 
-    def update_ci_metadata(self, guid: str, metadata: CiMetadata):
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def update_ci_metadata(self, guid: str, metadata: CiMetadata, schema_size: int | None = None):
         """
-        Updates metadata of CI.
+        Updates metadata of CI, and the latest version of the CI if it is the latest version, in a transaction.
+        If the schema of the CI has been stored again, its new size is recorded, and the total of its survey
+        summary is changed by the difference, in the same transaction.
 
         Parameters:
         guid (str): identifier of metadata.
         metadata (CiMetadata): metadata for schema
+        schema_size (int | None): the size of the schema stored again in bytes, or None if it was not.
         """
-        self.ci_collection.document(guid).update(metadata.model_dump())
-
+        from google.cloud.firestore import Increment, transactional  # noqa: PLC0415 - deferred to keep startup fast
+
+        @transactional
+        def update_ci_metadata_run(transaction: "Transaction"):
+            # Reads in a transaction have to come before its writes
+            latest_documents = list(
+                self.ci_latest_collection.where("guid", "==", guid).limit(1).stream(transaction=transaction)
+            )
+            previous_schema_size = (
+                self.get_ci_schema_size_in_transaction(transaction, guid) if schema_size is not None else None
+            )
+            change_position = self.reserve_change_positions_in_transaction(transaction)[0]
+
+            ci_document = {
+                **metadata.model_dump(),
+                **self._change_fields(CiEventType.UPDATED, change_position),
+                # Cleared if the schema of the CI is no longer stored content-addressed
+                "schema_hash": metadata.schema_hash,
+            }
+            if schema_size is not None:
+                ci_document["schema_size"] = schema_size
+                transaction.set(
+                    self._survey_summary_document(metadata.survey_id),
+                    {"survey_id": metadata.survey_id, "schema_bytes": Increment(schema_size - previous_schema_size)},
+                    merge=True,
+                )
+            transaction.update(self.ci_collection.document(guid), ci_document)
+            if latest_documents:
+                transaction.set(self._latest_document(metadata), self.latest_document_data(metadata))
+
+        update_ci_metadata_run(self.firestore.set_transaction())
+
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
     def get_latest_ci_metadata(self, survey_id, classifier_type, classifier_value, language) -> CiMetadata | None:
         """
-        Get metadata of latest CI version.
+        Get metadata of latest CI version, with a single document read from the latest version collection.
+        CIs missing from that collection, which were published before it was introduced and have not been
+        backfilled, are found by querying every version.
 
         Parameters:
         survey_id (str): the survey id of the CI metadata.
         form_type (str): the form type of the CI metadata.
         language (str): the language of the CI metadata.
         """
+        set_span_attributes(survey_id=survey_id)
+        latest_document_id = self.latest_document_id(survey_id, classifier_type, classifier_value, language)
+        latest_document = self.ci_latest_collection.document(latest_document_id).get()
+        if latest_document.exists:
+            return CiMetadata(**latest_document.to_dict())
+
         latest_ci_metadata = (
-            self.ci_collection.where("survey_id", "==", survey_id)
-            .where("classifier_type", "==", classifier_type)
-            .where("classifier_value", "==", classifier_value)
-            .where("language", "==", language)
-            .order_by("ci_version", direction=Query.DESCENDING)
-            .limit(1)
-            .stream()
+            self._query_ci_versions(survey_id, classifier_type, classifier_value, language).limit(1).stream()
         )
 
         ci_metadata = None
@@ -60,6 +120,28 @@ class CiFirebaseRepository:
 
         return ci_metadata
 
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_latest_ci_metadata_collection(self, survey_id: str | None = None) -> list[CiMetadataRecord]:
+        """
+        Gets the metadata of the latest version of every CI, or of every CI of a survey, from the latest
+        version collection
+
+        Parameters:
+        survey_id (str | None): the survey id of the CIs, or None for all CIs.
+        """
+        set_span_attributes(survey_id=survey_id)
+        query = self.ci_latest_collection
+        if survey_id is not None:
+            query = query.where("survey_id", "==", survey_id)
+
+        ci_metadata_list = [CiMetadataRecord.from_document(document.to_dict()) for document in query.stream()]
+
+        set_span_attributes(result_count=len(ci_metadata_list))
+        return ci_metadata_list
+
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
     def perform_new_ci_transaction(
         self,
         ci_id: str,
@@ -76,41 +158,99 @@ class CiFirebaseRepository:
         ci (dict): The CI being stored.
         stored_ci_filename (str): Filename of uploaded json CI.
         """
+        set_span_attributes(guid=ci_id, survey_id=next_version_ci_metadata.survey_id)
+
+        from google.cloud.firestore import transactional  # noqa: PLC0415 - deferred to keep startup fast
 
-        # A stipulation of the @firestore.transactional decorator is the first parameter HAS
+        # A stipulation of the @transactional decorator is the first parameter HAS
         # to be 'transaction', but since we're using classes the first parameter is always
         # 'self'. Encapsulating the transaction within this function circumvents the issue.
 
-        @firestore.transactional
-        def post_ci_transaction_run(transaction: Transaction):
-            self.create_ci_in_transaction(transaction, ci_id, next_version_ci_metadata)
-            self.ci_bucket_repository.store_ci_schema(stored_ci_filename, ci)
+        @transactional
+        def post_ci_transaction_run(transaction: "Transaction"):
+            # Writes in a transaction are only sent when it commits, so the schema is still stored first
+            schema_size = self._store_ci_schema(stored_ci_filename, ci, next_version_ci_metadata)
+            if settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED:
+                self.ci_bucket_repository.store_split_ci_schema(ci_id, ci)
+            self.create_ci_in_transaction(transaction, ci_id, next_version_ci_metadata, schema_size)
 
         post_ci_transaction_run(self.firestore.set_transaction())
 
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def perform_new_streamed_ci_transaction(
+        self,
+        ci_id: str,
+        next_version_ci_metadata: CiMetadata,
+        staged_ci_filename: str,
+        stored_ci_filename: str,
+        schema_size: int,
+    ) -> None:
+        """
+        A transactional function that wraps CI creation and copying a streamed CI schema from where it was
+        uploaded to where it is stored. The copy can be repeated safely if the transaction is retried.
+
+        Parameters:
+        ci_id (str): The unique id of the new CI.
+        next_version_ci_metadata (CiMetadata): The CI metadata being added to firestore.
+        staged_ci_filename (str): Filename the json CI was streamed to.
+        stored_ci_filename (str): Filename the json CI is stored at.
+        schema_size (int): The size of the stored json CI in bytes.
+        """
+        set_span_attributes(guid=ci_id, survey_id=next_version_ci_metadata.survey_id)
+
+        from google.cloud.firestore import transactional  # noqa: PLC0415 - deferred to keep startup fast
+
+        @transactional
+        def post_streamed_ci_transaction_run(transaction: "Transaction"):
+            self.create_ci_in_transaction(transaction, ci_id, next_version_ci_metadata, schema_size)
+            self.ci_bucket_repository.copy_ci_schema(staged_ci_filename, stored_ci_filename)
+
+        post_streamed_ci_transaction_run(self.firestore.set_transaction())
+
+    @traced("CiFirebaseRepository")
     def create_ci_in_transaction(
         self,
-        transaction: Transaction,
+        transaction: "Transaction",
         ci_id: str,
         ci_metadata: CiMetadata,
+        schema_size: int,
     ) -> None:
         """
-        Creates a new CI metadata entry in firestore.
+        Creates a new CI metadata entry in firestore, recording the size of its stored schema so it can be
+        taken off the survey summary when the CI is deleted.
 
         Parameters:
         ci_id (str): The unique id of the new CI.
         ci_metadata (CiMetadata): The CI metadata being added to firestore.
+        schema_size (int): The size of the stored CI schema in bytes.
         """
+        change_position = self.reserve_change_positions_in_transaction(transaction)[0]
+
         # Add new version using `model_dump` method to generate dictionary of metadata. This
         # removes `sds_schema` key if not filled
 
         transaction.set(
             self.ci_collection.document(ci_id),
-            ci_metadata.model_dump(),
+            {
+                **ci_metadata.model_dump(),
+                **self._change_fields(CiEventType.CREATED, change_position),
+                **self._schema_hash_fields(ci_metadata),
+                "schema_size": schema_size,
+            },
+            merge=True,
+        )
+        # A new CI always has a higher version than every existing version, so it becomes the latest version
+        transaction.set(self._latest_document(ci_metadata), self.latest_document_data(ci_metadata))
+        transaction.set(
+            self._survey_summary_document(ci_metadata.survey_id),
+            self._survey_summary_changes(ci_metadata, 1, schema_size, ci_metadata),
             merge=True,
         )
 
-    def get_ci_metadata_collection(self, survey_id: str, classifier_type, classifier_value, language: str) -> list[CiMetadata]:
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_ci_metadata_collection(self, survey_id: str, classifier_type, classifier_value, language: str) -> list[CiMetadataRecord]:
         """
         Gets the collection of CI metadata with a specific survey_id, form_type, language.
 
@@ -119,38 +259,37 @@ class CiFirebaseRepository:
         form_type (str): The form type of the CI metadata being collected.
         language (str): The language of the CI metadata being collected.
         """
-        returned_ci_metadata = (
-            self.ci_collection.where("survey_id", "==", survey_id)
-            .where("classifier_type", "==", classifier_type)
-            .where("classifier_value", "==", classifier_value)
-            .where("language", "==", language)
-            .order_by("ci_version", direction=Query.DESCENDING)
-            .stream()
-        )
+        returned_ci_metadata = self._query_ci_versions(survey_id, classifier_type, classifier_value, language).stream()
 
-        ci_metadata_list: list[CiMetadata] = []
+        ci_metadata_list: list[CiMetadataRecord] = []
         for ci_metadata in returned_ci_metadata:
-            metadata = CiMetadata(**ci_metadata.to_dict())
+            metadata = CiMetadataRecord.from_document(ci_metadata.to_dict())
             ci_metadata_list.append(metadata)
 
+        set_span_attributes(result_count=len(ci_metadata_list))
         return ci_metadata_list
 
-    def get_all_ci_metadata_collection(self) -> list[CiMetadata]:
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_all_ci_metadata_collection(self) -> list[CiMetadataRecord]:
         """
         Gets the collection of all CI metadata.
         """
         returned_ci_metadata = self.ci_collection.order_by(
             "ci_version",
-            direction=Query.DESCENDING,
+            direction=DESCENDING,
         ).stream()
 
-        ci_metadata_list: list[CiMetadata] = []
+        ci_metadata_list: list[CiMetadataRecord] = []
         for ci_metadata in returned_ci_metadata:
-            metadata = CiMetadata(**ci_metadata.to_dict())
+            metadata = CiMetadataRecord.from_document(ci_metadata.to_dict())
             ci_metadata_list.append(metadata)
 
+        set_span_attributes(result_count=len(ci_metadata_list))
         return ci_metadata_list
 
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
     def get_ci_metadata_with_id(self, guid: str) -> CiMetadata | None:
         """
         Gets CI metadata using guid
@@ -158,6 +297,7 @@ class CiFirebaseRepository:
         Parameters:
         guid (str): The guid of the CI metadata being collected.
         """
+        set_span_attributes(guid=guid)
         retrieved_ci_metadata = self.ci_collection.where("guid", "==", guid).stream()
 
         ci_metadata = None
@@ -166,59 +306,222 @@ class CiFirebaseRepository:
 
         return ci_metadata
 
-    def get_ci_metadata_collection_with_survey_id(self, survey_id: str) -> list[CiMetadata]:
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_ci_metadata_collection_with_survey_id(self, survey_id: str) -> list[CiMetadataRecord]:
         """
         Gets the collection of CI metadata using survey_id
 
         Parameters:
         survey_id (str): The survey id of the CI metadata being collected.
         """
+        set_span_attributes(survey_id=survey_id)
         returned_ci_metadata = (
-            self.ci_collection.where("survey_id", "==", survey_id).order_by("ci_version", direction=Query.DESCENDING).stream()
+            self.ci_collection.where("survey_id", "==", survey_id).order_by("ci_version", direction=DESCENDING).stream()
         )
 
-        ci_metadata_list: list[CiMetadata] = []
+        ci_metadata_list: list[CiMetadataRecord] = []
         for ci_metadata in returned_ci_metadata:
-            metadata = CiMetadata(**ci_metadata.to_dict())
+            metadata = CiMetadataRecord.from_document(ci_metadata.to_dict())
             ci_metadata_list.append(metadata)
 
+        set_span_attributes(result_count=len(ci_metadata_list))
         return ci_metadata_list
 
-    def perform_delete_ci_transaction(self, ci_metadata_collection: list[CiMetadata]) -> None:
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def perform_delete_ci_transaction(self, ci_metadata_collection: list[CiMetadataRecord]) -> None:
         """
-        A transactional function that wrap CI deletion and schema deletion processes
+        A transactional function that wrap CI deletion and schema deletion processes. Every CI in the collection
+        is deleted in a single transaction, so either all of them are deleted or none are, and their schemas are
+        only deleted from the bucket once it has committed.
 
         Parameters:
-        ci_metadata_collection (list[CiMetadata]): The CI metadata collection being deleted.
+        ci_metadata_collection (list[CiMetadataRecord]): The CI metadata collection being deleted.
         """
-        # A stipulation of the @firestore.transactional decorator is the first parameter HAS
+        set_span_attributes(result_count=len(ci_metadata_collection))
+
+        from google.cloud.firestore import transactional  # noqa: PLC0415 - deferred to keep startup fast
+
+        guids = {ci_metadata.guid for ci_metadata in ci_metadata_collection}
+
+        # A stipulation of the @transactional decorator is the first parameter HAS
         # to be 'transaction', but since we're using classes the first parameter is always
         # 'self'. Encapsulating the transaction within this function circumvents the issue.
 
-        @firestore.transactional
-        def delete_ci_transaction_run(transaction: Transaction, ci_metadata: CiMetadata):
-            # Delete ci metadata from FireStore
-            self.delete_ci_metadata_collection_in_transaction(transaction, ci_metadata)
+        @transactional
+        def delete_ci_transaction_run(transaction: "Transaction") -> list[CiMetadataRecord]:
+            # Reads in a transaction have to come before its writes. Only the versions still stored when the
+            # transaction runs are deleted, so a retried or repeated delete never deletes a version twice
+            ci_versions_by_latest_document_id = {}
+            for ci_metadata in ci_metadata_collection:
+                latest_document_id = self._latest_document(ci_metadata).id
+                if latest_document_id not in ci_versions_by_latest_document_id:
+                    ci_versions_by_latest_document_id[latest_document_id] = self.get_ci_versions_in_transaction(
+                        transaction, ci_metadata
+                    )
+
+            deleted_ci_metadata_collection = [
+                ci_metadata
+                for ci_versions in ci_versions_by_latest_document_id.values()
+                for ci_metadata, _ in ci_versions
+                if ci_metadata.guid in guids
+            ]
+            if not deleted_ci_metadata_collection:
+                return []
+            change_positions = iter(
+                self.reserve_change_positions_in_transaction(transaction, len(deleted_ci_metadata_collection))
+            )
+
+            survey_summary_changes: dict[str, dict[str, Any]] = {}
+            for ci_versions in ci_versions_by_latest_document_id.values():
+                changes = self.delete_ci_versions_in_transaction(transaction, ci_versions, guids, change_positions)
+                if changes is not None:
+                    # The summary of a survey is written once, however many of its CIs are deleted
+                    self._merge_survey_summary_changes(survey_summary_changes, changes)
+
+            for survey_id, changes in survey_summary_changes.items():
+                transaction.set(self._survey_summary_document(survey_id), changes, merge=True)
+            return deleted_ci_metadata_collection
+
+        deleted_ci_metadata_collection = delete_ci_transaction_run(self.firestore.set_transaction())
+
+        # Deleting the schemas is left until the transaction has committed, as it can neither be rolled back nor
+        # repeated if the transaction is retried. A schema left behind is never read once its CI is deleted.
+        for ci_metadata in deleted_ci_metadata_collection:
+            self._delete_ci_schemas(ci_metadata)
+
+    def _delete_ci_schemas(self, ci_metadata: CiMetadataRecord) -> None:
+        """
+        For internal use only - deletes the stored schema of a deleted CI from the bucket, logging any failure.
+        Content-addressed schemas may be shared with other CIs, so they are left to
+        `scripts.collect_unreferenced_ci_schemas`.
+        """
+        try:
+            if not ci_metadata.schema_hash:
+                self.ci_bucket_repository.delete_ci_schema(CiSchemaLocationService.get_ci_schema_location(ci_metadata))
+            if settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED:
+                self.ci_bucket_repository.delete_split_ci_schema(ci_metadata.guid)
+        except Exception as exc:
+            logger.warning("Failed to delete schema of deleted CI %s: %s", ci_metadata.guid, exc)
+
+    @traced("CiFirebaseRepository")
+    def get_ci_versions_in_transaction(
+        self, transaction: "Transaction", ci_metadata: CiMetadataRecord
+    ) -> list[tuple[CiMetadataRecord, int]]:
+        """
+        For internal use only - gets every version of a CI, latest first, with the recorded size of its stored
+        schema, which is 0 for CIs created before sizes were recorded and not yet backfilled
+
+        Parameters:
+        transaction (Transaction): The transaction object.
+        ci_metadata (CiMetadataRecord): The CI metadata of any version of the CI.
+        """
+        ci_versions = self._query_ci_versions(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        documents = [document.to_dict() for document in ci_versions.stream(transaction=transaction)]
+        return [(CiMetadataRecord.from_document(document), document.get("schema_size", 0)) for document in documents]
+
+    @traced("CiFirebaseRepository")
+    def delete_ci_versions_in_transaction(
+        self,
+        transaction: "Transaction",
+        ci_versions: list[tuple[CiMetadataRecord, int]],
+        guids: set[str],
+        change_positions: Iterator[int],
+    ) -> dict[str, Any] | None:
+        """
+        For internal use only - deletes the versions of a CI whose guid is in `guids`, pointing its latest version
+        at the latest one remaining
+
+        Parameters:
+        transaction (Transaction): The transaction object.
+        ci_versions (list[tuple[CiMetadataRecord, int]]): Every version of the CI and its schema size, latest first.
+        guids (set[str]): The guids of the CI versions being deleted.
+        change_positions (Iterator[int]): The positions in the change feed reserved for the deletes.
 
-            # Delete ci schema from bucket
-            stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
-            self.ci_bucket_repository.delete_ci_schema(stored_ci_filename)
+        Returns:
+        dict: the changes to merge into the survey summary, or None if no version was deleted
+        """
+        deleted_ci_versions = [version for version in ci_versions if version[0].guid in guids]
+        if not deleted_ci_versions:
+            return None
+        remaining_ci_versions = [version for version in ci_versions if version[0].guid not in guids]
+        next_latest_ci_metadata = remaining_ci_versions[0][0] if remaining_ci_versions else None
+
+        for ci_metadata, _ in deleted_ci_versions:
+            self.delete_ci_metadata_collection_in_transaction(transaction, ci_metadata, next(change_positions))
+        self.replace_latest_ci_metadata_in_transaction(transaction, deleted_ci_versions[0][0], next_latest_ci_metadata)
+
+        return self._survey_summary_changes(
+            deleted_ci_versions[0][0],
+            -len(deleted_ci_versions),
+            -sum(schema_size for _, schema_size in deleted_ci_versions),
+            next_latest_ci_metadata,
+        )
 
-        for ci_metadata in ci_metadata_collection:
-            delete_ci_transaction_run(self.firestore.set_transaction(), ci_metadata)
+    @traced("CiFirebaseRepository")
+    def get_ci_schema_size_in_transaction(self, transaction: "Transaction", guid: str) -> int:
+        """
+        For internal use only - gets the recorded size of the stored schema of a CI, which is 0 for CIs created
+        before sizes were recorded and not yet backfilled
 
-    def delete_ci_metadata_collection_in_transaction(self, transaction: Transaction, ci_metadata: CiMetadata):
+        Parameters:
+        transaction (Transaction): The transaction object.
+        guid (str): The guid of the CI.
         """
-        For internal use only - deletes document from remote firestore database
+        for document in self.ci_collection.where("guid", "==", guid).limit(1).stream(transaction=transaction):
+            return document.to_dict().get("schema_size", 0)
+        return 0
+
+    @traced("CiFirebaseRepository")
+    def replace_latest_ci_metadata_in_transaction(
+        self,
+        transaction: "Transaction",
+        ci_metadata: CiMetadataRecord,
+        next_latest_ci_metadata: CiMetadataRecord | None,
+    ) -> None:
+        """
+        For internal use only - points the latest version of a CI at `next_latest_ci_metadata` once
+        `ci_metadata` is deleted, removing it if no versions remain
 
         Parameters:
         transaction (Transaction): The transaction object.
-        ci_metadata (CiMetadata): The CI metadata being deleted.
+        ci_metadata (CiMetadataRecord): The CI metadata being deleted.
+        next_latest_ci_metadata (CiMetadataRecord | None): The latest remaining version of the CI.
+        """
+        latest_document = self._latest_document(ci_metadata)
+        if next_latest_ci_metadata is None:
+            transaction.delete(latest_document)
+        else:
+            transaction.set(latest_document, self.latest_document_data(next_latest_ci_metadata))
+
+    @traced("CiFirebaseRepository")
+    def delete_ci_metadata_collection_in_transaction(
+        self, transaction: "Transaction", ci_metadata: CiMetadataRecord, change_position: int
+    ):
+        """
+        For internal use only - deletes document from remote firestore database, leaving a tombstone for the
+        change feed
+
+        Parameters:
+        transaction (Transaction): The transaction object.
+        ci_metadata (CiMetadataRecord): The CI metadata being deleted.
+        change_position (int): The position of the delete in the change feed, reserved in the transaction.
         """
         key = ci_metadata.guid
 
         transaction.delete(self.ci_collection.document(key))
 
+        tombstone = {**ci_metadata.model_dump(), **self._change_fields(CiEventType.DELETED, change_position)}
+        tombstone["expire_at"] = DatetimeService.get_current_date_and_time() + timedelta(
+            days=settings.CI_TOMBSTONE_RETENTION_DAYS
+        )
+        transaction.set(self.ci_tombstone_collection.document(key), tombstone)
+
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
     def update_validator_version_and_ci(self, ci: dict, ci_metadata: CiMetadata):
         """
               Updates ci in bucket
@@ -228,5 +531,265 @@ class CiFirebaseRepository:
               ci: ci data
               """
         stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
-        self.update_ci_metadata(ci_metadata.guid, ci_metadata)
-        self.ci_bucket_repository.store_ci_schema(stored_ci_filename, ci)
+        # A content-addressed schema is stored before the metadata refers to it
+        schema_size = self._store_ci_schema(stored_ci_filename, ci, ci_metadata)
+        self.update_ci_metadata(ci_metadata.guid, ci_metadata, schema_size)
+        if settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED:
+            # Split fields of the previous schema are removed, so no field that was removed from the CI is kept
+            self.ci_bucket_repository.delete_split_ci_schema(ci_metadata.guid)
+            self.ci_bucket_repository.store_split_ci_schema(ci_metadata.guid, ci)
+
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_survey_summary(self, survey_id: str) -> CiSurveySummary | None:
+        """
+        Gets the summary of the CIs of a survey with a single document read. A survey whose CIs have all been
+        deleted keeps a summary with no versions, which is treated as missing.
+
+        Parameters:
+        survey_id (str): The survey id of the CIs.
+        """
+        set_span_attributes(survey_id=survey_id)
+        summary_document = self._survey_summary_document(survey_id).get()
+        if not summary_document.exists:
+            return None
+
+        survey_summary = CiSurveySummary.from_document(summary_document.to_dict())
+        return survey_summary if survey_summary.version_count > 0 else None
+
+    @traced("CiFirebaseRepository")
+    def reserve_change_positions_in_transaction(self, transaction: "Transaction", count: int = 1) -> range:
+        """
+        For internal use only - reserves the next positions in the change feed for the changes made by a
+        transaction. Every transaction that changes CI metadata reads and writes the same sequence document, so
+        they commit one at a time in the order of their positions, and a change can never become visible after a
+        change with a later position. It has to be called after the other reads of the transaction, and only once.
+
+        This makes the sequence document the limit on write throughput: firestore sustains about one write a
+        second to a single document, and concurrent creates, updates and deletes contend for it, being retried
+        by `@transactional` and failing once their attempts run out. Sharding the counter would lose the commit
+        order the change feed relies on, so bursts of writes should be spread out by the client instead.
+
+        Parameters:
+        transaction (Transaction): The transaction object.
+        count (int): The number of positions to reserve.
+        """
+        last_position = self.get_last_change_position_in_transaction(transaction)
+
+        transaction.set(
+            self.ci_change_sequence_collection.document(CHANGE_SEQUENCE_DOCUMENT_ID),
+            {"last_position": last_position + count},
+        )
+        return range(last_position + 1, last_position + count + 1)
+
+    @traced("CiFirebaseRepository")
+    def get_last_change_position_in_transaction(self, transaction: "Transaction") -> int:
+        """
+        For internal use only - gets the last position reserved in the change feed, 0 if none has been
+
+        Parameters:
+        transaction (Transaction): The transaction object.
+        """
+        for document in self.ci_change_sequence_collection.limit(1).stream(transaction=transaction):
+            return document.to_dict()["last_position"]
+        return 0
+
+    @traced("CiFirebaseRepository")
+    @observe_backend_latency("CiFirebaseRepository")
+    def get_ci_changes(self, since: int | None, limit: int) -> list[CiChangeRecord]:
+        """
+        Gets the earliest changes to CI metadata after a position in the change feed, from both the CI
+        metadata and the tombstones of deleted CIs. Both are read in a single read-only transaction, and only
+        up to the last position reserved when it starts, so a page never holds a change committed after an
+        earlier change it leaves out.
+
+        Parameters:
+        since (int | None): the `change_position` of the last change already seen, or None to start from the
+        earliest change.
+        limit (int): the maximum number of changes to return.
+        """
+        from google.cloud.firestore import transactional  # noqa: PLC0415 - deferred to keep startup fast
+
+        @transactional
+        def get_ci_changes_transaction_run(transaction: "Transaction") -> list[CiChangeRecord]:
+            # Changes are committed in the order of their positions, so every change up to the last position
+            # reserved has committed, and is seen by both reads
+            last_position = self.get_last_change_position_in_transaction(transaction)
+            return [
+                *self._get_changes_in_collection(transaction, self.ci_collection, since, last_position, limit),
+                *self._get_changes_in_collection(
+                    transaction, self.ci_tombstone_collection, since, last_position, limit
+                ),
+            ]
+
+        changes = get_ci_changes_transaction_run(self.firestore.set_read_only_transaction())
+        changes.sort(key=lambda change: change.change_position)
+
+        set_span_attributes(result_count=min(len(changes), limit))
+        return changes[:limit]
+
+    @staticmethod
+    def latest_document_id(survey_id: str, classifier_type: str, classifier_value: str, language: str) -> str:
+        """
+        The id of the document holding the latest version of a CI. Document ids cannot contain every character
+        the key can, so the key is hashed.
+
+        Parameters:
+        survey_id (str): the survey id of the CI.
+        classifier_type (str): the classifier type of the CI.
+        classifier_value (str): the classifier value of the CI.
+        language (str): the language of the CI.
+        """
+        key = json.dumps([survey_id, str(classifier_type), classifier_value, language])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def latest_document_data(cls, ci_metadata: CiMetadata | CiMetadataRecord) -> dict[str, Any]:
+        """
+        The data of the document holding the latest version of a CI: its metadata, with the hash of its schema if
+        it is stored content-addressed, so the schema can be located from the latest version alone
+
+        Parameters:
+        ci_metadata (CiMetadata | CiMetadataRecord): the metadata of the latest version of the CI.
+        """
+        return {**ci_metadata.model_dump(), **cls._schema_hash_fields(ci_metadata)}
+
+    @staticmethod
+    def survey_summary_document_id(survey_id: str) -> str:
+        """
+        The id of the document holding the summary of the CIs of a survey, hashed for the same reason as
+        `latest_document_id`
+
+        Parameters:
+        survey_id (str): the survey id of the CIs.
+        """
+        return hashlib.sha256(survey_id.encode("utf-8")).hexdigest()
+
+    def _survey_summary_document(self, survey_id: str):
+        """
+        For internal use only - the reference to the document holding the summary of the CIs of a survey
+        """
+        return self.ci_survey_summary_collection.document(self.survey_summary_document_id(survey_id))
+
+    def _survey_summary_changes(
+        self,
+        ci_metadata: CiMetadata | CiMetadataRecord,
+        version_change: int,
+        schema_bytes_change: int,
+        latest_ci_metadata: CiMetadata | CiMetadataRecord | None,
+    ) -> dict[str, Any]:
+        """
+        For internal use only - the changes to merge into a survey summary when a version of a CI is added or
+        removed. Counts are changed with server-side increments so the summary document is never read, and the
+        CI is removed from the summary when it has no latest version left. CIs are keyed by the id of their
+        latest version document, which is a valid field name whatever their classifier and language are.
+        """
+        from google.cloud.firestore import DELETE_FIELD, Increment  # noqa: PLC0415 - deferred to keep startup fast
+
+        ci_summary: Any = DELETE_FIELD
+        if latest_ci_metadata is not None:
+            ci_summary = {
+                "classifier_type": str(ci_metadata.classifier_type),
+                "classifier_value": ci_metadata.classifier_value,
+                "language": ci_metadata.language,
+                "latest_guid": latest_ci_metadata.guid,
+                "latest_ci_version": latest_ci_metadata.ci_version,
+                "version_count": Increment(version_change),
+            }
+
+        return {
+            "survey_id": ci_metadata.survey_id,
+            "version_count": Increment(version_change),
+            "schema_bytes": Increment(schema_bytes_change),
+            "cis": {
+                self.latest_document_id(
+                    ci_metadata.survey_id,
+                    ci_metadata.classifier_type,
+                    ci_metadata.classifier_value,
+                    ci_metadata.language,
+                ): ci_summary
+            },
+        }
+
+    @staticmethod
+    def _merge_survey_summary_changes(survey_summary_changes: dict[str, dict[str, Any]], changes: dict[str, Any]):
+        """
+        For internal use only - merges the changes to a survey summary into those already made to the same survey
+        """
+        from google.cloud.firestore import Increment  # noqa: PLC0415 - deferred to keep startup fast
+
+        survey_changes = survey_summary_changes.setdefault(changes["survey_id"], changes)
+        if survey_changes is not changes:
+            for field in ("version_count", "schema_bytes"):
+                survey_changes[field] = Increment(survey_changes[field].value + changes[field].value)
+            survey_changes["cis"].update(changes["cis"])
+
+    def _latest_document(self, ci_metadata: CiMetadata | CiMetadataRecord):
+        """
+        For internal use only - the reference to the document holding the latest version of a CI
+        """
+        return self.ci_latest_collection.document(
+            self.latest_document_id(
+                ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+            )
+        )
+
+    def _query_ci_versions(self, survey_id: str, classifier_type, classifier_value, language: str):
+        """
+        For internal use only - queries every version of a CI, latest first
+        """
+        return (
+            self.ci_collection.where("survey_id", "==", survey_id)
+            .where("classifier_type", "==", classifier_type)
+            .where("classifier_value", "==", classifier_value)
+            .where("language", "==", language)
+            .order_by("ci_version", direction=DESCENDING)
+        )
+
+    @staticmethod
+    def _get_changes_in_collection(
+        transaction: "Transaction", collection: "CollectionReference", since: int | None, until: int, limit: int
+    ) -> list[CiChangeRecord]:
+        """
+        For internal use only - gets the earliest changes after `since`, and up to `until`, in a single
+        collection. Ordering by the field filtered on only needs firestore's automatic single-field index.
+        """
+        query = collection.where("change_position", "<=", until)
+        if since is not None:
+            query = query.where("change_position", ">", since)
+        query = query.order_by("change_position").limit(limit)
+
+        return [
+            CiChangeRecord.from_document(document.to_dict()) for document in query.stream(transaction=transaction)
+        ]
+
+    def _store_ci_schema(self, stored_ci_filename: str, ci: dict, ci_metadata: CiMetadata) -> int:
+        """
+        For internal use only - stores a CI schema, content-addressed if its metadata has a schema hash, and
+        returns its stored size in bytes
+        """
+        if ci_metadata.schema_hash:
+            return self.ci_bucket_repository.store_content_addressed_ci_schema(stored_ci_filename, ci)
+        return self.ci_bucket_repository.store_ci_schema(stored_ci_filename, ci)
+
+    @staticmethod
+    def _schema_hash_fields(ci_metadata: CiMetadata | CiMetadataRecord) -> dict[str, Any]:
+        """
+        For internal use only - the field recording the hash of a content-addressed schema, which `model_dump`
+        leaves out
+        """
+        if ci_metadata.schema_hash:
+            return {"schema_hash": ci_metadata.schema_hash}
+        return {}
+
+    @staticmethod
+    def _change_fields(event_type: CiEventType, change_position: int) -> dict[str, Any]:
+        """
+        For internal use only - the fields recording the latest change to a document for the change feed.
+        `updated_at` is taken from the clock of the instance, so changes are ordered by `change_position`.
+        """
+        return {
+            "event_type": event_type.value,
+            "updated_at": DatetimeService.get_current_date_and_time().strftime(settings.PUBLISHED_AT_FORMAT),
+            "change_position": change_position,
+        }
@@ -1,32 +1,71 @@
-from google.cloud.firestore import Client, CollectionReference
+from typing import TYPE_CHECKING
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client, CollectionReference
+
 
 class FirebaseLoader:
-    def __init__(self, firestore_client: Client) -> None:
+    def __init__(self, firestore_client: "Client") -> None:
         self.client = firestore_client
         self.ci_collection = self._set_collection(settings.CI_FIRESTORE_COLLECTION_NAME)
+        self.ci_tombstone_collection = self._set_collection(settings.CI_TOMBSTONE_FIRESTORE_COLLECTION_NAME)
+        self.ci_change_sequence_collection = self._set_collection(
+            settings.CI_CHANGE_SEQUENCE_FIRESTORE_COLLECTION_NAME
+        )
+        self.ci_latest_collection = self._set_collection(settings.CI_LATEST_FIRESTORE_COLLECTION_NAME)
+        self.ci_survey_summary_collection = self._set_collection(settings.CI_SURVEY_SUMMARY_FIRESTORE_COLLECTION_NAME)
 
-    def get_client(self) -> Client:
+    def get_client(self) -> "Client":
         """
         Get the firestore client
         """
         return self.client
 
-    def get_ci_collection(self) -> CollectionReference:
+    def get_ci_collection(self) -> "CollectionReference":
         """
         Get the ci collection from firestore
         """
         return self.ci_collection
 
+    def get_ci_tombstone_collection(self) -> "CollectionReference":
+        """
+        Get the collection of deleted ci metadata from firestore
+        """
+        return self.ci_tombstone_collection
+
+    def get_ci_change_sequence_collection(self) -> "CollectionReference":
+        """
+        Get the collection holding the position of the latest change in the change feed from firestore
+        """
+        return self.ci_change_sequence_collection
+
+    def get_ci_latest_collection(self) -> "CollectionReference":
+        """
+        Get the collection of latest ci version metadata from firestore
+        """
+        return self.ci_latest_collection
+
+    def get_ci_survey_summary_collection(self) -> "CollectionReference":
+        """
+        Get the collection of per-survey ci summaries from firestore
+        """
+        return self.ci_survey_summary_collection
+
     def set_transaction(self):
         """
         Set the transaction for firestore client
         """
         return self.client.transaction()
 
-    def _set_collection(self, collection) -> CollectionReference:
+    def set_read_only_transaction(self):
+        """
+        Set a read-only transaction for firestore client, whose reads all see the same snapshot
+        """
+        return self.client.transaction(read_only=True)
+
+    def _set_collection(self, collection) -> "CollectionReference":
         """
         Set up the collection reference for schemas and datasets
         """
@@ -1,10 +1,10 @@
 from dataclasses import asdict
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 import app.exception.exception_response_models as erm
-from app.config import Settings, logging
+from app.config import logging
 from app.dependencies import get_ci_processor_service
 from app.exception import exceptions
 from app.exception.exception_response_models import ExceptionResponseModel
@@ -18,11 +18,11 @@ from app.models.requests import (
 from app.models.responses import CiMetadata, CiValidatorMetadata
 from app.services.ci_processor_service import CiProcessorService
 from app.services.ci_schema_location_service import CiSchemaLocationService
+from app.telemetry.tracing import set_span_attributes
 
 router = APIRouter(tags=["legacy"])
 
 logger = logging.getLogger(__name__)
-settings = Settings()
 
 
 @router.get(
@@ -55,7 +55,7 @@ async def http_get_ci_metadata_v2(
     This endpoint is deprecated.
     """
     logger.info("Getting ci metadata via v2 endpoint")
-    logger.debug(f"get_ci_metadata_v2: Input data: query_params={query_params.__dict__}")
+    logger.debug("get_ci_metadata_v2: Input data: query_params=%s", query_params.__dict__)
 
     # If no parameters are provided, return all CI metadata
     if query_params.params_all_none(query_params.__dict__.keys()):
@@ -75,7 +75,7 @@ async def http_get_ci_metadata_v2(
     if not ci_metadata_collection or len(ci_metadata_collection) == 0:
         error_message = "get_ci_metadata_v2: exception raised - No collection instruments found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{asdict(query_params)}")
+        logger.debug("%s:%s", error_message, asdict(query_params))
         raise exceptions.ExceptionNoCIFound
 
     # Call model_dump to remove optional fields that are None
@@ -85,7 +85,7 @@ async def http_get_ci_metadata_v2(
 
     logger.info("CI metadata retrieved successfully.")
 
-    return return_ci_metadata_collection
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=return_ci_metadata_collection)
 
 
 # Fetching CI schema from Bucket Version 2
@@ -122,35 +122,36 @@ async def http_get_ci_schema_v2(
     This endpoint is deprecated.
     """
     logger.info("Getting ci schema via v2 endpoint...")
-    logger.debug(f"Input data: query_params={query_params.__dict__}")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
 
     if query_params.guid is None:
         raise exceptions.ExceptionIncorrectKeyNames
 
+    set_span_attributes(guid=query_params.guid)
     ci_metadata = ci_processor_service.get_ci_metadata_with_id(query_params.guid)
 
     if not ci_metadata:
         error_message = "get_ci_schema_v2: exception raised - No collection instrument metadata found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{query_params.guid}")
+        logger.debug("%s:%s", error_message, query_params.guid)
         raise exceptions.ExceptionNoCIMetadata
 
     bucket_schema_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
 
     logger.info("Bucket schema location successfully retrieved. Getting schema")
-    logger.debug(f"Bucket schema location: {bucket_schema_filename}")
+    logger.debug("Bucket schema location: %s", bucket_schema_filename)
 
-    ci_schema = ci_processor_service.ci_bucket_repository.retrieve_ci_schema(bucket_schema_filename)
+    ci_schema = ci_processor_service.get_ci_schema(bucket_schema_filename)
 
     if not ci_schema:
         message = "get_ci_schema_v2: exception raised - No CI found for"
         logger.info(message)
-        logger.debug(f"{message}:{query_params.guid}")
+        logger.debug("%s:%s", message, query_params.guid)
         raise exceptions.ExceptionNoCIFound
 
     logger.info("Schema successfully retrieved.")
 
-    return JSONResponse(status_code=status.HTTP_200_OK, content=ci_schema)
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=ci_schema)
 
 
 @router.post(
@@ -188,14 +189,15 @@ async def http_post_ci_schema_v3(
 
     if query_params.guid == "" or query_params.guid is None:
         message = "No guid supplied"
-        logger.debug(f"{message}")
+        logger.debug(message)
         raise exceptions.ExceptionMissingInvalidGuid
 
     if query_params.validator_version == "" or query_params.validator_version is None:
         message = "No validation version supplied"
-        logger.debug(f"{message}")
+        logger.debug(message)
         raise exceptions.ExceptionNoValidator
 
+    set_span_attributes(guid=query_params.guid, survey_id=post_data.survey_id)
     ci_metadata = ci_processor_service.process_raw_ci(post_data,
                                                       query_params.guid,
                                                       query_params.validator_version,
@@ -209,6 +211,10 @@ async def http_post_ci_schema_v3(
 @router.get(
     "/v1/ci_validator_metadata",
     responses={
+        200: {
+            "model": list[CiValidatorMetadata],
+            "description": "The validator metadata of every CI.",
+        },
         500: {
             "model": ExceptionResponseModel,
             "content": {"application/json": {"example": erm.erm_500_global_exception}},
@@ -222,17 +228,22 @@ async def http_post_ci_schema_v3(
 )
 async def http_get_ci_validator_metadata_v1(
         ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
-) -> list[CiValidatorMetadata]:
+):
     """
     GET method that returns the validator metadata for all collection instruments in CIR.
     This endpoint is deprecated.
     """
     logger.info("Getting ci validator metadata via v1 endpoint")
 
-    ci_validator_metadata_collection = ci_processor_service.get_ci_validator_metadata_collection()
+    ci_validator_metadata_snapshot = ci_processor_service.get_ci_validator_metadata_snapshot()
 
-    if not ci_validator_metadata_collection or len(ci_validator_metadata_collection) == 0:
+    if ci_validator_metadata_snapshot.row_count == 0:
         logger.error("No collection instrument validator metadata found")
         raise exceptions.ExceptionNoCIValidatorMetadata
 
-    return ci_validator_metadata_collection
+    # The snapshot is already serialised, and `Age` tells pollers how long ago it was read
+    return Response(
+        content=ci_validator_metadata_snapshot.content,
+        media_type="application/json",
+        headers={"Age": str(int(ci_validator_metadata_snapshot.age_seconds))},
+    )
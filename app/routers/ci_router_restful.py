@@ -1,29 +1,35 @@
 from dataclasses import asdict
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 
 import app.exception.exception_response_models as erm
-from app.config import Settings, logging
+from app.config import logging, settings
 from app.dependencies import get_ci_processor_service
 from app.exception import exceptions
 from app.exception.exception_response_models import ExceptionResponseModel
+from app.middleware.compression import accepts_encoding
 from app.models.classifier import Classifiers
 from app.models.requests import (
     DeleteCiV1Params,
+    GetCiChangesV1Params,
+    GetCiLatestV1Params,
     GetCiMetadataV2Params,
-    GetCiSchemaV2Params,
+    GetCiSchemaV3Params,
+    GetCiSurveySummaryV1Params,
     PostCiSchemaV1Data,
     PostCiSchemaV3Params,
 )
-from app.models.responses import CiMetadata, CiValidatorMetadata
+from app.models.responses import CiMetadata, CiSurveySummary, CiValidatorMetadata
+from app.services.ci_json_pointer_service import CiJsonPointerService
 from app.services.ci_processor_service import CiProcessorService
+from app.services.ci_schema_codec_service import CODEC_GZIP
 from app.services.ci_schema_location_service import CiSchemaLocationService
+from app.telemetry.tracing import set_span_attributes
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
-settings = Settings()
 
 
 @router.post(
@@ -59,15 +65,16 @@ async def create_collection_instrument(
     - A ci_version is optional, if not specified, it will increment automatically
     """
     logger.info("Creating new collection instrument")
+    set_span_attributes(guid=query_params.guid, survey_id=post_data.survey_id)
 
     if query_params.guid == "" or query_params.guid is None:
         message = "No guid supplied"
-        logger.debug(f"{message}")
+        logger.debug(message)
         raise exceptions.ExceptionMissingInvalidGuid
 
     if query_params.validator_version == "" or query_params.validator_version is None:
         message = "No validation version supplied"
-        logger.debug(f"{message}")
+        logger.debug(message)
         raise exceptions.ExceptionNoValidator
 
     ci_metadata = ci_processor_service.process_raw_ci(post_data,
@@ -80,6 +87,67 @@ async def create_collection_instrument(
     return ci_metadata.model_dump()
 
 
+@router.post(
+    "/collection-instruments/stream",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": PostCiSchemaV1Data.model_json_schema()}},
+            "required": True,
+        },
+    },
+    responses={
+        200: {
+            "model": CiMetadata,
+            "description": (
+                    "Successfully created a CI. This is illustrated with the returned response containing the "
+                    "metadata of the CI. "
+            ),
+        },
+        400: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_400_validation_exception}},
+        },
+        500: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_500_global_exception}},
+        },
+    },
+)
+async def stream_collection_instrument(
+        request: Request,
+        query_params: PostCiSchemaV3Params = Depends(),
+        ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
+):
+    """
+    POST method to create a new collection instrument from a very large CI
+
+    The CI is streamed to storage as it is received rather than read into memory, so only its top-level fields
+    are validated, and it is stored exactly as it was sent. Top-level fields that `POST /collection-instruments`
+    would drop are rejected. The parameters are the same as `POST /collection-instruments`.
+    """
+    logger.info("Streaming new collection instrument")
+    set_span_attributes(guid=query_params.guid)
+
+    if query_params.guid == "" or query_params.guid is None:
+        message = "No guid supplied"
+        logger.debug(message)
+        raise exceptions.ExceptionMissingInvalidGuid
+
+    if query_params.validator_version == "" or query_params.validator_version is None:
+        message = "No validation version supplied"
+        logger.debug(message)
+        raise exceptions.ExceptionNoValidator
+
+    ci_metadata = await ci_processor_service.process_streamed_ci(request.stream(),
+                                                                 query_params.guid,
+                                                                 query_params.validator_version,
+                                                                 query_params.ci_version)
+
+    logger.info("CI schema streamed successfully")
+
+    return ci_metadata.model_dump()
+
+
 @router.get(
     "/collection-instruments/metadata",
     responses={
@@ -109,7 +177,8 @@ async def get_collection_instruments_metadata(
     - Provide no parameters. (all ci metadata is returned)
     """
     logger.info("Getting metadata for collection instrument")
-    logger.debug(f"get_collection_instruments_metadata_v2: Input data: query_params={query_params.__dict__}")
+    logger.debug("get_collection_instruments_metadata_v2: Input data: query_params=%s", query_params.__dict__)
+    set_span_attributes(survey_id=query_params.survey_id)
 
     if query_params.params_all_none(query_params.__dict__.keys()):
         ci_metadata_collection = ci_processor_service.get_all_ci_metadata_collection()
@@ -127,16 +196,157 @@ async def get_collection_instruments_metadata(
     if not ci_metadata_collection or len(ci_metadata_collection) == 0:
         error_message = "get_collection_instruments_metadata_v2: exception raised - No collection instruments found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{asdict(query_params)}")
+        logger.debug("%s:%s", error_message, asdict(query_params))
         raise exceptions.ExceptionNoCIFound
 
     return_ci_metadata_collection = []
     for ci_metadata in ci_metadata_collection:
         return_ci_metadata_collection.append(ci_metadata.model_dump())
 
+    set_span_attributes(result_count=len(return_ci_metadata_collection))
     logger.info("CI metadata retrieved successfully.")
 
-    return return_ci_metadata_collection
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=return_ci_metadata_collection)
+
+
+@router.get(
+    "/collection-instruments/changes",
+    responses={
+        400: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_400_validation_exception}},
+        },
+        500: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_500_global_exception}},
+        },
+    },
+)
+async def get_collection_instrument_changes(
+    query_params: GetCiChangesV1Params = Depends(),
+    ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
+):
+    """
+    GET method that returns the CI metadata created, updated or deleted since a position in the change feed,
+    oldest first, so a copy of the metadata can be kept up to date without reading all of it.
+
+    - Leave out `since` to start from the earliest change
+    - Pass the returned `next_token` as `since` to get the following changes
+    - `has_more` is true if more changes can be read straight away
+    """
+    logger.info("Getting collection instrument changes")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
+
+    limit = min(query_params.limit or settings.CI_CHANGES_PAGE_SIZE, settings.CI_CHANGES_PAGE_SIZE)
+    ci_change_feed = ci_processor_service.get_ci_changes(query_params.since, limit)
+
+    logger.info("CI changes retrieved successfully.")
+
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=ci_change_feed.model_dump())
+
+
+@router.get(
+    "/collection-instruments/latest",
+    responses={
+        400: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_400_incorrect_key_names_exception}},
+        },
+        500: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_500_global_exception}},
+        },
+        404: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_404_no_ci_exception}},
+        },
+    },
+)
+async def get_latest_collection_instruments_metadata(
+    query_params: GetCiLatestV1Params = Depends(),
+    ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
+):
+    """
+    GET method that returns the metadata of the latest version of collection instruments.
+
+    - Provide survey_id, classifiers, language. (the latest version of that CI is returned)
+    - Provide survey_id. (the latest version of each CI of the survey is returned)
+    - Provide no parameters. (the latest version of every CI is returned)
+    """
+    logger.info("Getting latest metadata for collection instruments")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
+    set_span_attributes(survey_id=query_params.survey_id)
+
+    classifier_keys = ("classifier_type", "classifier_value", "language")
+    if query_params.params_not_none(query_params.__dict__.keys()):
+        latest_ci_metadata = ci_processor_service.get_latest_ci_metadata(
+            query_params.survey_id, query_params.classifier_type, query_params.classifier_value, query_params.language
+        )
+        ci_metadata_collection = [latest_ci_metadata] if latest_ci_metadata else []
+    elif query_params.params_all_none(classifier_keys):
+        ci_metadata_collection = ci_processor_service.get_latest_ci_metadata_collection(query_params.survey_id)
+    else:
+        raise exceptions.ExceptionIncorrectKeyNames
+
+    if not ci_metadata_collection:
+        logger.error("get_latest_collection_instruments_metadata: exception raised - No collection instruments found")
+        logger.debug("No latest collection instruments found: %s", asdict(query_params))
+        raise exceptions.ExceptionNoCIFound
+
+    set_span_attributes(result_count=len(ci_metadata_collection))
+    logger.info("Latest CI metadata retrieved successfully.")
+
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK, content=[ci_metadata.model_dump() for ci_metadata in ci_metadata_collection]
+    )
+
+
+@router.get(
+    "/collection-instruments/summary",
+    responses={
+        200: {
+            "model": CiSurveySummary,
+            "description": "The number of CI versions of the survey, the latest version of each CI and the total "
+            "size of their stored schemas in bytes.",
+        },
+        400: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_400_incorrect_key_names_exception}},
+        },
+        500: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_500_global_exception}},
+        },
+        404: {
+            "model": ExceptionResponseModel,
+            "content": {"application/json": {"example": erm.erm_404_no_ci_exception}},
+        },
+    },
+)
+async def get_survey_summary(
+    query_params: GetCiSurveySummaryV1Params = Depends(),
+    ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
+):
+    """
+    GET method that returns the summary of the collection instruments of a survey, read from a single document
+    kept up to date as CIs are created, updated and deleted.
+    """
+    logger.info("Getting survey summary")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
+    set_span_attributes(survey_id=query_params.survey_id)
+
+    if query_params.survey_id is None:
+        raise exceptions.ExceptionIncorrectKeyNames
+
+    survey_summary = ci_processor_service.get_survey_summary(query_params.survey_id)
+
+    if not survey_summary:
+        logger.error("get_survey_summary: exception raised - No collection instruments found: %s", query_params.survey_id)
+        raise exceptions.ExceptionNoCIFound
+
+    logger.info("Survey summary retrieved successfully.")
+
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=survey_summary.model_dump())
 
 
 @router.get(
@@ -148,6 +358,9 @@ async def get_collection_instruments_metadata(
                     "Successfully Queried a CI. This is illustrated with the returned response containing the schema of the CI."
             ),
         },
+        307: {
+            "description": "Redirect to a short-lived signed url of the stored schema, if `redirect` is set.",
+        },
         500: {
             "model": ExceptionResponseModel,
             "content": {"application/json": {"example": erm.erm_500_global_exception}},
@@ -163,14 +376,21 @@ async def get_collection_instruments_metadata(
     },
 )
 async def get_collection_instrument_schema_by_guid(
-        query_params: GetCiSchemaV2Params = Depends(),
+        request: Request,
+        query_params: GetCiSchemaV3Params = Depends(),
         ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
 ):
     """
     GET method that fetches a CI schema by GUID.
+    Schemas stored gzipped are sent as stored to clients accepting gzip.
+    With `redirect`, and signed urls enabled, responds with a temporary redirect to a short-lived signed url of
+    the stored schema, so it is downloaded straight from the bucket.
+    With `fields`, only the parts of the schema referred to by each JSON Pointer are returned, extracted from
+    the cached schema, or from the split fields of the stored schema that are needed.
     """
     logger.info("Fetching schema for collection instrument")
-    logger.debug(f"Input data: query_params={query_params.__dict__}")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
+    set_span_attributes(guid=query_params.guid)
 
     if query_params.guid is None:
         raise exceptions.ExceptionIncorrectKeyNames
@@ -180,30 +400,67 @@ async def get_collection_instrument_schema_by_guid(
     if not ci_metadata:
         error_message = "get_collection_instrument_schema_by_guid_v2: exception raised - No collection instrument metadata found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{query_params.guid}")
+        logger.debug("%s:%s", error_message, query_params.guid)
         raise exceptions.ExceptionNoCIMetadata
 
     bucket_schema_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
 
     logger.info("Bucket schema location successfully retrieved. Getting schema")
-    logger.debug(f"Bucket schema location: {bucket_schema_filename}")
+    logger.debug("Bucket schema location: %s", bucket_schema_filename)
+
+    if query_params.fields:
+        ci_schema = ci_processor_service.get_ci_schema_for_fields(
+            ci_metadata.guid, bucket_schema_filename, query_params.fields
+        )
+        if not ci_schema:
+            logger.error("get_collection_instrument_schema_by_guid: exception raised - No CI found")
+            raise exceptions.ExceptionNoCIFound
+        ci_fields = CiJsonPointerService.extract_ci_fields(ci_schema, query_params.fields)
+        logger.info("Schema fields successfully retrieved.")
+        return ORJSONResponse(status_code=status.HTTP_200_OK, content=ci_fields)
+
+    if query_params.redirect and settings.CI_SCHEMA_SIGNED_URL_ENABLED:
+        signed_url = ci_processor_service.get_ci_schema_signed_url(bucket_schema_filename)
+        logger.info("Redirecting to signed schema url")
+        # The url stops working once it expires, so the redirect is never cached
+        return RedirectResponse(
+            signed_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers={"Cache-Control": "no-store"}
+        )
+
+    ci_schema = None
+    if settings.CI_SCHEMA_STORAGE_CODEC == CODEC_GZIP and accepts_encoding(
+        request.headers.get("accept-encoding", ""), "gzip"
+    ):
+        gzipped_ci_schema, ci_schema = ci_processor_service.get_gzipped_ci_schema(bucket_schema_filename)
+        if gzipped_ci_schema:
+            logger.info("Schema successfully retrieved. Sending gzipped schema as stored")
+            return Response(
+                content=gzipped_ci_schema,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
 
-    ci_schema = ci_processor_service.ci_bucket_repository.retrieve_ci_schema(bucket_schema_filename)
+    if ci_schema is None:
+        ci_schema = ci_processor_service.get_ci_schema(bucket_schema_filename)
 
     if not ci_schema:
         message = "get_collection_instrument_schema_by_guid_v2: exception raised - No CI found for"
         logger.info(message)
-        logger.debug(f"{message}:{query_params.guid}")
+        logger.debug("%s:%s", message, query_params.guid)
         raise exceptions.ExceptionNoCIFound
 
     logger.info("Schema successfully retrieved.")
 
-    return JSONResponse(status_code=status.HTTP_200_OK, content=ci_schema)
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=ci_schema)
 
 
 @router.get(
     "/collection-instruments/validator-metadata",
     responses={
+        200: {
+            "model": list[CiValidatorMetadata],
+            "description": "The validator metadata of every CI.",
+        },
         500: {
             "model": ExceptionResponseModel,
             "content": {"application/json": {"example": erm.erm_500_global_exception}},
@@ -216,19 +473,24 @@ async def get_collection_instrument_schema_by_guid(
 )
 async def get_collection_instruments_validator_metadata(
     ci_processor_service: CiProcessorService = Depends(get_ci_processor_service),
-) -> list[CiValidatorMetadata]:
+):
     """
     GET method that returns the validator metadata for all collection instruments in CIR.
     """
     logger.info("Getting ci validator metadata via v1 endpoint")
 
-    ci_validator_metadata_collection = ci_processor_service.get_ci_validator_metadata_collection()
+    ci_validator_metadata_snapshot = ci_processor_service.get_ci_validator_metadata_snapshot()
 
-    if not ci_validator_metadata_collection or len(ci_validator_metadata_collection) == 0:
+    if ci_validator_metadata_snapshot.row_count == 0:
         logger.error("No collection instrument validator metadata found")
         raise exceptions.ExceptionNoCIValidatorMetadata
 
-    return ci_validator_metadata_collection
+    # The snapshot is already serialised, and `Age` tells pollers how long ago it was read
+    return Response(
+        content=ci_validator_metadata_snapshot.content,
+        media_type="application/json",
+        headers={"Age": str(int(ci_validator_metadata_snapshot.age_seconds))},
+    )
 
 
 @router.delete(
@@ -257,7 +519,8 @@ async def delete_collection_instrument(
     This is a helper endpoint that is used for cleaning up after tests.
     """
     logger.info("Deleting ci metadata and schema")
-    logger.debug(f"Input data: query_params={query_params.__dict__}")
+    logger.debug("Input data: query_params=%s", query_params.__dict__)
+    set_span_attributes(survey_id=query_params.survey_id)
 
     if query_params.survey_id is None:
         raise exceptions.ExceptionIncorrectKeyNames
@@ -265,11 +528,11 @@ async def delete_collection_instrument(
     ci_metadata_collection = ci_processor_service.get_ci_metadata_collection_with_survey_id(query_params.survey_id)
 
     if not ci_metadata_collection:
-        logger.error(f"delete_collection_instrument: exception raised - No collection instrument found: {query_params.survey_id}")
+        logger.error("delete_collection_instrument: exception raised - No collection instrument found: %s", query_params.survey_id)
         raise exceptions.ExceptionNoCIToDelete
 
     ci_processor_service.delete_ci_in_transaction(ci_metadata_collection)
 
     logger.info("CI metadata and schema successfully deleted")
     response_content = f"CI metadata and schema successfully deleted for {query_params.survey_id}."
-    return JSONResponse(status_code=status.HTTP_200_OK, content=response_content)
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content=response_content)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/plain": {}},
+            "description": "Metrics of this worker in the Prometheus text format",
+        },
+    },
+)
+async def http_get_metrics():
+    """
+    GET method that returns request, backend and schema size metrics in the Prometheus text format
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,16 +1,23 @@
+import asyncio
 from dataclasses import asdict
 
-from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 
 import app.exception.exception_response_models as erm
-from app.config import Settings
+from app.cache.ci_cache import ci_cache
+from app.config import settings
+from app.dependencies import get_bucket_loader, get_firebase_loader, get_publisher_service
+from app.events.publisher import Publisher
 from app.exception import exceptions
 from app.exception.exception_response_models import ExceptionResponseModel
-from app.models.responses import DeploymentStatus
+from app.models.responses import DeploymentStatus, ReadinessStatus
+from app.repositories.buckets.bucket_loader import BucketLoader
+from app.repositories.firebase.firebase_loader import FirebaseLoader
+from app.services.readiness_service import ReadinessService
 
 router = APIRouter()
-settings = Settings()
 
 
 @router.get(
@@ -33,6 +40,53 @@ async def http_get_status():
     application_version = settings.CIR_APPLICATION_VERSION
     if application_version:
         response_content = DeploymentStatus(version=settings.CIR_APPLICATION_VERSION)
-        return JSONResponse(status_code=status.HTTP_200_OK, content=asdict(response_content))
+        return ORJSONResponse(status_code=status.HTTP_200_OK, content=asdict(response_content))
     else:
         raise exceptions.GlobalException
+
+
+@router.get(
+    "/ready",
+    responses={
+        status.HTTP_200_OK: {
+            "model": ReadinessStatus,
+            "description": "Instance is connected to its backing services and ready to serve requests",
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "model": ReadinessStatus,
+            "description": "A backing service is unreachable or slow, or the cache is still cold",
+        },
+    },
+)
+async def http_get_ready(
+        bucket_loader: BucketLoader = Depends(get_bucket_loader),
+        firebase_loader: FirebaseLoader = Depends(get_firebase_loader),
+        publisher: Publisher = Depends(get_publisher_service),
+):
+    """
+    GET method that probes firestore, cloud storage and pub/sub, returning the probe latency of each.
+    Returns 503 if any probe fails or exceeds `READINESS_MAX_PROBE_LATENCY_MS`, or if cache pre-warming
+    is enabled and its first attempt has not finished. A failed pre-warm is retried in the background while the
+    cache fills on demand, so it does not keep the instance out of service.
+    """
+    firestore_readiness, storage_readiness, pubsub_readiness = await asyncio.gather(
+        run_in_threadpool(ReadinessService.probe_firestore, firebase_loader),
+        run_in_threadpool(ReadinessService.probe_storage, bucket_loader),
+        run_in_threadpool(ReadinessService.probe_pubsub, publisher),
+    )
+
+    cache_required = ci_cache.enabled and settings.CI_CACHE_PREWARM_ENABLED
+    ready = (not cache_required or ci_cache.prewarm_attempted) and all(
+        ReadinessService.is_ready(dependency, settings.READINESS_MAX_PROBE_LATENCY_MS)
+        for dependency in (firestore_readiness, storage_readiness, pubsub_readiness)
+    )
+
+    response_content = ReadinessStatus(
+        ready=ready,
+        cache_warm=ci_cache.warm,
+        firestore=firestore_readiness,
+        storage=storage_readiness,
+        pubsub=pubsub_readiness,
+    )
+    status_code = status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    return ORJSONResponse(status_code=status_code, content=asdict(response_content))
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends
 
 import app.exception.exception_response_models as erm
-from app.config import Settings, logging
+from app.config import logging
 from app.dependencies import get_ci_processor_service
 from app.exception import exceptions
 from app.exception.exception_response_models import ExceptionResponseModel
@@ -16,7 +16,6 @@ from app.services.ci_processor_service import CiProcessorService
 router = APIRouter(tags=["legacy"])
 
 logger = logging.getLogger(__name__)
-settings = Settings()
 
 
 @router.put(
@@ -57,7 +56,7 @@ async def http_put_ci_validator_version_v1(
     if not ci_metadata:
         error_message = "patch_ci_validator: exception raised - No collection instrument metadata found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{query_params.guid}")
+        logger.debug("%s:%s", error_message, query_params.guid)
         raise exceptions.ExceptionNoCIMetadata
 
     if ci_metadata.validator_version == query_params.validator_version:
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 
 import app.exception.exception_response_models as erm
-from app.config import Settings, logging
+from app.config import logging
 from app.dependencies import get_ci_processor_service
 from app.exception import exceptions
 from app.exception.exception_response_models import ExceptionResponseModel
@@ -11,11 +11,11 @@ from app.models.requests import (
 )
 from app.models.responses import CiMetadata
 from app.services.ci_processor_service import CiProcessorService
+from app.telemetry.tracing import set_span_attributes
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
-settings = Settings()
 
 
 @router.put(
@@ -50,7 +50,8 @@ async def put_collection_instrument_validator_version(
     PUT method that updates validator_version and CI metadata by Guid.
     """
     logger.info("Putting validator version")
-    logger.debug(f"Input data: guid={query_params.guid}, query_params={query_params.__dict__}")
+    logger.debug("Input data: guid=%s, query_params=%s", query_params.guid, query_params.__dict__)
+    set_span_attributes(guid=query_params.guid)
 
     if  not query_params.params_not_none(query_params.__dict__.keys()):
         raise exceptions.ExceptionIncorrectKeyNames
@@ -60,7 +61,7 @@ async def put_collection_instrument_validator_version(
     if not ci_metadata:
         error_message = "put_collection_instrument_validator_version: exception raised - No collection instrument metadata found"
         logger.error(error_message)
-        logger.debug(f"{error_message}:{query_params.guid}")
+        logger.debug("%s:%s", error_message, query_params.guid)
         raise exceptions.ExceptionNoCIMetadata
 
     if ci_metadata.validator_version == query_params.validator_version:
@@ -0,0 +1,31 @@
+import uvicorn
+
+from app.config import settings
+
+
+def run() -> None:
+    """
+    Start the application with the `SERVER_PROFILE` server profile:
+    * `development` runs a single worker that reloads when the code changes
+    * `production` runs `SERVER_WORKERS` workers using uvloop and httptools, tuned by the `SERVER_*` settings
+    """
+    if settings.SERVER_PROFILE == "development":
+        uvicorn.run("app.main:app", host=settings.SERVER_HOST, port=settings.PORT, reload=True)
+        return
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.PORT,
+        workers=settings.SERVER_WORKERS,
+        loop="uvloop",
+        http="httptools",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=settings.SERVER_ACCESS_LOG,
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+
+from app.exception import exceptions
+
+
+class ChangeTokenService:
+    @staticmethod
+    def encode(change_position: int) -> str:
+        """
+        Encode the position of a change in the change feed as an opaque token
+
+        Parameters:
+        change_position (int): the `change_position` of the change.
+        """
+        return base64.urlsafe_b64encode(json.dumps(change_position).encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode(token: str) -> int:
+        """
+        Decode a change feed token, raising `ValidationException` if it was not issued by `encode`
+
+        Parameters:
+        token (str): the token returned as `next_token` by the change feed.
+        """
+        try:
+            change_position = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        except (UnicodeEncodeError, binascii.Error, ValueError) as exc:
+            raise exceptions.ValidationException from exc
+        # `bool` is a subclass of `int`
+        if not isinstance(change_position, int) or isinstance(change_position, bool):
+            raise exceptions.ValidationException
+        return change_position
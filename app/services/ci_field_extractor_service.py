@@ -0,0 +1,76 @@
+import ijson
+
+from app.exception import exceptions
+
+SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+# Nested values are not kept, only an empty value of the same type so that the type of every field can be checked
+CONTAINER_EVENTS = {"start_map": dict, "start_array": list}
+
+
+class CiFieldExtractor:
+    """
+    Extracts the top-level fields of a CI while its JSON body is streamed, without building the rest of the CI
+    in memory. Objects and arrays are extracted empty. The whole body is still parsed, so a body that is not a
+    valid JSON object is rejected.
+    """
+
+    def __init__(self) -> None:
+        self.fields: dict = {}
+        self._is_object = False
+        self._parser = ijson.parse_coro(self._collect())
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Parse the next chunk of the body
+
+        Parameters:
+        chunk (bytes): the next bytes of the CI JSON body
+        """
+        # An empty chunk would end the parser; request bodies are streamed with one at the end
+        if not chunk:
+            return
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as exc:
+            raise exceptions.ValidationException from exc
+
+    def close(self) -> dict:
+        """
+        Finish parsing the body, failing if it was incomplete
+
+        Returns:
+        dict: the extracted fields that were present in the CI
+        """
+        try:
+            self._parser.close()
+        except ijson.JSONError as exc:
+            raise exceptions.ValidationException from exc
+        if not self._is_object:
+            raise exceptions.ValidationException
+        return self.fields
+
+    @ijson.utils.coroutine
+    def _collect(self):
+        """
+        For internal use only - receives the `(prefix, event, value)` events of the parser. The depth of each
+        event is tracked, as a prefix cannot tell a top-level key containing `.` from a nested key.
+        """
+        _, event, _ = yield
+        if event != "start_map":
+            raise exceptions.ValidationException
+        self._is_object = True
+
+        depth, key = 1, None
+        while True:
+            _, event, value = yield
+            if event in CONTAINER_EVENTS:
+                if depth == 1:
+                    self.fields[key] = CONTAINER_EVENTS[event]()
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            elif depth == 1 and event == "map_key":
+                key = value
+            elif depth == 1 and event in SCALAR_EVENTS:
+                self.fields[key] = value
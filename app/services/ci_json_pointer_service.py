@@ -0,0 +1,74 @@
+from collections.abc import Iterable
+from typing import Any
+
+from app.exception import exceptions
+
+
+class CiJsonPointerService:
+    """
+    Extracts parts of a CI schema by JSON Pointer (RFC 6901), e.g. `/sections/0/groups` or `/metadata`
+    """
+
+    @staticmethod
+    def parse_json_pointer(pointer: str) -> list[str]:
+        """
+        Split a JSON Pointer into its reference tokens, unescaping `~1` to `/` and `~0` to `~`.
+        The empty pointer refers to the whole document.
+
+        Parameters:
+        pointer (str): the JSON Pointer to parse.
+        """
+        if pointer == "":
+            return []
+        if not pointer.startswith("/"):
+            raise exceptions.ExceptionInvalidJsonPointer
+
+        tokens = []
+        for token in pointer[1:].split("/"):
+            # `~` is only valid as the start of `~0` or `~1`
+            if "~" in token.replace("~0", "").replace("~1", ""):
+                raise exceptions.ExceptionInvalidJsonPointer
+            tokens.append(token.replace("~1", "/").replace("~0", "~"))
+        return tokens
+
+    @staticmethod
+    def resolve_json_pointer(document: Any, tokens: list[str]) -> Any:
+        """
+        Get the value a parsed JSON Pointer refers to in a document
+
+        Parameters:
+        document (Any): the parsed json document.
+        tokens (list[str]): the reference tokens of the pointer.
+        """
+        value = document
+        for key in tokens:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            # Array indexes are written in decimal without leading zeros, `-` refers to no existing element
+            elif isinstance(value, list) and key.isdecimal() and (key == "0" or key[0] != "0"):
+                index = int(key)
+                if index >= len(value):
+                    raise exceptions.ExceptionNoCIField
+                value = value[index]
+            else:
+                raise exceptions.ExceptionNoCIField
+        return value
+
+    @staticmethod
+    def extract_ci_fields(ci_schema: dict, pointers: Iterable[str]) -> dict[str, Any]:
+        """
+        Extract the parts of a CI schema referred to by each JSON Pointer.
+        Every pointer is checked before any part is extracted, so an invalid pointer is always reported first.
+
+        Parameters:
+        ci_schema (dict): the parsed CI schema.
+        pointers (Iterable[str]): the JSON Pointers of the parts to extract.
+
+        Returns:
+        dict: the value each pointer refers to, keyed by the pointer
+        """
+        parsed_pointers = {pointer: CiJsonPointerService.parse_json_pointer(pointer) for pointer in pointers}
+        return {
+            pointer: CiJsonPointerService.resolve_json_pointer(ci_schema, tokens)
+            for pointer, tokens in parsed_pointers.items()
+        }
@@ -1,16 +1,31 @@
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.cache.ci_cache import ci_cache
+from app.cache.ci_validator_metadata_snapshot import ValidatorMetadataSnapshot, ci_validator_metadata_snapshot
 from app.config import logging, settings
+from app.events.ci_events import CiEventType
 from app.events.publisher import Publisher
 from app.exception import exceptions
 from app.models.requests import PostCiSchemaV1Data
-from app.models.responses import CiMetadata, CiValidatorMetadata
+from app.models.responses import CiChangeFeed, CiMetadata, CiMetadataRecord, CiSurveySummary, CiValidatorMetadata
 from app.repositories.buckets.bucket_loader import BucketLoader
 from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
 from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
 from app.repositories.firebase.firebase_loader import FirebaseLoader
+from app.services.change_token_service import ChangeTokenService
 from app.services.ci_classifier_service import CiClassifierService
+from app.services.ci_field_extractor_service import CiFieldExtractor
+from app.services.ci_schema_codec_service import CODEC_GZIP, CiSchemaCodecService
 from app.services.ci_schema_location_service import CiSchemaLocationService
+from app.services.ci_schema_split_service import CiSchemaSplitService
 from app.services.datetime_service import DatetimeService
 from app.services.document_version_service import DocumentVersionService
+from app.telemetry.metrics import STORED_SCHEMA_SIZE
+from app.telemetry.tracing import set_span_attributes, traced, tracer
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +37,7 @@ class CiProcessorService:
         self.publisher = publisher
 
     # Posts new CI metadata to Firestore
+    @traced("CiProcessorService")
     def process_raw_ci(self, post_data: PostCiSchemaV1Data, ci_id, validator_version = "", ci_version = "") -> CiMetadata:
         """
         Processes incoming ci
@@ -30,13 +46,15 @@ class CiProcessorService:
         post_data (PostCiSchemaV1Data): incoming CI metadata
         """
 
+        set_span_attributes(guid=ci_id, survey_id=post_data.survey_id)
         ci = post_data.__dict__
 
-        # Get classifier type and value from ci
-        classifier_type = CiClassifierService.get_classifier_type(ci)
-        classifier_value = CiClassifierService.get_classifier_value(ci, classifier_type)
-        # Clean up unused classifier fields in ci
-        ci = CiClassifierService.clean_ci_unused_classifier(ci, classifier_type)
+        with tracer.start_as_current_span("CiClassifierService.parse_classifier"):
+            # Get classifier type and value from ci
+            classifier_type = CiClassifierService.get_classifier_type(ci)
+            classifier_value = CiClassifierService.get_classifier_value(ci, classifier_type)
+            # Clean up unused classifier fields in ci
+            ci = CiClassifierService.clean_ci_unused_classifier(ci, classifier_type)
 
         metadata = self.get_ci_metadata_with_id(ci_id)
 
@@ -51,16 +69,190 @@ class CiProcessorService:
             post_data,
             ci_version
         )
+        if settings.CI_SCHEMA_CONTENT_ADDRESSED_ENABLED:
+            next_version_ci_metadata.schema_hash = CiSchemaLocationService.get_ci_schema_hash(ci)
 
         stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(next_version_ci_metadata)
 
         self.process_raw_ci_in_transaction(ci_id, next_version_ci_metadata, ci, stored_ci_filename)
-        logger.debug(f"New CI created: {next_version_ci_metadata.model_dump()}")
+        logger.debug("New CI created: %s", next_version_ci_metadata)
+
+        self._cache_and_publish_new_ci(next_version_ci_metadata)
+
+        return next_version_ci_metadata
+
+    async def process_streamed_ci(
+            self,
+            body: AsyncIterator[bytes],
+            ci_id: str,
+            validator_version: str = "",
+            ci_version: str = "",
+    ) -> CiMetadata:
+        """
+        Processes an incoming CI whose body is streamed to the bucket as it is received, so the CI is never held
+        in memory. Only the top-level fields needed for its metadata are extracted from the body. The CI is
+        uploaded to a staging location and copied to where it is stored when its metadata is created.
+
+        Parameters:
+        body (AsyncIterator[bytes]): the chunks of the incoming CI json
+        ci_id (str): the guid of the new CI
+        validator_version (str): validator version of the CI
+        ci_version (str): the CI version, calculated if empty
+        """
+        with tracer.start_as_current_span("CiProcessorService.process_streamed_ci"):
+            set_span_attributes(guid=ci_id)
+
+            if self.get_ci_metadata_with_id(ci_id):
+                raise exceptions.ExceptionMissingInvalidGuid
+
+            staged_ci_filename = CiSchemaLocationService.get_staged_ci_schema_location(ci_id)
+            try:
+                fields, schema_size = await self.stream_ci_to_bucket(body, staged_ci_filename)
+                post_data = self.validate_streamed_ci_fields(fields)
+                set_span_attributes(survey_id=post_data.survey_id)
+
+                ci = post_data.__dict__
+                classifier_type = CiClassifierService.get_classifier_type(ci)
+                classifier_value = CiClassifierService.get_classifier_value(ci, classifier_type)
+
+                next_version_ci_metadata = self.build_next_version_ci_metadata(
+                    ci_id,
+                    validator_version,
+                    classifier_type,
+                    classifier_value,
+                    post_data,
+                    ci_version
+                )
+                stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(next_version_ci_metadata)
+
+                self.process_streamed_ci_in_transaction(
+                    ci_id, next_version_ci_metadata, staged_ci_filename, stored_ci_filename, schema_size
+                )
+            finally:
+                self.discard_staged_ci_schema(staged_ci_filename)
+
+            logger.debug("New CI created: %s", next_version_ci_metadata)
+            self._cache_and_publish_new_ci(next_version_ci_metadata)
+
+            return next_version_ci_metadata
+
+    async def stream_ci_to_bucket(self, body: AsyncIterator[bytes], staged_ci_filename: str) -> tuple[dict, int]:
+        """
+        Writes each chunk of an incoming CI to the bucket, encoded with the `CI_SCHEMA_STORAGE_CODEC` codec,
+        while extracting the fields needed for its metadata.
+
+        Parameters:
+        body (AsyncIterator[bytes]): the chunks of the incoming CI json
+        staged_ci_filename (str): filename the json CI is streamed to
+
+        Returns:
+        tuple[dict, int]: the top-level CI fields, with objects and arrays extracted empty, and the size of the
+        stored CI in bytes
+        """
+        extractor = CiFieldExtractor()
+        compressor, content_encoding = CiSchemaCodecService.stream_compressor(
+            settings.CI_SCHEMA_STORAGE_CODEC, settings.CI_SCHEMA_COMPRESSION_LEVEL
+        )
+        stored_size = 0
+
+        # Writing sends each part of the upload to the bucket once it is full, so it is kept off the event loop
+        writer = await run_in_threadpool(
+            self.ci_bucket_repository.open_ci_schema_writer, staged_ci_filename, content_encoding
+        )
+        try:
+            async for chunk in body:
+                extractor.feed(chunk)
+                data = chunk if compressor is None else compressor.compress(chunk)
+                await run_in_threadpool(writer.write, data)
+                stored_size += len(data)
+            if compressor is not None:
+                data = compressor.flush()
+                await run_in_threadpool(writer.write, data)
+                stored_size += len(data)
+            fields = extractor.close()
+        finally:
+            await run_in_threadpool(writer.close)
+
+        STORED_SCHEMA_SIZE.observe(stored_size)
+        set_span_attributes(blob_size=stored_size)
+        return fields, stored_size
+
+    @traced("CiProcessorService")
+    def validate_streamed_ci_fields(self, fields: dict) -> PostCiSchemaV1Data:
+        """
+        Validates the fields extracted from a streamed CI with the same rules as a CI posted in full. A streamed
+        CI is stored exactly as it was sent, so fields that a CI posted in full would have dropped are rejected.
+
+        Parameters:
+        fields (dict): the top-level fields of the CI
+        """
+        unknown_fields = fields.keys() - PostCiSchemaV1Data.model_fields.keys()
+        if unknown_fields:
+            logger.debug("Streamed CI has unknown fields: %s", sorted(unknown_fields))
+            raise exceptions.ValidationException
+        try:
+            return PostCiSchemaV1Data(**fields)
+        except ValidationError as exc:
+            logger.debug("Streamed CI failed validation: %s", exc)
+            raise exceptions.ValidationException from exc
+
+    @traced("CiProcessorService")
+    def process_streamed_ci_in_transaction(
+            self,
+            ci_id: str,
+            next_version_ci_metadata: CiMetadata,
+            staged_ci_filename: str,
+            stored_ci_filename: str,
+            schema_size: int,
+    ) -> None:
+        """
+        Creates the metadata of a streamed CI and copies the CI to where it is stored in a transaction.
+        Commit if the function is successful, rolling back otherwise.
+
+        Parameters:
+        ci_id (str): The unique id of the new CI.
+        next_version_ci_metadata (CiMetadata): The CI metadata being added to firestore.
+        staged_ci_filename (str): Filename the json CI was streamed to.
+        stored_ci_filename (str): Filename the json CI is stored at.
+        schema_size (int): The size of the stored json CI in bytes.
+        """
+        try:
+            logger.info("Beginning streamed CI transaction...")
+            self.ci_firebase_repository.perform_new_streamed_ci_transaction(
+                ci_id, next_version_ci_metadata, staged_ci_filename, stored_ci_filename, schema_size
+            )
+            logger.info("Streamed CI transaction committed successfully.")
+
+        except Exception as exc:
+            logger.error("Performing streamed CI transaction: exception raised: %s", exc)
+            logger.error("Rolling back streamed CI transaction")
+            raise exceptions.GlobalException from exc
+
+    @traced("CiProcessorService")
+    def discard_staged_ci_schema(self, staged_ci_filename: str) -> None:
+        """
+        Deletes a streamed CI from its staging location. A failure is only logged, as staged CIs are never served.
+
+        Parameters:
+        staged_ci_filename (str): Filename the json CI was streamed to.
+        """
+        try:
+            self.ci_bucket_repository.delete_ci_schema(staged_ci_filename)
+        except Exception as exc:
+            logger.warning("Failed to delete staged CI %s: %s", staged_ci_filename, exc)
+
+    def _cache_and_publish_new_ci(self, next_version_ci_metadata: CiMetadata) -> None:
+        """
+        For internal use only - caches the metadata of a newly created CI and publishes it to the pubsub topic
+        """
+        ci_cache.put_metadata(next_version_ci_metadata)
+        ci_cache.put_latest(next_version_ci_metadata)
+        ci_validator_metadata_snapshot.invalidate()
 
         # create event message
         event_message = CiMetadata(
             ci_version=next_version_ci_metadata.ci_version,
-            validator_version=validator_version,
+            validator_version=next_version_ci_metadata.validator_version,
             data_version=next_version_ci_metadata.data_version,
             classifier_type=next_version_ci_metadata.classifier_type,
             classifier_value=next_version_ci_metadata.classifier_value,
@@ -74,8 +266,7 @@ class CiProcessorService:
 
         self.try_publish_ci_metadata_to_topic(event_message)
 
-        return next_version_ci_metadata
-
+    @traced("CiProcessorService")
     def process_raw_ci_in_transaction(
             self,
             ci_id: str,
@@ -104,10 +295,11 @@ class CiProcessorService:
             return next_version_ci_metadata
 
         except Exception as exc:
-            logger.error(f"Performing CI transaction: exception raised: {exc}")
+            logger.error("Performing CI transaction: exception raised: %s", exc)
             logger.error("Rolling back CI transaction")
             raise exceptions.GlobalException from exc
 
+    @traced("CiProcessorService")
     def build_next_version_ci_metadata(
             self,
             ci_id: str,
@@ -150,6 +342,7 @@ class CiProcessorService:
         )
         return next_version_ci_metadata
 
+    @traced("CiProcessorService")
     def validate_ci_version(self, ci_version: str, current_ci_version: int) -> int:
         try:
             if ci_version == "" or ci_version is None:
@@ -160,6 +353,7 @@ class CiProcessorService:
             raise exceptions.ExceptionInvalidCiVersion from exc
         return int(ci_version)
 
+    @traced("CiProcessorService")
     def calculate_next_ci_version(self, survey_id: str, classifier_type, classifier_value, language: str) -> int:
         """
         Calculates the next schema version for the metadata being built.
@@ -174,6 +368,7 @@ class CiProcessorService:
 
         return DocumentVersionService.calculate_ci_version(current_version_metadata)
 
+    @traced("CiProcessorService")
     def try_publish_ci_metadata_to_topic(self, post_ci_event: CiMetadata) -> None:
         """
         Publish CI metadata to pubsub topic
@@ -184,18 +379,40 @@ class CiProcessorService:
         try:
             logger.info("Publishing CI metadata to topic...")
             self.publisher.publish_message(post_ci_event)
-            logger.debug(f"CI metadata {post_ci_event} published to topic")
+            logger.debug("CI metadata %s published to topic", post_ci_event)
             logger.info("CI metadata published successfully.")
         except Exception as exc:
-            logger.debug(f"CI metadata {post_ci_event} failed to publish to topic with error {exc}")
+            logger.debug("CI metadata %s failed to publish to topic with error %s", post_ci_event, exc)
             logger.error("Error publishing CI metadata to topic.")
             raise exceptions.GlobalException from exc
 
+    @traced("CiProcessorService")
+    def try_publish_ci_change_events(
+        self, ci_metadata_collection: list[CiMetadata | CiMetadataRecord], event_type: CiEventType
+    ) -> None:
+        """
+        Publish changes to existing CIs to the pubsub topic in one batch, so consumers can keep their own copies
+        of the metadata up to date. The changes have already been committed, so a failure to publish is logged
+        rather than raised.
+
+        Parameters:
+        ci_metadata_collection (list[CiMetadata | CiMetadataRecord]): the CI metadata of the changed CIs
+        event_type (CiEventType): the type of change
+        """
+        if not (settings.CI_CHANGE_EVENTS_ENABLED or settings.CI_CACHE_INVALIDATION_ENABLED):
+            return
+        try:
+            self.publisher.publish_messages(ci_metadata_collection, event_type)
+            logger.debug("%s CI %s events published to topic", len(ci_metadata_collection), event_type)
+        except Exception as exc:
+            logger.error("Error publishing %s CI %s events to topic: %s", len(ci_metadata_collection), event_type, exc)
+
+    @traced("CiProcessorService")
     def get_ci_metadata_collection(self,
                                    survey_id: str,
                                    classifier_type,
                                    classifier_value,
-                                   language: str) -> list[CiMetadata]:
+                                   language: str) -> list[CiMetadataRecord]:
         """
         Get a list of CI metadata
 
@@ -216,7 +433,8 @@ class CiProcessorService:
 
         return ci_metadata_collection
 
-    def get_all_ci_metadata_collection(self) -> list[CiMetadata]:
+    @traced("CiProcessorService")
+    def get_all_ci_metadata_collection(self) -> list[CiMetadataRecord]:
         """
         Get a list of all CI metadata
 
@@ -229,6 +447,30 @@ class CiProcessorService:
 
         return ci_metadata_collection
 
+    @traced("CiProcessorService")
+    def get_ci_changes(self, since_token: str | None, limit: int) -> CiChangeFeed:
+        """
+        Get a page of the changes to CI metadata made after the position in the change feed given by `since_token`
+
+        Parameters:
+        since_token (str | None): the `next_token` of the previous page, or None to start from the earliest change.
+        limit (int): the maximum number of changes to return.
+        """
+        since = ChangeTokenService.decode(since_token) if since_token else None
+
+        # One more change than requested is read to tell whether there are more
+        changes = self.ci_firebase_repository.get_ci_changes(since, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        next_token = since_token
+        if changes:
+            next_token = ChangeTokenService.encode(changes[-1].change_position)
+
+        set_span_attributes(result_count=len(changes))
+        return CiChangeFeed(changes=changes, next_token=next_token, has_more=has_more)
+
+    @traced("CiProcessorService")
     def get_ci_validator_metadata_collection(self) -> list[CiValidatorMetadata]:
         """
         Get a list of all CI validator metadata
@@ -238,7 +480,7 @@ class CiProcessorService:
         """
         logger.info("Retrieving all CI validator metadata...")
 
-        ci_metadata_list: list[CiMetadata] = self.ci_firebase_repository.get_all_ci_metadata_collection()
+        ci_metadata_list: list[CiMetadataRecord] = self.ci_firebase_repository.get_all_ci_metadata_collection()
 
         # Cast CiMetadata to CiValidatorMetadata
         ci_validator_metadata_list: list[CiValidatorMetadata] = []
@@ -248,6 +490,23 @@ class CiProcessorService:
 
         return ci_validator_metadata_list
 
+    @traced("CiProcessorService")
+    def get_ci_validator_metadata_snapshot(self) -> ValidatorMetadataSnapshot:
+        """
+        Get the validator metadata of every CI serialised as a json response body, from the in-memory snapshot
+        if `CI_VALIDATOR_METADATA_SNAPSHOT_ENABLED` is set
+        """
+        return ci_validator_metadata_snapshot.get(self.build_ci_validator_metadata_snapshot)
+
+    def build_ci_validator_metadata_snapshot(self) -> ValidatorMetadataSnapshot:
+        """
+        Read the validator metadata of every CI and serialise it, so serving it is a copy of the bytes
+        """
+        ci_validator_metadata_list = self.get_ci_validator_metadata_collection()
+        content = orjson.dumps([ci_validator_metadata.model_dump() for ci_validator_metadata in ci_validator_metadata_list])
+        return ValidatorMetadataSnapshot(content, len(ci_validator_metadata_list))
+
+    @traced("CiProcessorService")
     def get_latest_ci_metadata(
             self, survey_id: str, classifier_type: str, classifier_value: str, language: str
     ) -> CiMetadata | None:
@@ -264,12 +523,44 @@ class CiProcessorService:
         """
         logger.info("Getting latest CI metadata...")
 
+        latest_ci_metadata = ci_cache.get_latest(survey_id, classifier_type, classifier_value, language)
+        if latest_ci_metadata:
+            return latest_ci_metadata
+
         latest_ci_metadata = self.ci_firebase_repository.get_latest_ci_metadata(
             survey_id, classifier_type, classifier_value, language
         )
 
+        if latest_ci_metadata:
+            ci_cache.put_latest(latest_ci_metadata)
+
         return latest_ci_metadata
 
+    @traced("CiProcessorService")
+    def get_latest_ci_metadata_collection(self, survey_id: str | None = None) -> list[CiMetadataRecord]:
+        """
+        Get the metadata of the latest version of every CI, or of every CI of a survey
+
+        Parameters:
+        survey_id (str | None): the survey id of the CIs, or None for all CIs.
+        """
+        logger.info("Getting latest CI metadata collection...")
+
+        return self.ci_firebase_repository.get_latest_ci_metadata_collection(survey_id)
+
+    @traced("CiProcessorService")
+    def get_survey_summary(self, survey_id: str) -> CiSurveySummary | None:
+        """
+        Get the summary of the CIs of a survey
+
+        Parameters:
+        survey_id (str): the survey id of the CIs.
+        """
+        logger.info("Getting survey summary...")
+
+        return self.ci_firebase_repository.get_survey_summary(survey_id)
+
+    @traced("CiProcessorService")
     def get_ci_metadata_with_id(self, guid: str) -> CiMetadata | None:
         """
         Get a CI metadata with id
@@ -282,11 +573,141 @@ class CiProcessorService:
         """
         logger.info("Getting CI metadata with id...")
 
+        ci_metadata = ci_cache.get_metadata(guid)
+        if ci_metadata:
+            return ci_metadata
+
         ci_metadata = self.ci_firebase_repository.get_ci_metadata_with_id(guid)
 
+        if ci_metadata:
+            ci_cache.put_metadata(ci_metadata)
+
         return ci_metadata
 
-    def get_ci_metadata_collection_with_survey_id(self, survey_id: str) -> list[CiMetadata]:
+    @traced("CiProcessorService")
+    def get_ci_schema(self, stored_ci_filename: str) -> dict | None:
+        """
+        Get a CI schema from the cache, falling back to the ci schema bucket
+
+        Parameters:
+        stored_ci_filename (str): filename of the stored json CI.
+
+        Returns:
+        dict: the CI schema, or None if it does not exist
+        """
+        ci_schema = ci_cache.get_schema(stored_ci_filename)
+        if ci_schema is not None:
+            return ci_schema
+
+        ci_schema = self.ci_bucket_repository.retrieve_ci_schema(stored_ci_filename)
+
+        if ci_schema:
+            ci_cache.put_schema(stored_ci_filename, ci_schema)
+
+        return ci_schema
+
+    @traced("CiProcessorService")
+    def get_ci_schema_for_fields(self, guid: str, stored_ci_filename: str, pointers: list[str]) -> dict | None:
+        """
+        Get as much of a CI schema as is needed to resolve every JSON Pointer. A cached schema is used whole.
+        Otherwise, with split storage enabled, only the manifest and the split fields the pointers refer to are
+        read, falling back to the whole stored schema if it was not split.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        stored_ci_filename (str): filename of the stored json CI.
+        pointers (list[str]): the JSON Pointers being resolved.
+
+        Returns:
+        dict: the CI schema, without any split fields that are not needed, or None if it does not exist
+        """
+        ci_schema = ci_cache.get_schema(stored_ci_filename)
+        if ci_schema is not None:
+            return ci_schema
+
+        if settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED:
+            ci_schema = self._get_split_ci_schema_for_fields(guid, pointers)
+            if ci_schema is not None:
+                return ci_schema
+
+        return self.get_ci_schema(stored_ci_filename)
+
+    def _get_split_ci_schema_for_fields(self, guid: str, pointers: list[str]) -> dict | None:
+        """
+        For internal use only - reads the manifest of a split CI schema and the split fields the pointers refer
+        to, or returns None if the schema was not split, is needed whole, or is being deleted
+        """
+        manifest = self.ci_bucket_repository.retrieve_split_ci_schema_part(
+            CiSchemaLocationService.get_ci_schema_manifest_location(guid)
+        )
+        if manifest is None:
+            return None
+
+        field_names = CiSchemaSplitService.get_split_fields_needed(manifest, pointers)
+        if field_names is None:
+            return None
+
+        split_fields = {}
+        for field_name in field_names:
+            value = self.ci_bucket_repository.retrieve_split_ci_schema_part(
+                CiSchemaLocationService.get_ci_schema_field_location(guid, field_name)
+            )
+            if value is None:
+                return None
+            split_fields[field_name] = value
+
+        logger.debug("Read %s split fields of %s", len(split_fields), guid)
+        return CiSchemaSplitService.join_ci_schema(manifest, split_fields)
+
+    @traced("CiProcessorService")
+    def get_gzipped_ci_schema(self, stored_ci_filename: str) -> tuple[bytes | None, dict | None]:
+        """
+        Get a CI schema exactly as it is stored if it was stored gzip compressed, so that it can be sent to
+        clients accepting gzip without being decompressed and compressed again. A schema that is not stored
+        gzipped is returned decoded instead, so it is not downloaded twice.
+        The schema is decompressed only when it needs to be added to the cache.
+
+        Parameters:
+        stored_ci_filename (str): filename of the stored json CI.
+
+        Returns:
+        tuple[bytes | None, dict | None]: the gzipped CI schema, or else the CI schema if it is cached without
+        its gzipped bytes or is not stored gzipped. Both are None if it does not exist
+        """
+        gzipped_ci_schema = ci_cache.get_gzipped_schema(stored_ci_filename)
+        if gzipped_ci_schema is not None:
+            return gzipped_ci_schema, None
+        ci_schema = ci_cache.get_schema(stored_ci_filename)
+        if ci_schema is not None:
+            return None, ci_schema
+
+        data = self.ci_bucket_repository.retrieve_raw_ci_schema(stored_ci_filename)
+        if data is None:
+            return None, None
+
+        if not CiSchemaCodecService.is_gzip(data):
+            ci_schema = CiSchemaCodecService.decode(data)
+            ci_cache.put_schema(stored_ci_filename, ci_schema)
+            return None, ci_schema
+
+        if ci_cache.enabled:
+            ci_cache.put_schema(stored_ci_filename, CiSchemaCodecService.decode(data), data)
+        return data, None
+
+    @traced("CiProcessorService")
+    def get_ci_schema_signed_url(self, stored_ci_filename: str) -> str:
+        """
+        Get a short-lived signed url to download a CI schema straight from the bucket
+
+        Parameters:
+        stored_ci_filename (str): filename of the stored json CI.
+        """
+        logger.info("Signing CI schema url...")
+
+        return self.ci_bucket_repository.generate_ci_schema_signed_url(stored_ci_filename)
+
+    @traced("CiProcessorService")
+    def get_ci_metadata_collection_with_survey_id(self, survey_id: str) -> list[CiMetadataRecord]:
         """
         Get CI metadata collection with survey_id
 
@@ -302,12 +723,13 @@ class CiProcessorService:
 
         return ci_metadata_collection
 
-    def delete_ci_in_transaction(self, ci_metadata_collection: list[CiMetadata]) -> None:
+    @traced("CiProcessorService")
+    def delete_ci_in_transaction(self, ci_metadata_collection: list[CiMetadataRecord]) -> None:
         """
         Delete CI by calling a transactional function that wrap the procedures
 
         Parameters:
-        ci_metadata_collection (list[CiMetadata]): The CI metadata being deleted.
+        ci_metadata_collection (list[CiMetadataRecord]): The CI metadata being deleted.
         """
         try:
             logger.info("Beginning delete CI transaction...")
@@ -315,21 +737,80 @@ class CiProcessorService:
 
             logger.info("Delete CI transaction committed successfully.")
 
+            for ci_metadata in ci_metadata_collection:
+                ci_cache.invalidate_metadata(ci_metadata)
+                ci_cache.invalidate_schema(CiSchemaLocationService.get_ci_schema_location(ci_metadata))
+            ci_validator_metadata_snapshot.invalidate()
+
         except Exception as exc:
             logger.error("Rolling back CI transaction")
             raise exceptions.GlobalException from exc
 
-    def update_ci_validator_version(self, guid: str, metadata: CiMetadata):
-        """
-                Updates CI
-
-                Parameters:
-                guid (str): identifier for ci
-                metadata (CiMetadata): Schema metadata
-                """
-        self.ci_firebase_repository.update_ci_metadata(guid, metadata)
+        self.try_publish_ci_change_events(ci_metadata_collection, CiEventType.DELETED)
 
+    @traced("CiProcessorService")
     def update_validator_version_and_ci(self, post_data: PostCiSchemaV1Data, ci_metadata: CiMetadata):
+        """
+        Updates a CI and its schema. A schema that is stored content-addressed is stored at the hash of its new
+        content, so the schema it replaces is never changed for other CIs sharing it.
+
+        Parameters:
+        post_data (PostCiSchemaV1Data): the updated CI
+        ci_metadata (CiMetadata): the metadata of the CI, with its new validator version
+        """
         ci = post_data.__dict__
+        previous_stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
+        previous_schema_hash = ci_metadata.schema_hash
         ci_metadata.published_at = str(DatetimeService.get_current_date_and_time().strftime(settings.PUBLISHED_AT_FORMAT))
+        ci_metadata.schema_hash = (
+            CiSchemaLocationService.get_ci_schema_hash(ci) if settings.CI_SCHEMA_CONTENT_ADDRESSED_ENABLED else None
+        )
         self.ci_firebase_repository.update_validator_version_and_ci(ci, ci_metadata)
+
+        if not previous_schema_hash and ci_metadata.schema_hash:
+            # The schema the CI was created with is only used by this CI
+            self.ci_bucket_repository.delete_ci_schema(previous_stored_ci_filename)
+
+        ci_cache.invalidate_metadata(ci_metadata)
+        ci_cache.invalidate_schema(previous_stored_ci_filename)
+        ci_cache.put_metadata(ci_metadata)
+        ci_validator_metadata_snapshot.invalidate()
+        self.try_publish_ci_change_events([ci_metadata], CiEventType.UPDATED)
+
+    @traced("CiProcessorService")
+    def prewarm_cache(self, schema_count: int) -> None:
+        """
+        Load the latest CI metadata for every survey, classifier and language, and the schemas of the
+        `schema_count` most recently published of those CIs, into the cache
+
+        Parameters:
+        schema_count (int): the number of most recently published schemas to load.
+        """
+        logger.info("Pre-warming CI cache...")
+
+        # Metadata is ordered by descending `ci_version`, so the first CI seen for each key is the latest
+        latest_ci_metadata: dict[tuple[str, str, str, str], CiMetadata] = {}
+        for ci_metadata in self.ci_firebase_repository.get_all_ci_metadata_collection():
+            key = ci_cache.latest_key(
+                ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+            )
+            if key not in latest_ci_metadata:
+                latest_ci_metadata[key] = CiMetadata(**ci_metadata.model_dump(), schema_hash=ci_metadata.schema_hash)
+
+        for ci_metadata in latest_ci_metadata.values():
+            ci_cache.put_metadata(ci_metadata)
+            ci_cache.put_latest(ci_metadata)
+
+        most_recently_published = sorted(
+            latest_ci_metadata.values(), key=lambda ci_metadata: ci_metadata.published_at, reverse=True
+        )
+        for ci_metadata in most_recently_published[:schema_count]:
+            stored_ci_filename = CiSchemaLocationService.get_ci_schema_location(ci_metadata)
+            # Gzipped schemas are cached with their stored bytes, so they are sent to clients as stored
+            if settings.CI_SCHEMA_STORAGE_CODEC == CODEC_GZIP:
+                self.get_gzipped_ci_schema(stored_ci_filename)
+            else:
+                self.get_ci_schema(stored_ci_filename)
+
+        ci_cache.warm = True
+        logger.info("CI cache pre-warmed with %s latest CI metadata", len(latest_ci_metadata))
@@ -0,0 +1,99 @@
+import gzip
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd storage is optional and needs the `zstandard` package installed
+    zstandard = None
+
+CODEC_JSON_PRETTY = "json-pretty"
+CODEC_JSON = "json"
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+CI_SCHEMA_CODECS = (CODEC_JSON_PRETTY, CODEC_JSON, CODEC_GZIP, CODEC_ZSTD)
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# zlib window bits that write a gzip header and trailer
+GZIP_WBITS = 31
+
+
+class CiSchemaCodecService:
+    @staticmethod
+    def encode(schema: dict, codec: str, compression_level: int) -> tuple[bytes, str | None]:
+        """
+        Serialise a CI schema for storage.
+
+        Parameters:
+        schema (dict): the CI schema being stored.
+        codec (str): one of `CI_SCHEMA_CODECS`.
+        compression_level (int): the gzip or zstd compression level.
+
+        Returns:
+        tuple[bytes, str | None]: the encoded schema and the `Content-Encoding` of the blob, if compressed
+        """
+        if codec == CODEC_JSON_PRETTY:
+            return json.dumps(schema, indent=2).encode("utf-8"), None
+
+        data = json.dumps(schema, separators=(",", ":")).encode("utf-8")
+        if codec == CODEC_JSON:
+            return data, None
+        if codec == CODEC_GZIP:
+            return gzip.compress(data, compresslevel=compression_level, mtime=0), "gzip"
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("The zstandard package must be installed to store schemas with zstd")
+            return zstandard.ZstdCompressor(level=compression_level).compress(data), "zstd"
+
+        raise ValueError(f"Unknown CI schema codec: {codec}")
+
+    @staticmethod
+    def stream_compressor(codec: str, compression_level: int) -> tuple[object | None, str | None]:
+        """
+        Create a compressor for a CI schema that is stored as it is streamed. Uncompressed codecs store the
+        chunks as they are received, so a streamed schema keeps the formatting it was sent with.
+
+        Parameters:
+        codec (str): one of `CI_SCHEMA_CODECS`.
+        compression_level (int): the gzip or zstd compression level.
+
+        Returns:
+        tuple[object | None, str | None]: an object with `compress(chunk)` and `flush()` methods, or None if the
+        codec does not compress, and the `Content-Encoding` of the blob
+        """
+        if codec in (CODEC_JSON_PRETTY, CODEC_JSON):
+            return None, None
+        if codec == CODEC_GZIP:
+            return zlib.compressobj(compression_level, zlib.DEFLATED, GZIP_WBITS), "gzip"
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("The zstandard package must be installed to store schemas with zstd")
+            return zstandard.ZstdCompressor(level=compression_level).compressobj(), "zstd"
+
+        raise ValueError(f"Unknown CI schema codec: {codec}")
+
+    @staticmethod
+    def is_gzip(data: bytes) -> bool:
+        """
+        Check whether stored schema data is gzip compressed
+        """
+        return data.startswith(GZIP_MAGIC)
+
+    @staticmethod
+    def decode(data: bytes) -> dict:
+        """
+        Deserialise a stored CI schema, detecting compression from the leading bytes so that
+        schemas stored with any codec can be read.
+
+        Parameters:
+        data (bytes): the raw contents of the blob, without any transcoding applied.
+        """
+        if CiSchemaCodecService.is_gzip(data):
+            data = gzip.decompress(data)
+        elif data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("The zstandard package must be installed to read schemas stored with zstd")
+            data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+        return json.loads(data)
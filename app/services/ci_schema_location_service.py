@@ -1,17 +1,90 @@
-from app.models.responses import CiMetadata
+import hashlib
+
+import orjson
+
+from app.models.responses import CiMetadata, CiMetadataRecord
+
+# Prefix of schemas stored content-addressed, by the hash of their content
+CONTENT_ADDRESSED_SCHEMA_PREFIX = "schemas/"
 
 
 class CiSchemaLocationService:
     @staticmethod
     def get_ci_schema_location(
-        ci_metadata: CiMetadata,
+        ci_metadata: CiMetadata | CiMetadataRecord,
     ) -> str:
         """
         Generate the ci schema location for the metadata being processed.
+        Schemas stored content-addressed are shared by every CI with the same content.
 
         Parameters:
-        ci_metadata (CiMetadata): the metadata being processed.
+        ci_metadata (CiMetadata | CiMetadataRecord): the metadata being processed.
         """
+        if ci_metadata.schema_hash:
+            return CiSchemaLocationService.get_content_addressed_ci_schema_location(ci_metadata.schema_hash)
+
         guid = ci_metadata.guid
 
         return f"{guid}.json"
+
+    @staticmethod
+    def get_content_addressed_ci_schema_location(schema_hash: str) -> str:
+        """
+        Generate the location of a ci schema stored content-addressed.
+
+        Parameters:
+        schema_hash (str): the hash of the schema content.
+        """
+        return f"{CONTENT_ADDRESSED_SCHEMA_PREFIX}{schema_hash}.json"
+
+    @staticmethod
+    def get_ci_schema_hash(schema: dict) -> str:
+        """
+        Generate the sha256 hash of the content of a ci schema. Keys are sorted, so the hash does not depend on
+        the order the fields were sent in or on the codec the schema is stored with.
+
+        Parameters:
+        schema (dict): the ci schema.
+        """
+        return hashlib.sha256(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    @staticmethod
+    def get_staged_ci_schema_location(guid: str) -> str:
+        """
+        Generate the location a streamed ci schema is uploaded to before its metadata is created.
+
+        Parameters:
+        guid (str): the guid of the CI being uploaded.
+        """
+        return f"uploads/{guid}.json"
+
+    @staticmethod
+    def get_ci_schema_parts_prefix(guid: str) -> str:
+        """
+        Generate the prefix of every blob a ci schema is split into, when split storage is enabled.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        """
+        return f"{guid}/"
+
+    @staticmethod
+    def get_ci_schema_manifest_location(guid: str) -> str:
+        """
+        Generate the location of the manifest of a split ci schema, holding the fields that were not split out.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        """
+        return f"{guid}/manifest.json"
+
+    @staticmethod
+    def get_ci_schema_field_location(guid: str, field_name: str) -> str:
+        """
+        Generate the location of a top-level field split out of a ci schema.
+
+        Parameters:
+        guid (str): the guid of the CI.
+        field_name (str): the name of the top-level field.
+        """
+        return f"{guid}/fields/{field_name}.json"
@@ -0,0 +1,63 @@
+from collections.abc import Iterable
+from typing import Any
+
+from app.services.ci_json_pointer_service import CiJsonPointerService
+
+
+class CiSchemaSplitService:
+    """
+    Splits large top-level fields out of a CI schema, so they can be stored and read separately. The manifest
+    of a split schema lists the fields that were split out, and holds every other top-level field of the schema.
+    """
+
+    @staticmethod
+    def split_ci_schema(ci_schema: dict, field_names: Iterable[str]) -> tuple[dict[str, Any], dict]:
+        """
+        Split the named top-level fields out of a CI schema. Fields the schema does not have are ignored.
+
+        Parameters:
+        ci_schema (dict): the CI schema being split.
+        field_names (Iterable[str]): the names of the top-level fields to split out.
+
+        Returns:
+        tuple[dict, dict]: the value of each field split out by its name, and the manifest of the schema
+        """
+        split_fields = {field_name: ci_schema[field_name] for field_name in field_names if field_name in ci_schema}
+        manifest = {
+            "split_fields": list(split_fields),
+            "schema": {key: value for key, value in ci_schema.items() if key not in split_fields},
+        }
+        return split_fields, manifest
+
+    @staticmethod
+    def get_split_fields_needed(manifest: dict, pointers: Iterable[str]) -> list[str] | None:
+        """
+        Get the split fields that have to be read to resolve every JSON Pointer
+
+        Parameters:
+        manifest (dict): the manifest of the split schema.
+        pointers (Iterable[str]): the JSON Pointers being resolved.
+
+        Returns:
+        list[str]: the names of the split fields needed, or None if a pointer refers to the whole schema
+        """
+        split_fields = manifest["split_fields"]
+        fields_needed = []
+        for pointer in pointers:
+            tokens = CiJsonPointerService.parse_json_pointer(pointer)
+            if not tokens:
+                return None
+            if tokens[0] in split_fields and tokens[0] not in fields_needed:
+                fields_needed.append(tokens[0])
+        return fields_needed
+
+    @staticmethod
+    def join_ci_schema(manifest: dict, split_fields: dict[str, Any]) -> dict:
+        """
+        Rebuild a CI schema from its manifest and the split fields that were read, leaving out any others
+
+        Parameters:
+        manifest (dict): the manifest of the split schema.
+        split_fields (dict): the value of each split field read, by its name.
+        """
+        return {**manifest["schema"], **split_fields}
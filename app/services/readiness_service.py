@@ -0,0 +1,63 @@
+import time
+from collections.abc import Callable
+
+from app.config import logging
+from app.events.publisher import Publisher
+from app.models.responses import DependencyReadiness
+from app.repositories.buckets.bucket_loader import BucketLoader
+from app.repositories.firebase.firebase_loader import FirebaseLoader
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessService:
+    @staticmethod
+    def probe(name: str, check: Callable[[], object]) -> DependencyReadiness:
+        """
+        Run a cheap request against a backing service and measure how long it takes.
+        The service is marked as not connected if the check raises an exception or returns `False`.
+
+        Parameters:
+        name (str): the name of the service, used for logging.
+        check (Callable): the request made against the service.
+
+        Returns:
+        DependencyReadiness: whether the service responded and the probe latency in milliseconds
+        """
+        start = time.perf_counter()
+        try:
+            connected = check() is not False
+        except Exception as exc:
+            logger.warning("Readiness probe for %s failed: %s", name, exc)
+            connected = False
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        return DependencyReadiness(connected=connected, latency_ms=latency_ms)
+
+    @staticmethod
+    def probe_firestore(firebase_loader: FirebaseLoader) -> DependencyReadiness:
+        """
+        Probe firestore by reading at most one document from the ci collection
+        """
+        return ReadinessService.probe("firestore", lambda: firebase_loader.get_ci_collection().limit(1).get())
+
+    @staticmethod
+    def probe_storage(bucket_loader: BucketLoader) -> DependencyReadiness:
+        """
+        Probe cloud storage by checking the ci schema bucket exists
+        """
+        return ReadinessService.probe("storage", lambda: bucket_loader.get_ci_schema_bucket().exists())
+
+    @staticmethod
+    def probe_pubsub(publisher: Publisher) -> DependencyReadiness:
+        """
+        Probe pub/sub by checking the publish topic exists
+        """
+        return ReadinessService.probe("pubsub", publisher.topic_exists)
+
+    @staticmethod
+    def is_ready(dependency: DependencyReadiness, max_latency_ms: int) -> bool:
+        """
+        A dependency is ready if it responded within `max_latency_ms`
+        """
+        return dependency.connected and dependency.latency_ms <= max_latency_ms
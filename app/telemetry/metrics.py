@@ -0,0 +1,86 @@
+import functools
+import time
+from collections.abc import Callable
+
+from prometheus_client import Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "cir_http_request_duration_seconds",
+    "Latency of HTTP requests by method, route and status code",
+    ["method", "route", "status_code"],
+)
+
+BACKEND_LATENCY = Histogram(
+    "cir_backend_call_duration_seconds",
+    "Latency of calls to firestore, cloud storage and pub/sub by component and method",
+    ["component", "method"],
+)
+
+STORED_SCHEMA_SIZE = Histogram(
+    "cir_stored_schema_size_bytes",
+    "Size of CI schemas written to the ci schema bucket",
+    buckets=(1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000),
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def observe_backend_latency(component: str) -> Callable:
+    """
+    Decorator recording the duration of every call to the decorated method in `BACKEND_LATENCY`,
+    labelled with `component` and the method name. Calls that raise are recorded too.
+
+    Parameters:
+    component (str): the class making calls to the backing service.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        histogram = BACKEND_LATENCY.labels(component=component, method=func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request in `REQUEST_LATENCY`.
+    Requests are labelled with the route path template rather than the raw path, so query strings
+    and unknown paths do not create new label values.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", UNMATCHED_ROUTE),
+                status_code=str(status_code),
+            ).observe(time.perf_counter() - start)
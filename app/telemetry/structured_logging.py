@@ -0,0 +1,90 @@
+import json
+import logging
+import random
+
+# This module is imported by `app.config` to configure logging, so it must not import anything from `app`
+
+TEXT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def truncate_payload(message: str, max_chars: int) -> str:
+    """
+    Truncate a log message to `max_chars`, noting how many characters were dropped
+
+    Parameters:
+    message (str): the fully formatted log message.
+    max_chars (int): the maximum number of characters kept, or 0 to never truncate.
+    """
+    if max_chars <= 0 or len(message) <= max_chars:
+        return message
+    return f"{message[:max_chars]}... [truncated {len(message) - max_chars} chars]"
+
+
+class TruncatingFormatter(logging.Formatter):
+    """
+    Plain text formatter that truncates messages longer than `max_payload_chars`
+    """
+
+    def __init__(self, max_payload_chars: int) -> None:
+        super().__init__(TEXT_LOG_FORMAT)
+        self.max_payload_chars = max_payload_chars
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = truncate_payload(record.message, self.max_payload_chars)
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a single line JSON object, truncating messages longer than `max_payload_chars`
+    """
+
+    def __init__(self, max_payload_chars: int) -> None:
+        super().__init__()
+        self.max_payload_chars = max_payload_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": truncate_payload(record.getMessage(), self.max_payload_chars),
+        }
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_entry)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Keeps only a `sample_rate` fraction of DEBUG records. Dropped records are never formatted,
+    so their arguments are never converted to strings.
+    """
+
+    def __init__(self, sample_rate: float) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.sample_rate  # noqa: S311 - sampling, not security
+
+
+def configure_logging(level: str, log_format: str, max_payload_chars: int, debug_sample_rate: float) -> None:
+    """
+    Configure the root logger
+
+    Parameters:
+    level (str): the minimum level logged.
+    log_format (str): `json` for structured logs, anything else for plain text.
+    max_payload_chars (int): messages longer than this are truncated, 0 disables truncation.
+    debug_sample_rate (float): the fraction of DEBUG records kept.
+    """
+    handler = logging.StreamHandler()
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter(max_payload_chars))
+    else:
+        handler.setFormatter(TruncatingFormatter(max_payload_chars))
+    if debug_sample_rate < 1:
+        handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+
+    logging.basicConfig(level=level, handlers=[handler])
@@ -0,0 +1,102 @@
+import functools
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from opentelemetry import trace
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import SpanProcessor
+
+# Spans are no-ops until `configure_tracing` installs a tracer provider
+tracer = trace.get_tracer("cir")
+
+
+def configure_tracing(span_processor: "SpanProcessor | None" = None) -> None:
+    """
+    Install a tracer provider that exports spans via OTLP. The exporter is configured by the standard
+    `OTEL_EXPORTER_OTLP_*` environment variables.
+
+    Parameters:
+    span_processor (SpanProcessor): overrides the OTLP exporter, e.g. with an in-memory exporter for testing.
+    """
+    # Imported here as the SDK and exporter are only needed when tracing is enabled
+    from opentelemetry.sdk.resources import Resource  # noqa: PLC0415
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+
+    if span_processor is None:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter  # noqa: PLC0415
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor  # noqa: PLC0415
+
+        span_processor = BatchSpanProcessor(OTLPSpanExporter())
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(span_processor)
+    trace.set_tracer_provider(provider)
+
+
+def set_span_attributes(**attributes) -> None:
+    """
+    Set attributes on the current span, skipping any that are None
+    """
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(f"ci.{key}", value)
+
+
+def traced(component: str) -> Callable:
+    """
+    Decorator running every call to the decorated function inside a span named `<component>.<function name>`.
+    Exceptions are recorded on the span and re-raised.
+
+    Parameters:
+    component (str): the class the decorated function belongs to.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = f"{component}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running every HTTP request inside a server span named after the method and route
+    path template, so router, service and repository spans share a single trace per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.start_as_current_span(scope["method"], kind=trace.SpanKind.SERVER) as span:
+            span.set_attribute("http.request.method", scope["method"])
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
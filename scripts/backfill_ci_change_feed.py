@@ -0,0 +1,83 @@
+"""
+Adds the change feed fields to CI metadata written before the change feed was introduced, so that existing CIs
+are returned by `GET /collection-instruments/changes` as created when they were published.
+
+Metadata that already has the fields is left alone, so the script can be re-run safely while the service is live.
+A batch fails if one of its CIs was changed by the service after it was read, and the script should be re-run.
+
+Usage:
+    PROJECT_ID=... FIRESTORE_DB_NAME=... uv run python -m scripts.backfill_ci_change_feed [--dry-run]
+"""
+
+import argparse
+
+from google.cloud import firestore
+
+from app.config import settings
+from app.events.ci_events import CiEventType
+from app.repositories.firebase.ci_firebase_repository import CHANGE_SEQUENCE_DOCUMENT_ID
+
+# Firestore limits a batch to 500 writes
+BATCH_SIZE = 500
+
+
+@firestore.transactional
+def reserve_change_positions(transaction, sequence_document, count: int) -> range:
+    """
+    Reserve positions in the change feed after every change made so far, in the same way as the service
+    """
+    snapshot = sequence_document.get(transaction=transaction)
+    last_position = snapshot.get("last_position") if snapshot.exists else 0
+    transaction.set(sequence_document, {"last_position": last_position + count})
+    return range(last_position + 1, last_position + count + 1)
+
+
+def main(dry_run: bool) -> None:
+    client = firestore.Client(project=settings.PROJECT_ID, database=settings.FIRESTORE_DB_NAME)
+    collection = client.collection(settings.CI_FIRESTORE_COLLECTION_NAME)
+
+    documents, skipped = [], 0
+    for document in collection.stream():
+        if "change_position" in document.to_dict():
+            skipped += 1
+        else:
+            documents.append(document)
+    # `published_at` has the same fixed width format as `updated_at`, so CIs are added to the feed in the order
+    # they were published
+    documents.sort(key=lambda document: document.get("published_at"))
+
+    if documents and not dry_run:
+        sequence_document = client.collection(settings.CI_CHANGE_SEQUENCE_FIRESTORE_COLLECTION_NAME).document(
+            CHANGE_SEQUENCE_DOCUMENT_ID
+        )
+        change_positions = reserve_change_positions(client.transaction(), sequence_document, len(documents))
+
+        batch = client.batch()
+        pending = 0
+        for document, change_position in zip(documents, change_positions, strict=True):
+            batch.update(
+                document.reference,
+                {
+                    "event_type": CiEventType.CREATED.value,
+                    "updated_at": document.get("published_at"),
+                    "change_position": change_position,
+                },
+                # Leaves the position of a change made by the service since the document was read
+                option=client.write_option(last_update_time=document.update_time),
+            )
+            pending += 1
+            if pending == BATCH_SIZE:
+                batch.commit()
+                batch = client.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+
+    action = "Would backfill" if dry_run else "Backfilled"
+    print(f"{action} {len(documents)} CI metadata documents, {skipped} already in the change feed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="count the documents without updating them")
+    main(parser.parse_args().dry_run)
@@ -0,0 +1,58 @@
+"""
+Adds the latest version of every CI published before the latest version collection was introduced to that
+collection, so `GET /collection-instruments/latest` returns every CI and latest version lookups are single reads.
+
+Latest versions that are already in the collection are never overwritten, so the script can be re-run safely
+while the service is live.
+
+Usage:
+    PROJECT_ID=... FIRESTORE_DB_NAME=... uv run python -m scripts.backfill_ci_latest_index [--dry-run]
+"""
+
+import argparse
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud import firestore
+
+from app.config import settings
+from app.models.responses import CiMetadataRecord
+from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+
+
+def main(dry_run: bool) -> None:
+    client = firestore.Client(project=settings.PROJECT_ID, database=settings.FIRESTORE_DB_NAME)
+    ci_collection = client.collection(settings.CI_FIRESTORE_COLLECTION_NAME)
+    latest_collection = client.collection(settings.CI_LATEST_FIRESTORE_COLLECTION_NAME)
+
+    # Metadata is ordered by descending `ci_version`, so the first CI seen for each key is the latest
+    latest_ci_metadata: dict[str, CiMetadataRecord] = {}
+    for document in ci_collection.order_by("ci_version", direction=firestore.Query.DESCENDING).stream():
+        ci_metadata = CiMetadataRecord.from_document(document.to_dict())
+        latest_document_id = CiFirebaseRepository.latest_document_id(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        latest_ci_metadata.setdefault(latest_document_id, ci_metadata)
+
+    added, skipped = 0, 0
+    for latest_document_id, ci_metadata in latest_ci_metadata.items():
+        if dry_run:
+            skipped += latest_collection.document(latest_document_id).get().exists
+            continue
+        try:
+            # A CI published since its versions were read has already set its latest version
+            latest_collection.document(latest_document_id).create(
+                CiFirebaseRepository.latest_document_data(ci_metadata)
+            )
+            added += 1
+        except AlreadyExists:
+            skipped += 1
+
+    action = "Would add" if dry_run else "Added"
+    count = len(latest_ci_metadata) - skipped if dry_run else added
+    print(f"{action} {count} latest CI versions, {skipped} already in the latest version collection")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="count the latest versions without adding them")
+    main(parser.parse_args().dry_run)
@@ -0,0 +1,101 @@
+"""
+Rebuilds the summary of every survey from its CI metadata, recording the size of each stored schema that was
+created before sizes were recorded, so `GET /collection-instruments/summary` is correct for CIs published before
+survey summaries were introduced.
+
+Each survey is rebuilt in its own transaction that reads every version of the survey, so a CI created or deleted
+while its survey is rebuilt makes the transaction retry, and the script can be run while the service is live.
+
+Usage:
+    PROJECT_ID=... FIRESTORE_DB_NAME=... CI_STORAGE_BUCKET_NAME=... \
+        uv run python -m scripts.backfill_ci_survey_summaries [--dry-run]
+"""
+
+import argparse
+from typing import Any
+
+from google.cloud import firestore, storage
+
+from app.config import settings
+from app.models.responses import CiMetadataRecord
+from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+from app.services.ci_schema_location_service import CiSchemaLocationService
+
+
+def build_survey_summary(
+    survey_id: str, documents: list[dict[str, Any]], schema_sizes: dict[str, int]
+) -> tuple[dict[str, Any], dict[str, int]]:
+    """
+    Build the summary of a survey from the metadata of every version of its CIs
+
+    Returns:
+    tuple[dict, dict]: the summary document, and the schema sizes to record for CIs without one, by guid
+    """
+    survey_summary: dict[str, Any] = {"survey_id": survey_id, "version_count": 0, "schema_bytes": 0, "cis": {}}
+    missing_schema_sizes: dict[str, int] = {}
+
+    for document in sorted(documents, key=lambda document: document["ci_version"], reverse=True):
+        ci_metadata = CiMetadataRecord.from_document(document)
+        schema_size = document.get("schema_size")
+        if schema_size is None:
+            schema_size = schema_sizes.get(CiSchemaLocationService.get_ci_schema_location(ci_metadata), 0)
+            missing_schema_sizes[ci_metadata.guid] = schema_size
+
+        latest_document_id = CiFirebaseRepository.latest_document_id(
+            ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+        )
+        # Versions are ordered by descending `ci_version`, so the first version seen of each CI is the latest
+        ci_summary = survey_summary["cis"].setdefault(
+            latest_document_id,
+            {
+                "classifier_type": ci_metadata.classifier_type,
+                "classifier_value": ci_metadata.classifier_value,
+                "language": ci_metadata.language,
+                "latest_guid": ci_metadata.guid,
+                "latest_ci_version": ci_metadata.ci_version,
+                "version_count": 0,
+            },
+        )
+        ci_summary["version_count"] += 1
+        survey_summary["version_count"] += 1
+        survey_summary["schema_bytes"] += schema_size
+
+    return survey_summary, missing_schema_sizes
+
+
+def main(dry_run: bool) -> None:
+    client = firestore.Client(project=settings.PROJECT_ID, database=settings.FIRESTORE_DB_NAME)
+    ci_collection = client.collection(settings.CI_FIRESTORE_COLLECTION_NAME)
+    survey_summary_collection = client.collection(settings.CI_SURVEY_SUMMARY_FIRESTORE_COLLECTION_NAME)
+
+    bucket = storage.Client(project=settings.PROJECT_ID).bucket(settings.CI_STORAGE_BUCKET_NAME)
+    schema_sizes = {blob.name: blob.size for blob in bucket.list_blobs()}
+
+    survey_ids = sorted({document.get("survey_id") for document in ci_collection.select(["survey_id"]).stream()})
+
+    @firestore.transactional
+    def rebuild_survey_summary(transaction, survey_id: str) -> int:
+        documents = [
+            document.to_dict()
+            for document in ci_collection.where("survey_id", "==", survey_id).stream(transaction=transaction)
+        ]
+        survey_summary, missing_schema_sizes = build_survey_summary(survey_id, documents, schema_sizes)
+        if not dry_run:
+            for guid, schema_size in missing_schema_sizes.items():
+                transaction.update(ci_collection.document(guid), {"schema_size": schema_size})
+            transaction.set(
+                survey_summary_collection.document(CiFirebaseRepository.survey_summary_document_id(survey_id)),
+                survey_summary,
+            )
+        return len(missing_schema_sizes)
+
+    recorded = sum(rebuild_survey_summary(client.transaction(), survey_id) for survey_id in survey_ids)
+
+    action = "Would rebuild" if dry_run else "Rebuilt"
+    print(f"{action} {len(survey_ids)} survey summaries, recording {recorded} missing schema sizes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="count the summaries without writing them")
+    main(parser.parse_args().dry_run)
@@ -0,0 +1,91 @@
+"""
+Compares the stored size and encode/decode latency of each CI schema storage codec on a folder of CI json files.
+Pass `--bucket` to also measure upload and download latency against a real bucket; the benchmark blobs are
+written under `benchmark/` and deleted afterwards.
+
+Usage:
+    uv run python -m scripts.benchmark_ci_schema_codecs <path to CI json folder> [--repeat 20] [--bucket <name>]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from app.services.ci_schema_codec_service import CI_SCHEMA_CODECS, CiSchemaCodecService, zstandard
+
+COMPRESSION_LEVEL = 6
+
+
+def load_corpus(path_to_json: str) -> dict[str, dict]:
+    corpus = {}
+    for json_file in sorted(os.listdir(path_to_json)):
+        if json_file.endswith(".json"):
+            with open(os.path.join(path_to_json, json_file)) as content:
+                corpus[json_file] = json.load(content)
+    return corpus
+
+
+def timed_ms(function, repeat: int) -> float:
+    """
+    Returns the median time of `repeat` calls of `function` in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark_codec(codec: str, corpus: dict[str, dict], repeat: int, bucket) -> dict:
+    result = {"codec": codec, "bytes": 0, "encode_ms": 0.0, "decode_ms": 0.0, "upload_ms": 0.0, "download_ms": 0.0}
+
+    for name, schema in corpus.items():
+        data, content_encoding = CiSchemaCodecService.encode(schema, codec, COMPRESSION_LEVEL)
+        result["bytes"] += len(data)
+        result["encode_ms"] += timed_ms(lambda: CiSchemaCodecService.encode(schema, codec, COMPRESSION_LEVEL), repeat)
+        result["decode_ms"] += timed_ms(lambda: CiSchemaCodecService.decode(data), repeat)
+
+        if bucket is not None:
+            blob = bucket.blob(f"benchmark/{codec}/{name}")
+            blob.content_encoding = content_encoding
+            result["upload_ms"] += timed_ms(
+                lambda: blob.upload_from_string(data, content_type="application/json"), repeat
+            )
+            result["download_ms"] += timed_ms(lambda: blob.download_as_bytes(raw_download=True), repeat)
+            blob.delete()
+
+    return result
+
+
+def main(path_to_json: str, repeat: int, bucket_name: str | None) -> None:
+    corpus = load_corpus(path_to_json)
+    bucket = None
+    if bucket_name:
+        from google.cloud import storage
+
+        bucket = storage.Client().bucket(bucket_name)
+
+    codecs = [codec for codec in CI_SCHEMA_CODECS if codec != "zstd" or zstandard is not None]
+    results = [benchmark_codec(codec, corpus, repeat, bucket) for codec in codecs]
+    baseline_bytes = results[0]["bytes"]
+
+    print(f"{len(corpus)} schemas, median of {repeat} runs, times summed over the corpus")
+    print(f"{'codec':<12}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}{'upload ms':>12}{'download ms':>13}")
+    for result in results:
+        print(
+            f"{result['codec']:<12}{result['bytes']:>12}{result['bytes'] / baseline_bytes:>8.2f}"
+            f"{result['encode_ms']:>12.2f}{result['decode_ms']:>12.2f}"
+            f"{result['upload_ms']:>12.2f}{result['download_ms']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path_to_json", help="folder of CI json files")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bucket", help="bucket used to measure upload and download latency")
+    args = parser.parse_args()
+    main(args.path_to_json, args.repeat, args.bucket)
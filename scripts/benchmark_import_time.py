@@ -0,0 +1,65 @@
+"""
+Measures how long `import app.main` takes using `python -X importtime`, reports the slowest imports and fails if
+the median import time is over budget or if a deferred library is imported at startup.
+
+Usage:
+    uv run python -m scripts.benchmark_import_time [--runs 5] [--budget-ms 1000] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Libraries that must only be imported when the first client is created
+DEFERRED_MODULES = ("google.cloud", "firebase_admin", "grpc", "opentelemetry.sdk")
+
+
+def import_app() -> dict[str, int]:
+    """
+    Import `app.main` in a fresh interpreter and return the cumulative import time of each module in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"CONF": "unit", **os.environ},
+    )
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        cumulative_us[module.strip()] = int(cumulative)
+    return cumulative_us
+
+
+def main(runs: int, budget_ms: int, top: int) -> int:
+    imports = [import_app() for _ in range(runs)]
+    median_ms = statistics.median(run["app.main"] for run in imports) / 1000
+
+    print(f"import app.main: median {median_ms:.0f} ms over {runs} runs (budget {budget_ms} ms)")
+    print(f"\nSlowest {top} imports (cumulative ms, last run):")
+    slowest = sorted(imports[-1].items(), key=lambda item: item[1], reverse=True)[1 : top + 1]
+    for module, cumulative in slowest:
+        print(f"{cumulative / 1000:>10.1f}  {module}")
+
+    deferred = sorted({module for module in imports[-1] if module.startswith(DEFERRED_MODULES)})
+    if deferred:
+        print(f"\nFAIL: deferred modules imported at startup: {', '.join(deferred)}")
+        return 1
+    if median_ms > budget_ms:
+        print(f"\nFAIL: import time is over the {budget_ms} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.budget_ms, args.top))
@@ -0,0 +1,44 @@
+"""
+Measures the per-document cost of building the metadata returned by the repository list methods, comparing
+validated `CiMetadata` models (before) against `CiMetadataRecord` (after), including the `model_dump` done by
+the routers.
+
+Usage:
+    uv run python -m scripts.benchmark_metadata_records [--documents 10000]
+"""
+
+import argparse
+import statistics
+import time
+
+from app.models.responses import CiMetadata, CiMetadataRecord
+from tests.test_data.ci_test_data import mock_ci_metadata
+
+REPEAT = 10
+
+
+def median_us_per_document(build, documents: list[dict]) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for document in documents:
+            build(document).model_dump()
+        timings.append((time.perf_counter() - start) / len(documents) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main(document_count: int) -> None:
+    documents = [mock_ci_metadata.model_copy(update={"guid": str(guid)}).model_dump() for guid in range(document_count)]
+
+    before = median_us_per_document(lambda document: CiMetadata(**document), documents)
+    after = median_us_per_document(CiMetadataRecord.from_document, documents)
+
+    print(f"{document_count} documents, median of {REPEAT} runs")
+    print(f"CiMetadata:       {before:.2f} us per document")
+    print(f"CiMetadataRecord: {after:.2f} us per document ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=10000)
+    main(parser.parse_args().documents)
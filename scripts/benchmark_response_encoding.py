@@ -0,0 +1,78 @@
+"""
+Compares the cost of encoding the all-metadata and schema responses with the stdlib json encoder used by
+`JSONResponse` and FastAPI's `jsonable_encoder` (before) against `ORJSONResponse` (after).
+
+Usage:
+    uv run python -m scripts.benchmark_response_encoding [--metadata-count 5000] [--schema <path to CI json>]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from tests.test_data.ci_test_data import mock_ci_metadata
+
+REPEAT = 20
+
+
+def synthetic_schema() -> dict:
+    return {
+        "title": "Benchmark schema",
+        "sections": [
+            {
+                "id": f"section-{section}",
+                "title": "Section title",
+                "groups": [
+                    {
+                        "id": f"group-{section}-{question}",
+                        "blocks": [{"id": f"block-{question}", "type": "Question", "label": "How many employees?"}],
+                    }
+                    for question in range(100)
+                ],
+            }
+            for section in range(50)
+        ],
+    }
+
+
+def median_ms(function) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(name: str, content) -> None:
+    before = median_ms(lambda: JSONResponse(content=jsonable_encoder(content)))
+    after = median_ms(lambda: ORJSONResponse(content=content))
+    print(f"{name:<24}{before:>12.2f}{after:>12.2f}{before / after:>10.1f}x")
+
+
+def main(metadata_count: int, schema_path: str | None) -> None:
+    metadata_collection = [
+        mock_ci_metadata.model_copy(update={"guid": str(guid)}).model_dump() for guid in range(metadata_count)
+    ]
+    if schema_path:
+        with open(schema_path) as content:
+            schema = json.load(content)
+    else:
+        schema = synthetic_schema()
+
+    print(f"median of {REPEAT} runs")
+    print(f"{'response':<24}{'before ms':>12}{'after ms':>12}{'speedup':>11}")
+    report(f"all metadata ({metadata_count})", metadata_collection)
+    report("schema", schema)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metadata-count", type=int, default=5000)
+    parser.add_argument("--schema", help="CI json file to encode instead of a generated schema")
+    args = parser.parse_args()
+    main(args.metadata_count, args.schema)
@@ -0,0 +1,67 @@
+"""
+Deletes content-addressed CI schemas that no CI refers to any more. Schemas stored with
+`CI_SCHEMA_CONTENT_ADDRESSED_ENABLED` can be shared by several CIs, so they are left in the bucket when a CI is
+deleted or updated, until this is run.
+
+The bucket is listed before the CI metadata is read, and a schema is only deleted if it was last stored or reused
+more than `--min-age-hours` ago and has not been reused since it was listed, so the script can be run while the
+service is live.
+
+Usage:
+    PROJECT_ID=... FIRESTORE_DB_NAME=... CI_STORAGE_BUCKET_NAME=... \
+        uv run python -m scripts.collect_unreferenced_ci_schemas [--min-age-hours 24] [--dry-run]
+"""
+
+import argparse
+from datetime import UTC, datetime, timedelta
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.cloud import firestore, storage
+
+from app.config import settings
+from app.services.ci_schema_location_service import CONTENT_ADDRESSED_SCHEMA_PREFIX
+
+
+def main(min_age_hours: int, dry_run: bool) -> None:
+    bucket = storage.Client(project=settings.PROJECT_ID).bucket(settings.CI_STORAGE_BUCKET_NAME)
+    # Listed first, so a schema reused by a CI whose metadata is not read below is either too new to be deleted,
+    # or was marked as referenced after it was listed and fails the metageneration precondition of its delete
+    blobs = list(bucket.list_blobs(prefix=CONTENT_ADDRESSED_SCHEMA_PREFIX))
+
+    client = firestore.Client(project=settings.PROJECT_ID, database=settings.FIRESTORE_DB_NAME)
+    ci_collection = client.collection(settings.CI_FIRESTORE_COLLECTION_NAME)
+    referenced = {document.to_dict().get("schema_hash") for document in ci_collection.select(["schema_hash"]).stream()}
+
+    min_updated = datetime.now(UTC) - timedelta(hours=min_age_hours)
+    deleted, skipped, bytes_deleted = 0, 0, 0
+    for blob in blobs:
+        schema_hash = blob.name.removeprefix(CONTENT_ADDRESSED_SCHEMA_PREFIX).removesuffix(".json")
+        if schema_hash in referenced or blob.updated > min_updated:
+            continue
+        if not dry_run:
+            try:
+                blob.delete(if_metageneration_match=blob.metageneration)
+            except PreconditionFailed:
+                print(f"Skipped {blob.name}: it was reused while being collected")
+                skipped += 1
+                continue
+            except NotFound:
+                continue
+        deleted += 1
+        bytes_deleted += blob.size
+
+    action = "Would delete" if dry_run else "Deleted"
+    print(
+        f"{action} {deleted} of {len(blobs)} content-addressed schemas: {bytes_deleted} bytes, "
+        f"{len(referenced - {None})} referenced, {skipped} skipped"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--min-age-hours", type=int, default=24, help="only delete schemas last stored or reused before this"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="count the schemas without deleting them")
+    args = parser.parse_args()
+    main(args.min_age_hours, args.dry_run)
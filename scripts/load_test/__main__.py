@@ -0,0 +1,99 @@
+"""
+Load tests the collection instrument endpoints and reports p50/p95/p99 latency and throughput per endpoint.
+
+By default the app is started in-process with in-memory Firestore, Cloud Storage and Pub/Sub fakes, so no
+emulators or credentials are needed; use the latency options to simulate the round trip to each backend.
+Pass `--url` to load test an already running service instead. The app logs at `LOG_LEVEL`, so set
+`LOG_LEVEL=WARNING` to leave the cost of request logging out of the results.
+
+Usage:
+    uv run python -m scripts.load_test [--users 10] [--duration 30] [--firestore-latency-ms 10]
+        [--storage-latency-ms 30] [--pubsub-latency-ms 20] [--jitter-ms 5] [--schema <path to CI json>]
+        [--url http://localhost:3030]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+
+import uvicorn
+
+from scripts.load_test.driver import report, run_load
+from scripts.load_test.fakes import Latency, install_fakes
+from tests.test_data.ci_test_data import mock_post_ci_schema
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_in_process_server(args) -> tuple[uvicorn.Server, threading.Thread, str]:
+    """
+    Start the app with in-memory backends on a background thread so the load driver's event loop is not
+    blocked by the app's synchronous backend calls
+    """
+    from app.main import app
+
+    install_fakes(
+        app,
+        firestore_latency=Latency(args.firestore_latency_ms, args.jitter_ms),
+        storage_latency=Latency(args.storage_latency_ms, args.jitter_ms),
+        pubsub_latency=Latency(args.pubsub_latency_ms, args.jitter_ms),
+    )
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def main(args) -> None:
+    # The driver's own request logs would otherwise interleave with the app's
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.schema:
+        with open(args.schema) as content:
+            payload = json.load(content)
+    else:
+        payload = mock_post_ci_schema.model_dump()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, thread, base_url = start_in_process_server(args)
+
+    try:
+        result = asyncio.run(run_load(base_url, args.users, args.duration, payload))
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join()
+
+    print(f"{args.users} users for {args.duration} s against {base_url}")
+    if server is not None:
+        print(
+            f"in-memory backends: firestore {args.firestore_latency_ms} ms, storage {args.storage_latency_ms} ms, "
+            f"pubsub {args.pubsub_latency_ms} ms, jitter {args.jitter_ms} ms"
+        )
+    print(report(result))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to generate load for")
+    parser.add_argument("--firestore-latency-ms", type=float, default=10)
+    parser.add_argument("--storage-latency-ms", type=float, default=30)
+    parser.add_argument("--pubsub-latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--schema", help="CI json file to post instead of the unit test CI")
+    parser.add_argument("--url", help="load test a running service instead of starting one with in-memory backends")
+    main(parser.parse_args())
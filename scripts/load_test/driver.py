@@ -0,0 +1,145 @@
+"""
+An httpx load driver. Each virtual user repeatedly runs the lifecycle of a collection instrument - POST, metadata
+GET, schema GET, validator PUT and DELETE - against its own survey ID, recording the latency of every request.
+"""
+
+import asyncio
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+VALIDATOR_VERSION = "0.0.1"
+UPDATED_VALIDATOR_VERSION = "0.0.2"
+CLASSIFIER_TYPE = "form_type"
+
+
+@dataclass
+class LoadResult:
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    elapsed_seconds: float = 0.0
+
+    def record(self, operation: str, response: httpx.Response, started: float, expected_status: int) -> None:
+        self.latencies_ms[operation].append((time.perf_counter() - started) * 1000)
+        if response.status_code != expected_status:
+            self.errors[operation] += 1
+
+
+async def timed_request(
+    client: httpx.AsyncClient,
+    result: LoadResult,
+    operation: str,
+    method: str,
+    url: str,
+    expected_status: int = 200,
+    **kwargs,
+) -> httpx.Response:
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    result.record(operation, response, started, expected_status)
+    return response
+
+
+async def run_user(client: httpx.AsyncClient, result: LoadResult, user: int, payload: dict, deadline: float) -> None:
+    iteration = 0
+    while time.perf_counter() < deadline:
+        survey_id = f"load-{user}-{iteration}"
+        guid = str(uuid.uuid4())
+        iteration += 1
+
+        await timed_request(
+            client,
+            result,
+            "POST /collection-instruments",
+            "POST",
+            "/collection-instruments",
+            params={"guid": guid, "validator_version": VALIDATOR_VERSION},
+            json={**payload, "survey_id": survey_id},
+        )
+        await timed_request(
+            client,
+            result,
+            "GET /collection-instruments/metadata",
+            "GET",
+            "/collection-instruments/metadata",
+            params={
+                "survey_id": survey_id,
+                "classifier_type": CLASSIFIER_TYPE,
+                "classifier_value": payload[CLASSIFIER_TYPE],
+                "language": payload["language"],
+            },
+        )
+        await timed_request(
+            client,
+            result,
+            "GET /collection-instruments/schema",
+            "GET",
+            "/collection-instruments/schema",
+            params={"guid": guid},
+        )
+        await timed_request(
+            client,
+            result,
+            "PUT /collection-instruments/validator-version",
+            "PUT",
+            "/collection-instruments/validator-version",
+            params={"guid": guid, "validator_version": UPDATED_VALIDATOR_VERSION},
+            json={**payload, "survey_id": survey_id},
+        )
+        await timed_request(
+            client,
+            result,
+            "DELETE /collection-instruments",
+            "DELETE",
+            "/collection-instruments",
+            params={"survey_id": survey_id},
+        )
+
+
+async def run_load(base_url: str, users: int, duration_seconds: float, payload: dict) -> LoadResult:
+    """
+    Run `users` concurrent virtual users against `base_url` for `duration_seconds`
+
+    Parameters:
+    base_url (str): the url of the running service.
+    users (int): the number of concurrent virtual users.
+    duration_seconds (float): how long to generate load for; iterations in flight are allowed to finish.
+    payload (dict): the CI posted by each iteration, with `survey_id` replaced per iteration.
+    """
+    result = LoadResult()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration_seconds
+        await asyncio.gather(*(run_user(client, result, user, payload, deadline) for user in range(users)))
+        result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def percentiles(latencies_ms: list[float]) -> tuple[float, float, float]:
+    if len(latencies_ms) == 1:
+        return latencies_ms[0], latencies_ms[0], latencies_ms[0]
+    cut_points = statistics.quantiles(latencies_ms, n=100, method="inclusive")
+    return cut_points[49], cut_points[94], cut_points[98]
+
+
+def report(result: LoadResult) -> str:
+    lines = [
+        f"{'operation':<48}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    ]
+    for operation, latencies_ms in result.latencies_ms.items():
+        p50, p95, p99 = percentiles(latencies_ms)
+        lines.append(
+            f"{operation:<48}{len(latencies_ms):>10}{result.errors[operation]:>8}"
+            f"{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{len(latencies_ms) / result.elapsed_seconds:>10.1f}"
+        )
+    total = sum(len(latencies_ms) for latencies_ms in result.latencies_ms.values())
+    lines.append(
+        f"\n{total} requests, {sum(result.errors.values())} errors in {result.elapsed_seconds:.1f} s: "
+        f"{total / result.elapsed_seconds:.1f} req/s"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,253 @@
+"""
+In-memory stand-ins for the Firestore, Cloud Storage and Pub/Sub clients with injected latency.
+
+The fakes replace the google cloud clients rather than the loaders, so the real `FirebaseLoader`, `BucketLoader`,
+`Publisher` and repositories run unchanged under load. Each call that would make a network round trip sleeps for
+the configured latency first, which blocks the calling thread in the same way the real client libraries do.
+"""
+
+import gzip
+import io
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+
+from mockfirestore import CollectionReference, DocumentReference, MockFirestore, Query
+from mockfirestore._helpers import get_by_path
+from mockfirestore._transformations import apply_transformations
+
+from app.events.publisher import Publisher
+from app.repositories.buckets.bucket_loader import BucketLoader
+from app.repositories.firebase.firebase_loader import FirebaseLoader
+
+# Firestore methods that send a request to the server
+FIRESTORE_ROUND_TRIPS = {"get", "stream", "set", "update", "delete"}
+
+
+@dataclass
+class Latency:
+    """Injected latency of a fake backend, drawn from a normal distribution and never negative"""
+
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    def wait(self) -> None:
+        if self.mean_ms <= 0 and self.jitter_ms <= 0:
+            return
+        time.sleep(max(0.0, random.gauss(self.mean_ms, self.jitter_ms)) / 1000)
+
+
+class LatentFirestoreProxy:
+    """
+    Wraps a `MockFirestore` object, sleeping before each round trip and wrapping any collection, document or
+    query it returns so chained calls are delayed too. Transactions are returned unwrapped; their writes are
+    applied through the wrapped document references and so are delayed when the transaction commits.
+    """
+
+    def __init__(self, target, latency: Latency) -> None:
+        self._target = target
+        self._latency = latency
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            if name in FIRESTORE_ROUND_TRIPS:
+                self._latency.wait()
+            if name == "set" and kwargs.get("merge"):
+                return merge_document(self._target, args[0])
+            result = attribute(*args, **kwargs)
+            if isinstance(result, (CollectionReference, DocumentReference, Query)):
+                return LatentFirestoreProxy(result, self._latency)
+            return result
+
+        return call
+
+
+def field_paths(data: dict, prefix: str = ""):
+    """Yield the dot-delimited path of each field set by `data`, descending into non-empty maps"""
+    for key, value in data.items():
+        if isinstance(value, dict) and value:
+            yield from field_paths(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+def merge_document(document_reference: DocumentReference, data: dict) -> None:
+    """
+    Merge `data` into a document field by field, as firestore does. `MockFirestore` replaces nested maps on a
+    merge, and does not apply increments or field deletes when it creates the document.
+    """
+    document = get_by_path(document_reference._data, document_reference._path, create_nested=True)
+    apply_transformations(document, dict(field_paths(data)))
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str) -> None:
+        self.bucket = bucket
+        self.name = name
+        self.content_encoding = None
+        self.content_type = None
+
+    def upload_from_string(self, data, content_type: str | None = None, **kwargs) -> None:
+        self.bucket.latency.wait()
+        from google.api_core.exceptions import PreconditionFailed
+
+        if kwargs.get("if_generation_match") == 0 and self.name in self.bucket.objects:
+            raise PreconditionFailed(f"Object already exists: {self.bucket.name}/{self.name}")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.content_type = content_type
+        self.bucket.objects[self.name] = (bytes(data), self.content_encoding)
+
+    def exists(self, **kwargs) -> bool:
+        self.bucket.latency.wait()
+        return self.name in self.bucket.objects
+
+    def download_as_bytes(self, raw_download: bool = False, **kwargs) -> bytes:
+        self.bucket.latency.wait()
+        from google.cloud.exceptions import NotFound
+
+        if self.name not in self.bucket.objects:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+        data, content_encoding = self.bucket.objects[self.name]
+        if content_encoding == "gzip" and not raw_download:
+            return gzip.decompress(data)
+        return data
+
+    def delete(self, **kwargs) -> None:
+        self.bucket.latency.wait()
+        self.bucket.objects.pop(self.name, None)
+
+    @property
+    def size(self) -> int | None:
+        stored = self.bucket.objects.get(self.name)
+        return len(stored[0]) if stored else None
+
+    def reload(self, **kwargs) -> None:
+        self.patch()
+
+    def patch(self, **kwargs) -> None:
+        self.bucket.latency.wait()
+        from google.cloud.exceptions import NotFound
+
+        if self.name not in self.bucket.objects:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+
+    def open(self, mode: str = "r", content_type: str | None = None, **kwargs) -> "FakeBlobWriter":
+        self.content_type = content_type
+        return FakeBlobWriter(self)
+
+
+class FakeBlobWriter(io.BytesIO):
+    """Buffers a streamed upload and stores it when closed, like a resumable upload"""
+
+    def __init__(self, blob: FakeBlob) -> None:
+        super().__init__()
+        self.blob = blob
+
+    def close(self) -> None:
+        if not self.closed:
+            self.blob.bucket.latency.wait()
+            self.blob.bucket.objects[self.blob.name] = (self.getvalue(), self.blob.content_encoding)
+        super().close()
+
+
+@dataclass
+class FakeBucket:
+    name: str
+    latency: Latency
+    objects: dict[str, tuple[bytes, str | None]] = field(default_factory=dict)
+
+    def blob(self, blob_name: str) -> FakeBlob:
+        return FakeBlob(self, blob_name)
+
+    def exists(self, **kwargs) -> bool:
+        self.latency.wait()
+        return True
+
+    def list_blobs(self, prefix: str = "", **kwargs) -> list[FakeBlob]:
+        self.latency.wait()
+        return [self.blob(name) for name in list(self.objects) if name.startswith(prefix)]
+
+    def copy_blob(self, blob: FakeBlob, destination_bucket: "FakeBucket", new_name: str, **kwargs) -> FakeBlob:
+        self.latency.wait()
+        destination_bucket.objects[new_name] = self.objects[blob.name]
+        return destination_bucket.blob(new_name)
+
+
+class FakeStorageClient:
+    def __init__(self, latency: Latency) -> None:
+        self.latency = latency
+        self.buckets: dict[str, FakeBucket] = {}
+
+    def get_bucket(self, bucket_name: str, **kwargs) -> FakeBucket:
+        self.latency.wait()
+        return self.buckets.setdefault(bucket_name, FakeBucket(bucket_name, self.latency))
+
+    bucket = get_bucket
+
+
+class FakeFuture:
+    def __init__(self, message_id: str) -> None:
+        self.message_id = message_id
+
+    def result(self, timeout: float | None = None) -> str:
+        return self.message_id
+
+
+class FakePublisherClient:
+    def __init__(self, latency: Latency) -> None:
+        self.latency = latency
+        self.messages: list[tuple[str, bytes]] = []
+        self._message_ids = itertools.count(1)
+
+    @staticmethod
+    def topic_path(project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def get_topic(self, request: dict, **kwargs) -> dict:
+        self.latency.wait()
+        return {"name": request["topic"]}
+
+    def create_topic(self, request: dict, **kwargs) -> dict:
+        self.latency.wait()
+        return {"name": request["name"]}
+
+    def publish(self, topic: str, data: bytes, **attributes) -> FakeFuture:
+        self.latency.wait()
+        self.messages.append((topic, data))
+        return FakeFuture(str(next(self._message_ids)))
+
+
+class InMemoryFirebaseLoader(FirebaseLoader):
+    def __init__(self, latency: Latency) -> None:
+        super().__init__(LatentFirestoreProxy(MockFirestore(), latency))
+
+
+class InMemoryBucketLoader(BucketLoader):
+    def __init__(self, latency: Latency) -> None:
+        super().__init__(FakeStorageClient(latency))
+
+
+class InMemoryPublisher(Publisher):
+    def __init__(self, latency: Latency) -> None:
+        super().__init__(FakePublisherClient(latency))
+
+
+def install_fakes(app, firestore_latency: Latency, storage_latency: Latency, pubsub_latency: Latency) -> None:
+    """
+    Point the app's loader and publisher dependencies at in-memory fakes
+    """
+    from app.dependencies import get_bucket_loader, get_firebase_loader, get_publisher_service
+
+    firebase_loader = InMemoryFirebaseLoader(firestore_latency)
+    bucket_loader = InMemoryBucketLoader(storage_latency)
+    publisher = InMemoryPublisher(pubsub_latency)
+
+    app.dependency_overrides[get_firebase_loader] = lambda: firebase_loader
+    app.dependency_overrides[get_bucket_loader] = lambda: bucket_loader
+    app.dependency_overrides[get_publisher_service] = lambda: publisher
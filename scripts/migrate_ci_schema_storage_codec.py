@@ -0,0 +1,69 @@
+"""
+Re-encodes every CI schema in the schema bucket with the codec set in `CI_SCHEMA_STORAGE_CODEC`.
+
+The application reads schemas stored with any codec, so the new version of the application must be deployed
+before this is run, and schemas can be migrated while the service is live. Each blob is only overwritten if it
+has not changed since it was read.
+
+Usage:
+    CI_SCHEMA_STORAGE_CODEC=gzip PROJECT_ID=... CI_STORAGE_BUCKET_NAME=... \
+        uv run python -m scripts.migrate_ci_schema_storage_codec [--dry-run]
+"""
+
+import argparse
+
+from google.api_core.exceptions import PreconditionFailed
+from google.cloud import storage
+
+from app.config import settings
+from app.services.ci_schema_codec_service import CiSchemaCodecService
+
+
+def migrate_blob(blob: storage.Blob, dry_run: bool) -> tuple[int, int]:
+    """
+    Re-encode a single schema blob, returning its size before and after migration
+    """
+    raw_data = blob.download_as_bytes(raw_download=True)
+    schema = CiSchemaCodecService.decode(raw_data)
+    data, content_encoding = CiSchemaCodecService.encode(
+        schema, settings.CI_SCHEMA_STORAGE_CODEC, settings.CI_SCHEMA_COMPRESSION_LEVEL
+    )
+
+    if data == raw_data and blob.content_encoding == content_encoding:
+        return len(raw_data), len(raw_data)
+
+    if not dry_run:
+        blob.content_encoding = content_encoding
+        blob.upload_from_string(data, content_type="application/json", if_generation_match=blob.generation)
+
+    return len(raw_data), len(data)
+
+
+def main(dry_run: bool) -> None:
+    bucket = storage.Client(project=settings.PROJECT_ID).bucket(settings.CI_STORAGE_BUCKET_NAME)
+    migrated, skipped, bytes_before, bytes_after = 0, 0, 0, 0
+
+    for blob in bucket.list_blobs():
+        if not blob.name.endswith(".json"):
+            continue
+        try:
+            size_before, size_after = migrate_blob(blob, dry_run)
+        except PreconditionFailed:
+            print(f"Skipped {blob.name}: it changed while being migrated, re-run to migrate it")
+            skipped += 1
+            continue
+        migrated += 1
+        bytes_before += size_before
+        bytes_after += size_after
+
+    action = "Would migrate" if dry_run else "Migrated"
+    print(
+        f"{action} {migrated} schemas to {settings.CI_SCHEMA_STORAGE_CODEC}: "
+        f"{bytes_before} bytes -> {bytes_after} bytes, {skipped} skipped"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report the size change without writing blobs")
+    main(parser.parse_args().dry_run)
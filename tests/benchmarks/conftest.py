@@ -0,0 +1,55 @@
+import pytest
+
+from tests.test_data.ci_test_data import mock_ci_metadata, mock_post_ci_schema
+
+# Sized like the largest business survey CIs
+SECTION_COUNT = 50
+QUESTIONS_PER_SECTION = 100
+METADATA_DOCUMENT_COUNT = 1000
+
+
+def build_large_ci() -> dict:
+    """
+    Build a CI dictionary with `SECTION_COUNT` sections of `QUESTIONS_PER_SECTION` questions each
+    """
+    return {
+        **mock_post_ci_schema.model_dump(),
+        "sections": [
+            {
+                "id": f"section-{section}",
+                "title": "Section title",
+                "groups": [
+                    {
+                        "id": f"group-{section}-{question}",
+                        "blocks": [
+                            {
+                                "id": f"block-{section}-{question}",
+                                "type": "Question",
+                                "question": {
+                                    "id": f"question-{section}-{question}",
+                                    "title": "How many employees did the business have?",
+                                    "type": "General",
+                                    "answers": [{"id": f"answer-{section}-{question}", "type": "Number"}],
+                                },
+                            }
+                        ],
+                    }
+                    for question in range(QUESTIONS_PER_SECTION)
+                ],
+            }
+            for section in range(SECTION_COUNT)
+        ],
+    }
+
+
+@pytest.fixture(scope="session")
+def large_ci() -> dict:
+    return build_large_ci()
+
+
+@pytest.fixture(scope="session")
+def ci_metadata_documents() -> list[dict]:
+    return [
+        mock_ci_metadata.model_copy(update={"guid": str(guid), "ci_version": guid}).model_dump()
+        for guid in range(METADATA_DOCUMENT_COUNT)
+    ]
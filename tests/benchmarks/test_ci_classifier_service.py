@@ -0,0 +1,16 @@
+from app.services.ci_classifier_service import CiClassifierService
+
+
+def test_get_classifier_type(benchmark, large_ci):
+    assert benchmark(CiClassifierService.get_classifier_type, large_ci) == "form_type"
+
+
+def test_get_classifier_value(benchmark, large_ci):
+    assert benchmark(CiClassifierService.get_classifier_value, large_ci, "form_type") == large_ci["form_type"]
+
+
+def test_clean_ci_unused_classifier(benchmark, large_ci):
+    # The CI is copied on every round as the method removes keys in place
+    cleaned_ci = benchmark(lambda: CiClassifierService.clean_ci_unused_classifier(dict(large_ci), "form_type"))
+
+    assert cleaned_ci["form_type"] == large_ci["form_type"]
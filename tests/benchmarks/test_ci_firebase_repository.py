@@ -0,0 +1,60 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.repositories.buckets.bucket_loader import BucketLoader
+from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+from app.repositories.firebase.firebase_loader import FirebaseLoader
+
+
+class DocumentSnapshot:
+    def __init__(self, document: dict) -> None:
+        self._document = document
+
+    def to_dict(self) -> dict:
+        return self._document
+
+
+@pytest.fixture
+def repository_streaming(ci_metadata_documents):
+    """
+    A repository whose queries stream prebuilt document snapshots, so only the conversion loops are measured
+    and not the query evaluation of a fake firestore
+    """
+    snapshots = [DocumentSnapshot(document) for document in ci_metadata_documents]
+    collection = Mock()
+    query = collection.where.return_value
+    query.where.return_value = query
+    query.order_by.return_value.stream.side_effect = lambda: iter(snapshots)
+    collection.order_by.return_value.stream.side_effect = lambda: iter(snapshots)
+
+    firebase_loader = Mock(spec=FirebaseLoader)
+    firebase_loader.get_ci_collection.return_value = collection
+
+    return CiFirebaseRepository(Mock(spec=BucketLoader), firebase_loader)
+
+
+def test_get_all_ci_metadata_collection(benchmark, repository_streaming, ci_metadata_documents):
+    assert len(benchmark(repository_streaming.get_all_ci_metadata_collection)) == len(ci_metadata_documents)
+
+
+def test_get_ci_metadata_collection(benchmark, repository_streaming, ci_metadata_documents):
+    document = ci_metadata_documents[0]
+    ci_metadata_collection = benchmark(
+        repository_streaming.get_ci_metadata_collection,
+        document["survey_id"],
+        document["classifier_type"],
+        document["classifier_value"],
+        document["language"],
+    )
+
+    assert len(ci_metadata_collection) == len(ci_metadata_documents)
+
+
+def test_get_ci_metadata_collection_with_survey_id(benchmark, repository_streaming, ci_metadata_documents):
+    ci_metadata_collection = benchmark(
+        repository_streaming.get_ci_metadata_collection_with_survey_id, ci_metadata_documents[0]["survey_id"]
+    )
+
+    assert len(ci_metadata_collection) == len(ci_metadata_documents)
+
@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.ci_schema_codec_service import CI_SCHEMA_CODECS, CiSchemaCodecService, zstandard
+
+CODECS = [codec for codec in CI_SCHEMA_CODECS if codec != "zstd" or zstandard is not None]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_encode(benchmark, large_ci, codec):
+    """
+    `json-pretty` is the `json.dumps(indent=2)` done when storing a schema with the default codec
+    """
+    data, _ = benchmark(CiSchemaCodecService.encode, large_ci, codec, 6)
+
+    assert data
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_decode(benchmark, large_ci, codec):
+    data, _ = CiSchemaCodecService.encode(large_ci, codec, 6)
+
+    assert benchmark(CiSchemaCodecService.decode, data) == large_ci
@@ -0,0 +1,25 @@
+from app.models.requests import PostCiSchemaV1Data
+from app.models.responses import CiMetadata
+from tests.test_data.ci_test_data import mock_ci_metadata
+
+
+def test_ci_metadata_model_dump(benchmark):
+    assert benchmark(mock_ci_metadata.model_dump)["guid"] == mock_ci_metadata.guid
+
+
+def test_ci_metadata_validation(benchmark, ci_metadata_documents):
+    document = ci_metadata_documents[0]
+
+    assert benchmark(lambda: CiMetadata(**document)).guid == document["guid"]
+
+
+def test_post_ci_schema_validation_of_large_ci(benchmark, large_ci):
+    post_data = benchmark(PostCiSchemaV1Data.model_validate, large_ci)
+
+    assert len(post_data.sections) == len(large_ci["sections"])
+
+
+def test_post_ci_schema_model_dump_of_large_ci(benchmark, large_ci):
+    post_data = PostCiSchemaV1Data.model_validate(large_ci)
+
+    assert benchmark(post_data.model_dump)["sections"] == large_ci["sections"]
@@ -1,15 +1,21 @@
 from typing import TypedDict
 
 # External use endpoints
+GET_CI_CHANGES: str = "get_ci_changes"
+GET_CI_LATEST: str = "get_ci_latest"
 GET_CI_METADATA: str = "get_ci_metadata"
 GET_CI_SCHEMA: str = "get_ci_schema"
+GET_CI_SURVEY_SUMMARY: str = "get_ci_survey_summary"
 GET_CI_VALIDATOR_METADATA: str = "get_ci_validator_metadata"
 POST_CI: str = "post_ci"
+POST_CI_STREAM: str = "post_ci_stream"
 PUT_VALIDATOR_VERSION: str = "put_validator_version"
 
 # Internal use endpoints
 DELETE_CI: str = "delete_ci"
 GET_STATUS: str = "get_status"
+GET_READY: str = "get_ready"
+GET_METRICS: str = "get_metrics"
 
 
 class EndpointConfig(TypedDict):
@@ -22,6 +28,14 @@ ENDPOINTS: dict[str, EndpointConfig] = {
         "url": "/collection-instruments",
         "method": "DELETE",
     },
+    GET_CI_CHANGES: {
+        "url": "/collection-instruments/changes",
+        "method": "GET",
+    },
+    GET_CI_LATEST: {
+        "url": "/collection-instruments/latest",
+        "method": "GET",
+    },
     GET_CI_METADATA: {
         "url": "/collection-instruments/metadata",
         "method": "GET",
@@ -30,6 +44,10 @@ ENDPOINTS: dict[str, EndpointConfig] = {
         "url": "/collection-instruments/schema",
         "method": "GET",
     },
+    GET_CI_SURVEY_SUMMARY: {
+        "url": "/collection-instruments/summary",
+        "method": "GET",
+    },
     GET_CI_VALIDATOR_METADATA: {
         "url": "/collection-instruments/validator-metadata",
         "method": "GET",
@@ -38,6 +56,10 @@ ENDPOINTS: dict[str, EndpointConfig] = {
         "url": "/collection-instruments",
         "method": "POST",
     },
+    POST_CI_STREAM: {
+        "url": "/collection-instruments/stream",
+        "method": "POST",
+    },
     PUT_VALIDATOR_VERSION: {
         "url": "/collection-instruments/validator-version",
         "method": "PUT",
@@ -45,7 +67,15 @@ ENDPOINTS: dict[str, EndpointConfig] = {
     GET_STATUS: {
         "url": "/status",
         "method": "GET",
-    }
+    },
+    GET_READY: {
+        "url": "/ready",
+        "method": "GET",
+    },
+    GET_METRICS: {
+        "url": "/metrics",
+        "method": "GET",
+    },
 }
 
 ENDPOINTS_DEPRECATED: dict[str, EndpointConfig] = {
@@ -77,4 +107,12 @@ ENDPOINTS_DEPRECATED: dict[str, EndpointConfig] = {
         "url": "/collection-instruments",
         "method": "DELETE",
     },
+    GET_READY: {
+        "url": "/ready",
+        "method": "GET",
+    },
+    GET_METRICS: {
+        "url": "/metrics",
+        "method": "GET",
+    },
 }
@@ -0,0 +1,297 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.cache.ci_cache import CiCache
+from app.services.ci_processor_service import CiProcessorService
+from tests.test_data.ci_test_data import (
+    mock_ci_metadata,
+    mock_classifier_type,
+    mock_classifier_value,
+    mock_id,
+    mock_language,
+    mock_next_version_ci_metadata,
+    mock_next_version_id,
+    mock_survey_id,
+)
+
+
+class TestCiCache:
+    """Tests for the `CiCache` class"""
+
+    def test_get_metadata_returns_cached_metadata(self):
+        """
+        `get_metadata` should return a copy of metadata previously cached with `put_metadata`
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=10)
+
+        cache.put_metadata(mock_ci_metadata)
+        cached_metadata = cache.get_metadata(mock_id)
+
+        assert cached_metadata == mock_ci_metadata
+        assert cached_metadata is not mock_ci_metadata
+
+    def test_get_metadata_returns_none_if_disabled(self):
+        """
+        `get_metadata` should always return None if the cache is disabled
+        """
+        cache = CiCache(enabled=False, ttl_seconds=60, max_schemas=10)
+
+        cache.put_metadata(mock_ci_metadata)
+
+        assert cache.get_metadata(mock_id) is None
+
+    def test_get_metadata_returns_none_if_expired(self):
+        """
+        `get_metadata` should return None once the cached entry is older than `ttl_seconds`
+        """
+        cache = CiCache(enabled=True, ttl_seconds=-1, max_schemas=10)
+
+        cache.put_metadata(mock_ci_metadata)
+
+        assert cache.get_metadata(mock_id) is None
+
+    def test_put_schema_caches_gzipped_schema_with_schema(self):
+        """
+        The stored bytes of a gzipped schema should be cached with it, and only if they are given
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=10)
+
+        cache.put_schema("gzipped.json", {"title": "gzipped"}, b"gzipped bytes")
+        cache.put_schema("plain.json", {"title": "plain"})
+
+        assert cache.get_schema("gzipped.json") == {"title": "gzipped"}
+        assert cache.get_gzipped_schema("gzipped.json") == b"gzipped bytes"
+        assert cache.get_schema("plain.json") == {"title": "plain"}
+        assert cache.get_gzipped_schema("plain.json") is None
+
+    def test_put_schema_evicts_least_recently_used_schema(self):
+        """
+        `put_schema` should evict the least recently used schema once `max_schemas` is exceeded
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=2)
+
+        cache.put_schema("first.json", {"title": "first"})
+        cache.put_schema("second.json", {"title": "second"})
+        cache.get_schema("first.json")
+        cache.put_schema("third.json", {"title": "third"})
+
+        assert cache.get_schema("first.json") == {"title": "first"}
+        assert cache.get_schema("second.json") is None
+        assert cache.get_schema("third.json") == {"title": "third"}
+
+    def test_invalidate_metadata_removes_latest_entry_for_same_ci(self):
+        """
+        `invalidate_metadata` should remove both the guid entry and the latest version entry of the CI
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=10)
+        cache.put_metadata(mock_ci_metadata)
+        cache.put_latest(mock_ci_metadata)
+
+        cache.invalidate_metadata(mock_ci_metadata)
+
+        assert cache.get_metadata(mock_id) is None
+        assert cache.get_latest(mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language) is None
+
+    def test_invalidate_latest_removes_latest_entry_for_any_ci(self):
+        """
+        `invalidate_latest` should remove the latest version entry even if it refers to another CI, leaving the
+        guid entry in place
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=10)
+        cache.put_metadata(mock_ci_metadata)
+        cache.put_latest(mock_ci_metadata)
+
+        cache.invalidate_latest(mock_next_version_ci_metadata)
+
+        assert cache.get_metadata(mock_id) == mock_ci_metadata
+        assert cache.get_latest(mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language) is None
+
+    def test_clear_marks_cache_as_cold(self):
+        """
+        `clear` should remove all entries and reset the `warm` flag
+        """
+        cache = CiCache(enabled=True, ttl_seconds=60, max_schemas=10)
+        cache.put_schema("first.json", {"title": "first"})
+        cache.warm = True
+
+        cache.clear()
+
+        assert cache.get_schema("first.json") is None
+        assert not cache.warm
+
+
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_ci_schema")
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_all_ci_metadata_collection")
+class TestPrewarmCache:
+    """Tests for pre-warming the CI cache at startup"""
+
+    def test_prewarm_cache_loads_latest_metadata_and_schemas(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+        bucket_mock,
+        firestore_mock,
+        pubsub_mock,
+    ):
+        """
+        `prewarm_cache` should cache only the latest version of each CI and retrieve the requested number
+        of schemas, then mark the cache as warm
+        """
+        mocked_get_all_ci_metadata_collection.return_value = [mock_next_version_ci_metadata, mock_ci_metadata]
+        mocked_retrieve_ci_schema.return_value = {"title": "schema"}
+        ci_processor_service = CiProcessorService(bucket_loader=bucket_mock, firebase_loader=firestore_mock, publisher=pubsub_mock)
+
+        ci_processor_service.prewarm_cache(schema_count=1)
+
+        assert enabled_ci_cache.warm
+        assert enabled_ci_cache.get_metadata(mock_next_version_id) == mock_next_version_ci_metadata
+        assert enabled_ci_cache.get_metadata(mock_id) is None
+        assert (
+            enabled_ci_cache.get_latest(mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language)
+            == mock_next_version_ci_metadata
+        )
+        assert enabled_ci_cache.get_schema(f"{mock_next_version_id}.json") == {"title": "schema"}
+        mocked_retrieve_ci_schema.assert_called_once_with(f"{mock_next_version_id}.json")
+
+    def test_get_ci_schema_is_served_from_cache(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+        bucket_mock,
+        firestore_mock,
+        pubsub_mock,
+    ):
+        """
+        `get_ci_schema` should only retrieve a schema from the bucket the first time it is requested
+        """
+        mocked_retrieve_ci_schema.return_value = {"title": "schema"}
+        ci_processor_service = CiProcessorService(bucket_loader=bucket_mock, firebase_loader=firestore_mock, publisher=pubsub_mock)
+
+        ci_processor_service.get_ci_schema(f"{mock_id}.json")
+        ci_schema = ci_processor_service.get_ci_schema(f"{mock_id}.json")
+
+        assert ci_schema == {"title": "schema"}
+        mocked_retrieve_ci_schema.assert_called_once_with(f"{mock_id}.json")
+
+    def test_startup_prewarms_cache_when_enabled(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+        test_client,
+    ):
+        """
+        Starting the application should pre-warm the cache before requests are served if
+        `CI_CACHE_PREWARM_ENABLED` is set
+        """
+        with (
+            patch("app.main.settings.CI_CACHE_PREWARM_ENABLED", True),
+            patch("app.main.prewarm_ci_cache") as mocked_prewarm_ci_cache,
+            TestClient(test_client.app),
+        ):
+            mocked_prewarm_ci_cache.assert_called_once()
+
+    def test_startup_skips_prewarm_when_disabled(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+        test_client,
+    ):
+        """
+        Starting the application should not touch the cache if `CI_CACHE_PREWARM_ENABLED` is not set
+        """
+        with patch("app.main.prewarm_ci_cache") as mocked_prewarm_ci_cache, TestClient(test_client.app):
+            mocked_prewarm_ci_cache.assert_not_called()
+
+    def test_prewarm_failure_leaves_cache_cold(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+    ):
+        """
+        A failure while pre-warming should be logged rather than stopping the worker from starting
+        """
+        from app.main import prewarm_ci_cache
+
+        with patch("app.main.get_ci_processor_service", side_effect=RuntimeError("Firestore unavailable")), \
+                patch("app.main.get_bucket_loader"), patch("app.main.get_firebase_loader"), \
+                patch("app.main.get_publisher_service"):
+            assert prewarm_ci_cache() is False
+
+        assert not enabled_ci_cache.warm
+
+    def test_startup_retries_prewarm_in_background_if_it_fails(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+        test_client,
+    ):
+        """
+        A failed pre-warm should be retried in the background, rather than leaving the cache cold for good
+        """
+        with (
+            patch("app.main.settings.CI_CACHE_PREWARM_ENABLED", True),
+            patch("app.main.prewarm_ci_cache", return_value=False),
+            patch("app.main.retry_prewarm_ci_cache", new_callable=AsyncMock) as mocked_retry_prewarm_ci_cache,
+            TestClient(test_client.app),
+        ):
+            mocked_retry_prewarm_ci_cache.assert_called_once()
+
+    def test_retry_prewarm_backs_off_until_prewarm_succeeds(
+        self,
+        mocked_get_all_ci_metadata_collection,
+        mocked_retrieve_ci_schema,
+        enabled_ci_cache,
+    ):
+        """
+        Pre-warming should be retried after a delay doubled after each failure, up to the maximum delay, and
+        stop once it succeeds
+        """
+        from app.main import retry_prewarm_ci_cache
+
+        with (
+            patch("app.main.settings.CI_CACHE_PREWARM_RETRY_SECONDS", 1),
+            patch("app.main.settings.CI_CACHE_PREWARM_RETRY_MAX_SECONDS", 3),
+            patch("app.main.prewarm_ci_cache", side_effect=[False, False, False, True]) as mocked_prewarm_ci_cache,
+            patch("app.main.asyncio.sleep", new_callable=AsyncMock) as mocked_sleep,
+        ):
+            asyncio.run(retry_prewarm_ci_cache())
+
+        assert mocked_prewarm_ci_cache.call_count == 4
+        assert [call.args[0] for call in mocked_sleep.call_args_list] == [1, 2, 3, 3]
+
+    def test_startup_subscribes_to_ci_events_when_enabled(self, mocked_get_all_ci_metadata_collection,
+                                                            mocked_retrieve_ci_schema, enabled_ci_cache, test_client):
+        """
+        Starting the application should subscribe to CI events if `CI_CACHE_INVALIDATION_ENABLED` is set, and
+        stopping it should remove the subscription
+        """
+        with (
+            patch("app.main.settings.CI_CACHE_INVALIDATION_ENABLED", True),
+            patch("app.main.get_ci_event_subscriber") as mocked_get_ci_event_subscriber,
+        ):
+            with TestClient(test_client.app):
+                mocked_get_ci_event_subscriber.return_value.start.assert_called_once()
+                mocked_get_ci_event_subscriber.return_value.stop.assert_not_called()
+            mocked_get_ci_event_subscriber.return_value.stop.assert_called_once()
+
+    def test_startup_continues_if_subscribing_fails(self, mocked_get_all_ci_metadata_collection,
+                                                     mocked_retrieve_ci_schema, enabled_ci_cache, test_client):
+        """
+        A failure to subscribe should be logged rather than stopping the worker from starting
+        """
+        with (
+            patch("app.main.settings.CI_CACHE_INVALIDATION_ENABLED", True),
+            patch("app.main.get_ci_event_subscriber") as mocked_get_ci_event_subscriber,
+        ):
+            mocked_get_ci_event_subscriber.return_value.start.side_effect = RuntimeError("Pub/Sub unavailable")
+            with TestClient(test_client.app) as client:
+                assert client.get("/status").status_code == 200
+            mocked_get_ci_event_subscriber.return_value.stop.assert_not_called()
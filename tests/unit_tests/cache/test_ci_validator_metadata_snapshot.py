@@ -0,0 +1,80 @@
+import threading
+from unittest.mock import Mock
+
+from app.cache.ci_validator_metadata_snapshot import CiValidatorMetadataSnapshotCache, ValidatorMetadataSnapshot
+
+
+def snapshot_builder(*row_counts: int) -> Mock:
+    return Mock(side_effect=[ValidatorMetadataSnapshot(b"[]", row_count) for row_count in row_counts])
+
+
+class TestCiValidatorMetadataSnapshotCache:
+    """Tests for the `CiValidatorMetadataSnapshotCache` class"""
+
+    def test_get_builds_snapshot_once(self):
+        """
+        `get` should build the snapshot on the first call and serve it from memory afterwards
+        """
+        cache = CiValidatorMetadataSnapshotCache(enabled=True, refresh_seconds=60)
+        build = snapshot_builder(1)
+
+        first_snapshot = cache.get(build)
+        second_snapshot = cache.get(build)
+
+        assert second_snapshot is first_snapshot
+        build.assert_called_once()
+
+    def test_get_always_builds_snapshot_if_disabled(self):
+        cache = CiValidatorMetadataSnapshotCache(enabled=False, refresh_seconds=60)
+        build = snapshot_builder(1, 2)
+
+        cache.get(build)
+
+        assert cache.get(build).row_count == 2
+
+    def test_invalidate_drops_snapshot(self):
+        """
+        The first `get` after `invalidate` should wait for a new snapshot
+        """
+        cache = CiValidatorMetadataSnapshotCache(enabled=True, refresh_seconds=60)
+        build = snapshot_builder(1, 2)
+        cache.get(build)
+
+        cache.invalidate()
+
+        assert cache.get(build).row_count == 2
+
+    def test_get_serves_stale_snapshot_while_rebuilding_in_background(self):
+        """
+        A snapshot older than `refresh_seconds` should still be served, and replaced once rebuilt
+        """
+        cache = CiValidatorMetadataSnapshotCache(enabled=True, refresh_seconds=0)
+        rebuilt = threading.Event()
+        stale_snapshot = ValidatorMetadataSnapshot(b"[]", 1)
+        fresh_snapshot = ValidatorMetadataSnapshot(b"[]", 2)
+
+        def rebuild():
+            rebuilt.set()
+            return fresh_snapshot
+
+        cache.get(Mock(return_value=stale_snapshot))
+        assert cache.get(rebuild) is stale_snapshot
+
+        assert rebuilt.wait(timeout=5)
+        cache._build_lock.acquire(timeout=5)
+        cache._build_lock.release()
+        cache.refresh_seconds = 60
+        assert cache.get(Mock()) is fresh_snapshot
+
+    def test_snapshot_built_before_invalidation_is_not_kept(self):
+        """
+        A snapshot read before a CI changed should be returned to the request that built it, but not kept
+        """
+        cache = CiValidatorMetadataSnapshotCache(enabled=True, refresh_seconds=60)
+
+        def build_during_change():
+            cache.invalidate()
+            return ValidatorMetadataSnapshot(b"[]", 1)
+
+        assert cache.get(build_during_change).row_count == 1
+        assert cache.get(snapshot_builder(2)).row_count == 2
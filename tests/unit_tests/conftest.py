@@ -5,16 +5,22 @@ import pytest
 from google.cloud.firestore import Transaction
 from mockfirestore import MockFirestore
 from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
+from app.cache.ci_cache import ci_cache
+from app.cache.ci_validator_metadata_snapshot import ci_validator_metadata_snapshot
 from app.config import Settings, logging
 from app.dependencies import get_bucket_loader, get_publisher_service, get_firebase_loader
 from app.events.publisher import Publisher
 from app.repositories.buckets.bucket_loader import BucketLoader
 from app.repositories.firebase.firebase_loader import FirebaseLoader
+from app.telemetry.tracing import configure_tracing
 
 logger = logging.getLogger(__name__)
 mock_publish_date = datetime.datetime(2023, 4, 20, 12, 0, 0, 0)
 settings = Settings()
+in_memory_span_exporter = InMemorySpanExporter()
 
 
 @pytest.fixture(autouse=True)
@@ -28,10 +34,34 @@ def mock_datetime(request, mocker):
         )
 
 
+@pytest.fixture(autouse=True)
+def clear_ci_cache():
+    """
+    The CI cache and validator metadata snapshot are shared across the worker, so they are emptied after every
+    test to stop cached metadata or schemas leaking between tests
+    """
+    yield ci_cache
+
+    ci_cache.clear()
+    ci_validator_metadata_snapshot.invalidate()
+
+
+@pytest.fixture
+def enabled_ci_cache(mocker):
+    """
+    Enables the CI cache, which is disabled by default, for the duration of a test
+    """
+    mocker.patch.object(ci_cache, "enabled", True)
+
+    yield ci_cache
+
+
 @pytest.fixture(autouse=True)
 def bucket_mock(test_client):
     app = test_client.app
     mock_bucket_loader = Mock(spec=BucketLoader)
+    # The bucket has no split schemas unless a test adds them
+    mock_bucket_loader.get_ci_schema_bucket.return_value.list_blobs.return_value = []
     app.dependency_overrides[get_bucket_loader] = lambda: mock_bucket_loader
 
     yield mock_bucket_loader
@@ -62,6 +92,7 @@ def transaction_mock(firestore_mock):
     mock_transaction._max_attempts = 1
     mock_transaction._id = None
     firestore_mock.set_transaction.return_value = mock_transaction
+    firestore_mock.set_read_only_transaction.return_value = mock_transaction
 
     yield mock_transaction
 
@@ -75,6 +106,42 @@ def mock_firestore_collection(firestore_mock):
     yield collection
 
 
+@pytest.fixture(autouse=True)
+def mock_firestore_tombstone_collection(firestore_mock):
+    collection = firestore_mock.client.collection(settings.CI_TOMBSTONE_FIRESTORE_COLLECTION_NAME)
+    firestore_mock.ci_tombstone_collection = collection
+    firestore_mock.get_ci_tombstone_collection.return_value = collection
+
+    yield collection
+
+
+@pytest.fixture(autouse=True)
+def mock_firestore_change_sequence_collection(firestore_mock):
+    collection = firestore_mock.client.collection(settings.CI_CHANGE_SEQUENCE_FIRESTORE_COLLECTION_NAME)
+    firestore_mock.ci_change_sequence_collection = collection
+    firestore_mock.get_ci_change_sequence_collection.return_value = collection
+
+    yield collection
+
+
+@pytest.fixture(autouse=True)
+def mock_firestore_latest_collection(firestore_mock):
+    collection = firestore_mock.client.collection(settings.CI_LATEST_FIRESTORE_COLLECTION_NAME)
+    firestore_mock.ci_latest_collection = collection
+    firestore_mock.get_ci_latest_collection.return_value = collection
+
+    yield collection
+
+
+@pytest.fixture(autouse=True)
+def mock_firestore_survey_summary_collection(firestore_mock):
+    collection = firestore_mock.client.collection(settings.CI_SURVEY_SUMMARY_FIRESTORE_COLLECTION_NAME)
+    firestore_mock.ci_survey_summary_collection = collection
+    firestore_mock.get_ci_survey_summary_collection.return_value = collection
+
+    yield collection
+
+
 @pytest.fixture(autouse=True)
 def pubsub_mock(test_client):
     """
@@ -108,3 +175,24 @@ def test_client_no_server_exception():
 
     client = TestClient(app, raise_server_exceptions=False)
     yield client
+
+
+@pytest.fixture(scope="session")
+def tracer_provider():
+    """
+    The global tracer provider can only be set once per process, so spans from every test after
+    this fixture is first used are exported to the same in-memory exporter
+    """
+    configure_tracing(SimpleSpanProcessor(in_memory_span_exporter))
+
+
+@pytest.fixture
+def span_exporter(tracer_provider):
+    """
+    Provides the in-memory exporter holding only the spans finished during the test
+    """
+    in_memory_span_exporter.clear()
+
+    yield in_memory_span_exporter
+
+    in_memory_span_exporter.clear()
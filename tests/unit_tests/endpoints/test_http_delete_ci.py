@@ -3,6 +3,7 @@ from urllib.parse import urlencode
 
 from fastapi import status
 
+from app.events.ci_events import CiEventType
 from app.models.requests import DeleteCiV1Params
 from tests.test_config.endpoints import ENDPOINTS, DELETE_CI
 from tests.test_config.endpoints_loader import EndpointsLoader
@@ -41,6 +42,28 @@ class TestHttpDeleteCi:
         mocked_get_ci_metadata_collection_with_survey_id.assert_called_once_with(mock_survey_id)
         mocked_perform_delete_ci_transaction.assert_called_once_with([mock_ci_metadata])
 
+    def test_endpoint_publishes_delete_event_if_cache_invalidation_enabled(
+        self,
+        mocked_perform_delete_ci_transaction,
+        mocked_get_ci_metadata_collection_with_survey_id,
+        test_client,
+        pubsub_mock,
+    ):
+        """
+        A deleted CI should be published to the topic so other instances drop it from their caches, but only
+        when `CI_CACHE_INVALIDATION_ENABLED` is set
+        """
+        mocked_get_ci_metadata_collection_with_survey_id.return_value = [mock_ci_metadata]
+
+        test_client.delete(self.url)
+        pubsub_mock.publish_messages.assert_not_called()
+
+        with patch("app.services.ci_processor_service.settings.CI_CACHE_INVALIDATION_ENABLED", True):
+            response = test_client.delete(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        pubsub_mock.publish_messages.assert_called_once_with([mock_ci_metadata], CiEventType.DELETED)
+
     def test_endpoint_returns_400_if_query_parameters_are_not_present(
         self,
         mocked_perform_delete_ci_transaction,
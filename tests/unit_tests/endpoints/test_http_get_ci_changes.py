@@ -0,0 +1,182 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+
+from app.repositories.firebase.ci_firebase_repository import CHANGE_SEQUENCE_DOCUMENT_ID, CiFirebaseRepository
+from app.services.change_token_service import ChangeTokenService
+from tests.test_config.endpoints import ENDPOINTS, GET_CI_CHANGES
+from tests.test_data.ci_test_data import mock_ci_metadata, mock_next_version_ci_metadata
+
+URL = ENDPOINTS[GET_CI_CHANGES]["url"]
+
+DELETED_AT = "2023-04-20T12:05:00.000000Z"
+UPDATED_AT = "2023-04-20T12:10:00.000000Z"
+
+
+def change_document(ci_metadata, event_type: str, updated_at: str, change_position: int) -> dict:
+    return {
+        **ci_metadata.model_dump(),
+        "event_type": event_type,
+        "updated_at": updated_at,
+        "change_position": change_position,
+    }
+
+
+class TestHttpGetCiChanges:
+    """Tests for the `get_collection_instrument_changes` endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def change_sequence(self, transaction_mock, mock_firestore_change_sequence_collection):
+        """
+        Changes are read in a read-only transaction, up to the last position reserved in the sequence document
+        """
+        yield mock_firestore_change_sequence_collection
+
+    def seed_changes(self, change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection):
+        change_sequence.document(CHANGE_SEQUENCE_DOCUMENT_ID).set({"last_position": 2})
+        mock_firestore_collection.document(mock_next_version_ci_metadata.guid).set(
+            change_document(mock_next_version_ci_metadata, "ci_updated", UPDATED_AT, 2)
+        )
+        mock_firestore_tombstone_collection.document(mock_ci_metadata.guid).set(
+            change_document(mock_ci_metadata, "ci_deleted", DELETED_AT, 1)
+        )
+
+    def test_endpoint_returns_changes_from_metadata_and_tombstones_in_order(
+        self, test_client, change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection
+    ):
+        """
+        Changes to existing and deleted CIs should be returned together, oldest first
+        """
+        self.seed_changes(change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection)
+
+        response = test_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "changes": [
+                {"event_type": "ci_deleted", "updated_at": DELETED_AT, "ci_metadata": mock_ci_metadata.model_dump()},
+                {
+                    "event_type": "ci_updated",
+                    "updated_at": UPDATED_AT,
+                    "ci_metadata": mock_next_version_ci_metadata.model_dump(),
+                },
+            ],
+            "next_token": ChangeTokenService.encode(2),
+            "has_more": False,
+        }
+
+    def test_endpoint_pages_changes_with_next_token(
+        self, test_client, change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection
+    ):
+        """
+        Passing `next_token` as `since` should return the changes after the previous page, and leave the token
+        unchanged once there are no new changes
+        """
+        self.seed_changes(change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection)
+
+        first_page = test_client.get(URL, params={"limit": 1}).json()
+        second_page = test_client.get(URL, params={"limit": 1, "since": first_page["next_token"]}).json()
+        last_page = test_client.get(URL, params={"limit": 1, "since": second_page["next_token"]}).json()
+
+        assert [change["event_type"] for change in first_page["changes"]] == ["ci_deleted"]
+        assert first_page["has_more"]
+        assert [change["event_type"] for change in second_page["changes"]] == ["ci_updated"]
+        assert not second_page["has_more"]
+        assert last_page == {"changes": [], "next_token": second_page["next_token"], "has_more": False}
+
+    def test_endpoint_returns_change_committed_after_page_with_earlier_updated_at(
+        self, mocker, test_client, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        A change committed after a page was read should be on the next page, even if the clock of the instance
+        that made it was behind the clock of the instance that made the changes on the previous page
+        """
+        # The transaction mock only records writes, so they are applied to the mock collections here
+        transaction_mock.update.side_effect = lambda reference, data: reference.update(data)
+        transaction_mock.set.side_effect = lambda reference, data: reference.set(data)
+        current_date_and_time = mocker.patch(
+            "app.services.datetime_service.DatetimeService.get_current_date_and_time"
+        )
+        ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+
+        mock_firestore_collection.document(mock_next_version_ci_metadata.guid).set(
+            mock_next_version_ci_metadata.model_dump()
+        )
+        current_date_and_time.return_value = datetime(2023, 4, 20, 12, 10)
+        ci_firebase_repository.update_ci_metadata(mock_next_version_ci_metadata.guid, mock_next_version_ci_metadata)
+        first_page = test_client.get(URL).json()
+        mock_firestore_collection.document(mock_ci_metadata.guid).set(mock_ci_metadata.model_dump())
+        current_date_and_time.return_value = datetime(2023, 4, 20, 12, 5)
+        ci_firebase_repository.update_ci_metadata(mock_ci_metadata.guid, mock_ci_metadata)
+        second_page = test_client.get(URL, params={"since": first_page["next_token"]}).json()
+
+        assert [change["ci_metadata"]["guid"] for change in first_page["changes"]] == [mock_next_version_ci_metadata.guid]
+        assert second_page["changes"] == [
+            {
+                "event_type": "ci_updated",
+                "updated_at": "2023-04-20T12:05:00.000000Z",
+                "ci_metadata": mock_ci_metadata.model_dump(),
+            }
+        ]
+
+    def test_endpoint_leaves_changes_committed_while_page_is_read_to_next_page(
+        self, mocker, test_client, change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection
+    ):
+        """
+        A create and a later delete committed between reading the metadata and the tombstones should both be
+        left to the next page, rather than the delete being returned and the create skipped
+        """
+        self.seed_changes(change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection)
+        created_ci_metadata = mock_ci_metadata.model_copy(update={"guid": "created-guid"})
+        get_changes_in_collection = CiFirebaseRepository._get_changes_in_collection
+
+        def get_changes_and_commit(transaction, collection, since, until, limit):
+            changes = get_changes_in_collection(transaction, collection, since, until, limit)
+            if collection is mock_firestore_collection and not mock_firestore_tombstone_collection.document(
+                mock_next_version_ci_metadata.guid
+            ).get().exists:
+                mock_firestore_collection.document(created_ci_metadata.guid).set(
+                    change_document(created_ci_metadata, "ci_created", UPDATED_AT, 3)
+                )
+                mock_firestore_collection.document(mock_next_version_ci_metadata.guid).delete()
+                mock_firestore_tombstone_collection.document(mock_next_version_ci_metadata.guid).set(
+                    change_document(mock_next_version_ci_metadata, "ci_deleted", UPDATED_AT, 4)
+                )
+                change_sequence.document(CHANGE_SEQUENCE_DOCUMENT_ID).set({"last_position": 4})
+            return changes
+
+        mocker.patch.object(CiFirebaseRepository, "_get_changes_in_collection", side_effect=get_changes_and_commit)
+
+        first_page = test_client.get(URL).json()
+        second_page = test_client.get(URL, params={"since": first_page["next_token"]}).json()
+
+        assert [change["event_type"] for change in first_page["changes"]] == ["ci_deleted", "ci_updated"]
+        assert first_page["next_token"] == ChangeTokenService.encode(2)
+        assert [(change["event_type"], change["ci_metadata"]["guid"]) for change in second_page["changes"]] == [
+            ("ci_created", created_ci_metadata.guid),
+            ("ci_deleted", mock_next_version_ci_metadata.guid),
+        ]
+
+    def test_endpoint_caps_limit_at_page_size(
+        self, test_client, change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection
+    ):
+        self.seed_changes(change_sequence, mock_firestore_collection, mock_firestore_tombstone_collection)
+
+        with patch("app.routers.ci_router_restful.settings.CI_CHANGES_PAGE_SIZE", 1):
+            response = test_client.get(URL, params={"limit": 100})
+
+        assert len(response.json()["changes"]) == 1
+        assert response.json()["has_more"]
+
+    def test_endpoint_returns_400_if_token_is_invalid(self, test_client):
+        response = test_client.get(URL, params={"since": "not a token"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["message"] == "Validation has failed"
+
+    def test_endpoint_returns_400_if_limit_is_not_positive(self, test_client):
+        response = test_client.get(URL, params={"limit": 0})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
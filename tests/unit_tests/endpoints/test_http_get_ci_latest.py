@@ -0,0 +1,107 @@
+from fastapi import status
+
+from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+from tests.test_config.endpoints import ENDPOINTS, GET_CI_LATEST, PUT_VALIDATOR_VERSION
+from tests.test_data.ci_test_data import (
+    mock_ci_metadata,
+    mock_ci_metadata_v2,
+    mock_classifier_type,
+    mock_classifier_value,
+    mock_language,
+    mock_next_version_ci_metadata,
+    mock_post_ci_schema,
+    mock_survey_id,
+    mock_updated_ci_metadata_v2,
+    mock_updated_validator_version_v2,
+)
+
+URL = ENDPOINTS[GET_CI_LATEST]["url"]
+
+mock_other_survey_ci_metadata = mock_ci_metadata.model_copy(update={"survey_id": "other_survey_id", "guid": "other"})
+
+
+def set_latest(mock_firestore_latest_collection, ci_metadata) -> None:
+    latest_document_id = CiFirebaseRepository.latest_document_id(
+        ci_metadata.survey_id, ci_metadata.classifier_type, ci_metadata.classifier_value, ci_metadata.language
+    )
+    mock_firestore_latest_collection.document(latest_document_id).set(ci_metadata.model_dump())
+
+
+class TestHttpGetCiLatest:
+    """Tests for the `get_latest_collection_instruments_metadata` endpoint"""
+
+    def test_endpoint_returns_latest_version_of_ci(self, test_client, mock_firestore_latest_collection):
+        set_latest(mock_firestore_latest_collection, mock_next_version_ci_metadata)
+
+        response = test_client.get(
+            URL,
+            params={
+                "survey_id": mock_survey_id,
+                "classifier_type": mock_classifier_type,
+                "classifier_value": mock_classifier_value,
+                "language": mock_language,
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [mock_next_version_ci_metadata.model_dump()]
+
+    def test_endpoint_returns_latest_version_of_each_ci_of_survey(self, test_client, mock_firestore_latest_collection):
+        set_latest(mock_firestore_latest_collection, mock_next_version_ci_metadata)
+        set_latest(mock_firestore_latest_collection, mock_other_survey_ci_metadata)
+
+        response = test_client.get(URL, params={"survey_id": mock_survey_id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [mock_next_version_ci_metadata.model_dump()]
+
+    def test_endpoint_returns_latest_version_of_every_ci(self, test_client, mock_firestore_latest_collection):
+        set_latest(mock_firestore_latest_collection, mock_next_version_ci_metadata)
+        set_latest(mock_firestore_latest_collection, mock_other_survey_ci_metadata)
+
+        response = test_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(ci_metadata["guid"] for ci_metadata in response.json()) == sorted(
+            (mock_next_version_ci_metadata.guid, mock_other_survey_ci_metadata.guid)
+        )
+
+    def test_endpoint_returns_latest_version_of_ci_after_validator_version_is_updated(
+        self, test_client, mock_firestore_collection, mock_firestore_latest_collection, transaction_mock
+    ):
+        mock_firestore_collection.document(mock_ci_metadata_v2.guid).set(mock_ci_metadata_v2.model_dump())
+        set_latest(mock_firestore_latest_collection, mock_ci_metadata_v2)
+        # The transaction mock only records writes, so they are applied to the mock collections here
+        transaction_mock.update.side_effect = lambda reference, data: reference.update(data)
+        transaction_mock.set.side_effect = lambda reference, data, merge=False: None if merge else reference.set(data)
+
+        put_response = test_client.put(
+            ENDPOINTS[PUT_VALIDATOR_VERSION]["url"],
+            params={"guid": mock_ci_metadata_v2.guid, "validator_version": mock_updated_validator_version_v2},
+            json=mock_post_ci_schema.model_dump(),
+        )
+        response = test_client.get(
+            URL,
+            params={
+                "survey_id": mock_survey_id,
+                "classifier_type": mock_classifier_type,
+                "classifier_value": mock_classifier_value,
+                "language": mock_language,
+            },
+        )
+
+        assert put_response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [mock_updated_ci_metadata_v2.model_dump()]
+
+    def test_endpoint_returns_400_if_only_some_classifiers_are_provided(self, test_client):
+        response = test_client.get(URL, params={"survey_id": mock_survey_id, "language": mock_language})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["message"] == "Invalid search parameters provided"
+
+    def test_endpoint_returns_404_if_no_ci_found(self, test_client):
+        response = test_client.get(URL, params={"survey_id": mock_survey_id})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["message"] == "No CI found"
@@ -1,3 +1,5 @@
+import gzip
+import json
 from unittest.mock import patch
 from urllib.parse import urlencode
 
@@ -76,3 +78,275 @@ class TestHttpGetCiSchemaV2:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.json()["message"] == "Invalid search parameters provided"
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_raw_ci_schema")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_ci_schema")
+@patch("app.routers.ci_router_restful.settings.CI_SCHEMA_STORAGE_CODEC", "gzip")
+class TestHttpGetCiSchemaGzipPassthrough:
+    """Tests for sending gzipped schemas as stored from the `get_collection_instrument_schema_by_guid` endpoint"""
+
+    url = f"{ENDPOINTS[GET_CI_SCHEMA]['url']}?{urlencode({'guid': mock_id})}"
+    gzipped_schema = gzip.compress(json.dumps(mock_ci_metadata.model_dump()).encode("utf-8"))
+
+    def test_endpoint_sends_stored_gzip_to_gzip_clients(
+        self, mocked_retrieve_ci_schema, mocked_retrieve_raw_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        Clients accepting gzip should be sent the stored bytes with `Content-Encoding: gzip`
+        without the schema being decoded
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_raw_ci_schema.return_value = self.gzipped_schema
+
+        response = test_client.get(self.url, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == mock_ci_metadata.model_dump()
+        mocked_retrieve_raw_ci_schema.assert_called_once_with(f"{mock_id}.json")
+        mocked_retrieve_ci_schema.assert_not_called()
+
+    def test_endpoint_decodes_schema_for_other_clients(
+        self, mocked_retrieve_ci_schema, mocked_retrieve_raw_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        Clients that do not accept gzip should be sent the decoded schema
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = mock_ci_metadata.model_dump()
+
+        response = test_client.get(self.url, headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+        assert response.json() == mock_ci_metadata.model_dump()
+        mocked_retrieve_raw_ci_schema.assert_not_called()
+
+    def test_endpoint_decodes_schema_not_stored_gzipped(
+        self, mocked_retrieve_ci_schema, mocked_retrieve_raw_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        Schemas stored before gzip was enabled should be decoded even for gzip clients, from the bytes already
+        downloaded
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_raw_ci_schema.return_value = json.dumps(mock_ci_metadata.model_dump()).encode("utf-8")
+
+        response = test_client.get(self.url, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+        assert response.json() == mock_ci_metadata.model_dump()
+        mocked_retrieve_raw_ci_schema.assert_called_once_with(f"{mock_id}.json")
+        mocked_retrieve_ci_schema.assert_not_called()
+
+    def test_endpoint_sends_cached_stored_gzip_to_gzip_clients(
+        self,
+        mocked_retrieve_ci_schema,
+        mocked_retrieve_raw_ci_schema,
+        mocked_get_ci_metadata_with_id,
+        enabled_ci_cache,
+        test_client,
+    ):
+        """
+        A cached gzipped schema should be sent as stored, without being downloaded or compressed again
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_raw_ci_schema.return_value = self.gzipped_schema
+
+        test_client.get(self.url, headers={"Accept-Encoding": "gzip"})
+        response = test_client.get(self.url, headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == mock_ci_metadata.model_dump()
+        mocked_retrieve_raw_ci_schema.assert_called_once_with(f"{mock_id}.json")
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_ci_schema")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.generate_ci_schema_signed_url")
+class TestHttpGetCiSchemaSignedUrlRedirect:
+    """Tests for redirecting to signed schema urls from the `get_collection_instrument_schema_by_guid` endpoint"""
+
+    url = f"{ENDPOINTS[GET_CI_SCHEMA]['url']}?{urlencode({'guid': mock_id, 'redirect': 'true'})}"
+    signed_url = f"https://storage.googleapis.com/ci-bucket/{mock_id}.json?X-Goog-Signature=signature"
+
+    def test_endpoint_redirects_to_signed_url(
+        self, mocked_generate_signed_url, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        With signed urls enabled the schema should be downloaded from the bucket rather than through the API
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_generate_signed_url.return_value = self.signed_url
+
+        with patch("app.routers.ci_router_restful.settings.CI_SCHEMA_SIGNED_URL_ENABLED", True):
+            response = test_client.get(self.url, follow_redirects=False)
+
+        assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+        assert response.headers["location"] == self.signed_url
+        assert response.headers["cache-control"] == "no-store"
+        mocked_generate_signed_url.assert_called_once_with(f"{mock_id}.json")
+        mocked_retrieve_ci_schema.assert_not_called()
+
+    def test_endpoint_returns_schema_if_signed_urls_disabled(
+        self, mocked_generate_signed_url, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = mock_ci_metadata.model_dump()
+
+        response = test_client.get(self.url, follow_redirects=False)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == mock_ci_metadata.model_dump()
+        mocked_generate_signed_url.assert_not_called()
+
+    def test_endpoint_returns_404_instead_of_redirect_if_metadata_not_found(
+        self, mocked_generate_signed_url, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = None
+
+        with patch("app.routers.ci_router_restful.settings.CI_SCHEMA_SIGNED_URL_ENABLED", True):
+            response = test_client.get(self.url, follow_redirects=False)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        mocked_generate_signed_url.assert_not_called()
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_ci_schema")
+class TestHttpGetCiSchemaFields:
+    """Tests for getting parts of a schema by JSON Pointer from the `get_collection_instrument_schema_by_guid` endpoint"""
+
+    url = ENDPOINTS[GET_CI_SCHEMA]["url"]
+    ci_schema = {
+        "survey_id": "123",
+        "metadata": [{"name": "user_id", "type": "string"}],
+        "sections": [{"id": "section-1", "groups": [{"id": "group-1"}]}],
+        "a/b": {"c~d": "escaped"},
+    }
+
+    def test_endpoint_returns_requested_fields(self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client):
+        """
+        Each requested JSON Pointer should be mapped to the part of the schema it refers to
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = self.ci_schema
+
+        response = test_client.get(
+            self.url, params={"guid": mock_id, "fields": ["/metadata", "/sections/0/groups", "/a~1b/c~0d"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "/metadata": [{"name": "user_id", "type": "string"}],
+            "/sections/0/groups": [{"id": "group-1"}],
+            "/a~1b/c~0d": "escaped",
+        }
+
+    def test_endpoint_returns_fields_instead_of_stored_gzip(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = self.ci_schema
+
+        with (
+            patch("app.routers.ci_router_restful.settings.CI_SCHEMA_STORAGE_CODEC", "gzip"),
+            patch("app.services.ci_processor_service.CiProcessorService.get_gzipped_ci_schema") as mocked_gzipped,
+        ):
+            response = test_client.get(
+                self.url, params={"guid": mock_id, "fields": "/survey_id"}, headers={"Accept-Encoding": "gzip"}
+            )
+
+        assert response.json() == {"/survey_id": "123"}
+        mocked_gzipped.assert_not_called()
+
+    def test_endpoint_returns_404_if_field_not_found(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = self.ci_schema
+
+        response = test_client.get(self.url, params={"guid": mock_id, "fields": ["/metadata", "/sections/1"]})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {"status": "error", "message": "No CI field found"}
+
+    def test_endpoint_returns_400_if_field_is_not_json_pointer(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = self.ci_schema
+
+        response = test_client.get(self.url, params={"guid": mock_id, "fields": "metadata"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"status": "error", "message": "Invalid JSON Pointer provided"}
+
+    def test_endpoint_returns_404_if_schema_not_found(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = None
+
+        response = test_client.get(self.url, params={"guid": mock_id, "fields": "/metadata"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {"status": "error", "message": "No CI found"}
+
+    def test_endpoint_reads_only_split_fields_needed(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        With split storage enabled only the manifest and the split fields the pointers refer to should be read
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        split_ci_schema = {
+            f"{mock_id}/manifest.json": {
+                "split_fields": ["metadata", "sections"],
+                "schema": {"survey_id": "123", "a/b": {"c~d": "escaped"}},
+            },
+            f"{mock_id}/fields/sections.json": self.ci_schema["sections"],
+        }
+
+        with (
+            patch("app.services.ci_processor_service.settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED", True),
+            patch(
+                "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_split_ci_schema_part",
+                side_effect=split_ci_schema.get,
+            ) as mocked_retrieve_split_ci_schema_part,
+        ):
+            response = test_client.get(
+                self.url, params={"guid": mock_id, "fields": ["/survey_id", "/sections/0/id"]}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"/survey_id": "123", "/sections/0/id": "section-1"}
+        assert [call.args[0] for call in mocked_retrieve_split_ci_schema_part.call_args_list] == [
+            f"{mock_id}/manifest.json",
+            f"{mock_id}/fields/sections.json",
+        ]
+        mocked_retrieve_ci_schema.assert_not_called()
+
+    def test_endpoint_reads_whole_schema_if_not_split(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        CIs stored before split storage was enabled, or streamed, have no manifest
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = self.ci_schema
+
+        with (
+            patch("app.services.ci_processor_service.settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED", True),
+            patch(
+                "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_split_ci_schema_part",
+                return_value=None,
+            ),
+        ):
+            response = test_client.get(self.url, params={"guid": mock_id, "fields": "/metadata/0/name"})
+
+        assert response.json() == {"/metadata/0/name": "user_id"}
+        mocked_retrieve_ci_schema.assert_called_once_with(f"{mock_id}.json")
@@ -0,0 +1,86 @@
+from fastapi import status
+
+from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+from tests.test_config.endpoints import ENDPOINTS, GET_CI_SURVEY_SUMMARY
+from tests.test_data.ci_test_data import (
+    mock_classifier_type,
+    mock_classifier_value,
+    mock_id,
+    mock_language,
+    mock_survey_id,
+)
+
+URL = ENDPOINTS[GET_CI_SURVEY_SUMMARY]["url"]
+
+
+def set_survey_summary(mock_firestore_survey_summary_collection, survey_id: str, cis: dict, **counts) -> None:
+    mock_firestore_survey_summary_collection.document(CiFirebaseRepository.survey_summary_document_id(survey_id)).set(
+        {"survey_id": survey_id, "cis": cis, **counts}
+    )
+
+
+def ci_summary(classifier_value: str, language: str, latest_guid: str, latest_ci_version: int, version_count: int):
+    return {
+        "classifier_type": mock_classifier_type,
+        "classifier_value": classifier_value,
+        "language": language,
+        "latest_guid": latest_guid,
+        "latest_ci_version": latest_ci_version,
+        "version_count": version_count,
+    }
+
+
+class TestHttpGetCiSurveySummary:
+    """Tests for the `get_survey_summary` endpoint"""
+
+    def test_endpoint_returns_survey_summary(self, test_client, mock_firestore_survey_summary_collection):
+        """
+        The summary should list the latest version of each CI of the survey, ordered by classifier and language
+        """
+        set_survey_summary(
+            mock_firestore_survey_summary_collection,
+            mock_survey_id,
+            {
+                "welsh": ci_summary(mock_classifier_value, "cy", "welsh-guid", 1, 1),
+                "english": ci_summary(mock_classifier_value, mock_language, mock_id, 2, 2),
+            },
+            version_count=3,
+            schema_bytes=1234,
+        )
+
+        response = test_client.get(URL, params={"survey_id": mock_survey_id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "survey_id": mock_survey_id,
+            "version_count": 3,
+            "schema_bytes": 1234,
+            "cis": [
+                ci_summary(mock_classifier_value, "cy", "welsh-guid", 1, 1),
+                ci_summary(mock_classifier_value, mock_language, mock_id, 2, 2),
+            ],
+        }
+
+    def test_endpoint_returns_404_if_survey_has_no_summary(self, test_client):
+        response = test_client.get(URL, params={"survey_id": mock_survey_id})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_endpoint_returns_404_if_every_ci_of_survey_was_deleted(
+        self, test_client, mock_firestore_survey_summary_collection
+    ):
+        """
+        A summary is left with no versions once every CI of its survey is deleted
+        """
+        set_survey_summary(
+            mock_firestore_survey_summary_collection, mock_survey_id, {}, version_count=0, schema_bytes=0
+        )
+
+        response = test_client.get(URL, params={"survey_id": mock_survey_id})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_endpoint_returns_400_without_survey_id(self, test_client):
+        response = test_client.get(URL)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
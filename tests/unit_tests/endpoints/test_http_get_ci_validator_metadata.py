@@ -1,6 +1,7 @@
 from unittest.mock import patch
 from fastapi import status
 
+from app.cache.ci_validator_metadata_snapshot import ci_validator_metadata_snapshot
 from tests.test_config.endpoints import ENDPOINTS, GET_CI_VALIDATOR_METADATA
 from tests.test_config.endpoints_loader import EndpointsLoader
 from tests.test_data.ci_test_data import mock_ci_metadata_list, mock_ci_validator_metadata_list
@@ -34,3 +35,26 @@ def test_endpoint_returns_404_if_ci_validator_metadata_not_found(test_client):
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json()["message"] == "No CI validator metadata found"
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_all_ci_metadata_collection")
+def test_endpoint_serves_validator_metadata_snapshot(
+        mocked_get_all_ci_metadata_collection,
+        test_client
+):
+    """
+    With the snapshot enabled, the validator metadata should be read once and served from memory with its age
+    """
+    mocked_get_all_ci_metadata_collection.return_value = mock_ci_metadata_list
+
+    with patch.object(ci_validator_metadata_snapshot, "enabled", True):
+        first_response = test_client.get(URL)
+        second_response = test_client.get(URL)
+
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.content == first_response.content
+    assert second_response.json() == [
+        mock_ci_validator_metadata.model_dump() for mock_ci_validator_metadata in mock_ci_validator_metadata_list
+    ]
+    assert second_response.headers["Age"] == "0"
+    mocked_get_all_ci_metadata_collection.assert_called_once()
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from fastapi import status
+from prometheus_client import REGISTRY
+
+from tests.test_config.endpoints import ENDPOINTS, GET_CI_SCHEMA, GET_METRICS
+from tests.test_config.endpoints_loader import EndpointsLoader
+from tests.test_data.ci_test_data import mock_ci_metadata, mock_id
+
+endpoints_loader = EndpointsLoader(ENDPOINTS)
+
+
+class TestHttpGetMetrics:
+    base_url = endpoints_loader.get_url(GET_METRICS)
+    schema_url = endpoints_loader.get_url(GET_CI_SCHEMA)
+
+    def test_endpoint_returns_200_and_prometheus_text(self, test_client):
+        """
+        Endpoint should return `HTTP_200_OK` and the metrics in the Prometheus text format
+        """
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "cir_http_request_duration_seconds" in response.text
+        assert "cir_backend_call_duration_seconds" in response.text
+        assert "cir_stored_schema_size_bytes" in response.text
+
+    @patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
+    @patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_ci_schema")
+    def test_request_latency_is_labelled_with_route_template(
+        self, mocked_retrieve_ci_schema, mocked_get_ci_metadata_with_id, test_client
+    ):
+        """
+        Requests should be recorded against the route path template rather than the raw url
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+        mocked_retrieve_ci_schema.return_value = mock_ci_metadata.__dict__
+        labels = {"method": "GET", "route": self.schema_url, "status_code": "200"}
+        before = REGISTRY.get_sample_value("cir_http_request_duration_seconds_count", labels) or 0
+
+        test_client.get(f"{self.schema_url}?guid={mock_id}")
+
+        assert REGISTRY.get_sample_value("cir_http_request_duration_seconds_count", labels) == before + 1
+
+    def test_unknown_paths_share_a_single_label(self, test_client):
+        """
+        Requests to unknown paths should be recorded under a single `unmatched` route label
+        """
+        labels = {"method": "GET", "route": "unmatched", "status_code": "404"}
+        before = REGISTRY.get_sample_value("cir_http_request_duration_seconds_count", labels) or 0
+
+        test_client.get("/does-not-exist/123")
+
+        assert REGISTRY.get_sample_value("cir_http_request_duration_seconds_count", labels) == before + 1
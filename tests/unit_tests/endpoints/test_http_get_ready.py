@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.exception.exceptions import ExceptionTopicNotFound
+from tests.test_config.endpoints import ENDPOINTS, GET_READY
+from tests.test_config.endpoints_loader import EndpointsLoader
+
+endpoints_loader = EndpointsLoader(ENDPOINTS)
+
+
+class TestHttpGetReady:
+    base_url = endpoints_loader.get_url(GET_READY)
+
+    def test_endpoint_returns_200_if_all_dependencies_connected(self, test_client, pubsub_mock, bucket_mock):
+        """
+        Endpoint should return `HTTP_200_OK` with a connected status and latency for every dependency
+        """
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["ready"] is True
+        for dependency in ("firestore", "storage", "pubsub"):
+            assert response.json()[dependency]["connected"] is True
+            assert response.json()[dependency]["latency_ms"] >= 0
+        pubsub_mock.topic_exists.assert_called_once()
+        bucket_mock.get_ci_schema_bucket.return_value.exists.assert_called_once()
+
+    def test_endpoint_returns_503_if_topic_not_found(self, test_client, pubsub_mock):
+        """
+        Endpoint should return `HTTP_503_SERVICE_UNAVAILABLE` if a dependency probe raises an exception
+        """
+        pubsub_mock.topic_exists.side_effect = ExceptionTopicNotFound
+
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["ready"] is False
+        assert response.json()["pubsub"]["connected"] is False
+        assert response.json()["firestore"]["connected"] is True
+
+    def test_endpoint_returns_503_if_bucket_does_not_exist(self, test_client, bucket_mock):
+        """
+        Endpoint should return `HTTP_503_SERVICE_UNAVAILABLE` if a dependency probe reports the resource is missing
+        """
+        bucket_mock.get_ci_schema_bucket.return_value.exists.return_value = False
+
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["storage"]["connected"] is False
+
+    @patch("app.routers.status_router.settings")
+    def test_endpoint_returns_503_if_probe_too_slow(self, mocked_settings, test_client):
+        """
+        Endpoint should return `HTTP_503_SERVICE_UNAVAILABLE` if a probe exceeds `READINESS_MAX_PROBE_LATENCY_MS`
+        """
+        mocked_settings.READINESS_MAX_PROBE_LATENCY_MS = -1
+
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    @patch("app.routers.status_router.settings")
+    def test_endpoint_returns_503_until_cache_is_warm(self, mocked_settings, test_client, enabled_ci_cache):
+        """
+        Endpoint should return `HTTP_503_SERVICE_UNAVAILABLE` while cache pre-warming is enabled but not complete
+        """
+        mocked_settings.CI_CACHE_PREWARM_ENABLED = True
+        mocked_settings.READINESS_MAX_PROBE_LATENCY_MS = 1000
+
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["cache_warm"] is False
+
+        enabled_ci_cache.warm = True
+        enabled_ci_cache.prewarm_attempted = True
+        response = test_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["cache_warm"] is True
+
+    @patch("app.routers.status_router.settings")
+    def test_endpoint_returns_200_after_failed_prewarm(self, mocked_settings, test_client, enabled_ci_cache):
+        """
+        A failed pre-warm is retried in the background while the cache fills on demand, so the endpoint should
+        return `HTTP_200_OK` once it has been attempted, reporting the cache as cold
+        """
+        mocked_settings.CI_CACHE_PREWARM_ENABLED = True
+        mocked_settings.READINESS_MAX_PROBE_LATENCY_MS = 1000
+
+        with (
+            patch("app.main.settings.CI_CACHE_PREWARM_ENABLED", True),
+            patch("app.main.prewarm_ci_cache", return_value=False),
+            patch("app.main.retry_prewarm_ci_cache", new_callable=AsyncMock),
+            TestClient(test_client.app) as client,
+        ):
+            response = client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["ready"] is True
+        assert response.json()["cache_warm"] is False
@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 from fastapi import status
+from fastapi.responses import ORJSONResponse
 
 from tests.test_config.endpoints import ENDPOINTS, GET_STATUS
 from tests.test_config.endpoints_loader import EndpointsLoader
@@ -31,3 +32,9 @@ class TestHttpGetStatus:
         mocked_settings.CIR_APPLICATION_VERSION = None
         response = test_client_no_server_exception.get(self.base_url)
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    def test_app_encodes_responses_with_orjson(self, test_client):
+        """
+        Responses should be encoded with orjson by default
+        """
+        assert test_client.app.router.default_response_class is ORJSONResponse
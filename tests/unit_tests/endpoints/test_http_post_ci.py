@@ -215,3 +215,29 @@ class TestHttpPostCi:
             CiSchemaLocationService.get_ci_schema_location(mock_next_version_ci_metadata_v3_auto_version),
         )
         pubsub_mock.publish_message.assert_called_once_with(CiMetadata(**mock_next_version_ci_metadata_v3_auto_version.model_dump()))
+
+    def test_endpoint_stores_schema_content_addressed_if_enabled(
+        self,
+        mocked_perform_new_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        mocked_create_guid,
+        test_client,
+    ):
+        """
+        The schema should be stored at the hash of its content, which is not returned with the metadata
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+        schema_hash = CiSchemaLocationService.get_ci_schema_hash(mock_post_ci_schema.model_dump())
+
+        with patch("app.services.ci_processor_service.settings.CI_SCHEMA_CONTENT_ADDRESSED_ENABLED", True):
+            response = test_client.post(
+                self.url,
+                params={"validator_version": "0.0.1", "guid": mock_id, "ci_version": 2},
+                json=mock_post_ci_schema.model_dump(),
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == mock_ci_metadata_v3.model_dump()
+        ci_id, ci_metadata, _, stored_ci_filename = mocked_perform_new_ci_transaction.call_args.args
+        assert ci_metadata.schema_hash == schema_hash
+        assert stored_ci_filename == f"schemas/{schema_hash}.json"
@@ -0,0 +1,233 @@
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+
+from app.models.responses import CiMetadata
+from app.services.ci_schema_location_service import CiSchemaLocationService
+from tests.test_config.endpoints import ENDPOINTS, POST_CI_STREAM
+from tests.test_data.ci_test_data import mock_ci_metadata_v3, mock_id, mock_post_ci_schema
+
+URL = ENDPOINTS[POST_CI_STREAM]["url"]
+STAGED_CI_FILENAME = CiSchemaLocationService.get_staged_ci_schema_location(mock_id)
+
+
+class RecordingWriter(io.BytesIO):
+    """Keeps what was written to a streamed upload after it is closed"""
+
+    written = b""
+
+    def close(self):
+        if not self.closed:
+            self.written = self.getvalue()
+        super().close()
+
+
+@pytest.fixture
+def ci_schema_writer():
+    writer = RecordingWriter()
+    with patch(
+        "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.open_ci_schema_writer",
+        return_value=writer,
+    ) as mocked_open_ci_schema_writer:
+        writer.mocked_open = mocked_open_ci_schema_writer
+        yield writer
+
+
+@pytest.fixture
+def mocked_delete_ci_schema():
+    with patch(
+        "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.delete_ci_schema"
+    ) as mocked_delete_ci_schema:
+        yield mocked_delete_ci_schema
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_latest_ci_metadata")
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.perform_new_streamed_ci_transaction")
+class TestHttpPostCiStream:
+    """
+    Tests for the `stream_collection_instrument` endpoint
+    """
+
+    def test_endpoint_returns_200_if_ci_streamed_successfully(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        mocked_delete_ci_schema,
+        test_client,
+        pubsub_mock,
+    ):
+        """
+        The CI should be written to its staging location as it was sent, then copied to where it is stored in the
+        transaction creating its metadata, and the staged copy deleted
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+        body = json.dumps(mock_post_ci_schema.model_dump()).encode("utf-8")
+
+        response = test_client.post(
+            URL,
+            params={"validator_version": "0.0.1", "guid": mock_id, "ci_version": 2},
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == mock_ci_metadata_v3.model_dump()
+        ci_schema_writer.mocked_open.assert_called_once_with(STAGED_CI_FILENAME, None)
+        assert ci_schema_writer.written == body
+        mocked_perform_new_streamed_ci_transaction.assert_called_once_with(
+            mock_id,
+            mock_ci_metadata_v3,
+            STAGED_CI_FILENAME,
+            CiSchemaLocationService.get_ci_schema_location(mock_ci_metadata_v3),
+            len(body),
+        )
+        mocked_delete_ci_schema.assert_called_once_with(STAGED_CI_FILENAME)
+        pubsub_mock.publish_message.assert_called_once_with(CiMetadata(**mock_ci_metadata_v3.model_dump()))
+
+    def test_endpoint_stores_streamed_ci_exactly_as_sent(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        mocked_delete_ci_schema,
+        test_client,
+    ):
+        """
+        A streamed CI should be stored byte for byte as it was sent, including its formatting and any optional
+        fields it leaves out, rather than as a CI posted in full would be stored
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+        ci = {key: value for key, value in mock_post_ci_schema.model_dump().items() if value not in ("", None)}
+        body = json.dumps({**ci, "sections": [{"id": "section"}]}, indent=4).encode("utf-8")
+
+        response = test_client.post(
+            URL,
+            params={"validator_version": "0.0.1", "guid": mock_id, "ci_version": 2},
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert ci_schema_writer.written == body
+
+    def test_endpoint_compresses_streamed_ci_with_gzip_codec(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        mocked_delete_ci_schema,
+        test_client,
+    ):
+        """
+        With the gzip storage codec the CI should be gzipped as it is streamed
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+        body = json.dumps(mock_post_ci_schema.model_dump()).encode("utf-8")
+
+        with patch("app.services.ci_processor_service.settings.CI_SCHEMA_STORAGE_CODEC", "gzip"):
+            response = test_client.post(
+                URL,
+                params={"validator_version": "0.0.1", "guid": mock_id, "ci_version": 2},
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        ci_schema_writer.mocked_open.assert_called_once_with(STAGED_CI_FILENAME, "gzip")
+        assert gzip.decompress(ci_schema_writer.written) == body
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b'{"survey_id": "123", "sections": [',
+            b"[]",
+            json.dumps({**mock_post_ci_schema.model_dump(), "survey_id": ""}).encode("utf-8"),
+            json.dumps({key: value for key, value in mock_post_ci_schema.model_dump().items() if key != "title"}).encode(
+                "utf-8"
+            ),
+            json.dumps({**mock_post_ci_schema.model_dump(), "sections": {"title": "not a list"}}).encode("utf-8"),
+            json.dumps({**mock_post_ci_schema.model_dump(), "unknown_field": "value"}).encode("utf-8"),
+        ],
+    )
+    def test_endpoint_returns_400_and_discards_invalid_ci(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        mocked_delete_ci_schema,
+        test_client,
+        pubsub_mock,
+        body,
+    ):
+        """
+        A body that is not a JSON object, is missing required fields, has a field of the wrong type, or has a
+        field a CI posted in full would drop, should be rejected and its staged upload deleted without creating
+        any metadata
+        """
+        response = test_client.post(
+            URL,
+            params={"validator_version": "0.0.1", "guid": mock_id},
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["message"] == "Validation has failed"
+        mocked_perform_new_streamed_ci_transaction.assert_not_called()
+        mocked_delete_ci_schema.assert_called_once_with(STAGED_CI_FILENAME)
+        pubsub_mock.publish_message.assert_not_called()
+
+    def test_endpoint_returns_400_if_guid_already_exists(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        test_client,
+        mock_firestore_collection,
+    ):
+        """
+        A CI with an existing guid should be rejected before its body is streamed
+        """
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata_v3.model_dump())
+
+        response = test_client.post(
+            URL,
+            params={"validator_version": "0.0.1", "guid": mock_id},
+            content=json.dumps(mock_post_ci_schema.model_dump()).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        ci_schema_writer.mocked_open.assert_not_called()
+        mocked_perform_new_streamed_ci_transaction.assert_not_called()
+
+    def test_endpoint_returns_500_and_discards_ci_if_transaction_fails(
+        self,
+        mocked_perform_new_streamed_ci_transaction,
+        mocked_get_latest_ci_metadata,
+        ci_schema_writer,
+        mocked_delete_ci_schema,
+        test_client_no_server_exception,
+        pubsub_mock,
+    ):
+        """
+        The staged upload should be deleted if the CI metadata cannot be created
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+        mocked_perform_new_streamed_ci_transaction.side_effect = Exception
+
+        response = test_client_no_server_exception.post(
+            URL,
+            params={"validator_version": "0.0.1", "guid": mock_id},
+            content=json.dumps(mock_post_ci_schema.model_dump()).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mocked_delete_ci_schema.assert_called_once_with(STAGED_CI_FILENAME)
+        pubsub_mock.publish_message.assert_not_called()
@@ -4,7 +4,9 @@ from urllib.parse import urlencode
 
 from fastapi import status
 
+from app.events.ci_events import CiEventType
 from app.models.requests import UpdateValidatorVersionV1Params
+from app.services.ci_schema_location_service import CiSchemaLocationService
 from tests.test_config.endpoints import ENDPOINTS, PUT_VALIDATOR_VERSION
 from tests.test_config.endpoints_loader import EndpointsLoader
 from tests.test_data.ci_test_data import (
@@ -16,7 +18,7 @@ endpoints_loader = EndpointsLoader(ENDPOINTS)
 
 @patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
 @patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.update_ci_metadata")
-@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.store_ci_schema")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.store_ci_schema", return_value=1234)
 class TestHttpPutValidatorVersion:
     """Tests for the `http_put_ci_validator_version_v1` endpoint"""
 
@@ -56,9 +58,62 @@ class TestHttpPutValidatorVersion:
         )
         mocked_update_ci_metadata.assert_called_once_with(
             mock_updated_ci_metadata_v2.guid,
-            mock_updated_ci_metadata_v2
+            mock_updated_ci_metadata_v2,
+            1234,
         )
 
+    def test_endpoint_stores_schema_content_addressed_if_enabled(self,
+                                                                 mocked_store_ci_schema: Mock,
+                                                                 mocked_update_ci_metadata: Mock,
+                                                                 mocked_get_ci_metadata_with_id: Mock,
+                                                                 test_client,
+                                                                 ):
+        """
+        The updated schema should be stored at the hash of its content, and the schema the CI was created with
+        deleted as no other CI can share it
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata_v2
+        schema_hash = CiSchemaLocationService.get_ci_schema_hash(mock_post_ci_schema.model_dump())
+
+        with (
+            patch("app.services.ci_processor_service.settings.CI_SCHEMA_CONTENT_ADDRESSED_ENABLED", True),
+            patch(
+                "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.store_content_addressed_ci_schema",
+                return_value=1234,
+            ) as mocked_store_content_addressed_ci_schema,
+            patch(
+                "app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.delete_ci_schema"
+            ) as mocked_delete_ci_schema,
+        ):
+            response = test_client.put(self.url, json=mock_post_ci_schema.model_dump())
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == mock_updated_ci_metadata_v2.model_dump()
+        mocked_store_ci_schema.assert_not_called()
+        mocked_store_content_addressed_ci_schema.assert_called_once_with(
+            f"schemas/{schema_hash}.json", mock_post_ci_schema.model_dump()
+        )
+        assert mocked_update_ci_metadata.call_args.args[1].schema_hash == schema_hash
+        mocked_delete_ci_schema.assert_called_once_with(f"{mock_id}.json")
+
+    def test_endpoint_publishes_update_event_if_change_events_enabled(self,
+                                                                           mocked_store_ci_schema: Mock,
+                                                                           mocked_update_ci_metadata: Mock,
+                                                                           mocked_get_ci_metadata_with_id: Mock,
+                                                                           test_client,
+                                                                           pubsub_mock,
+                                                                           ):
+        """
+        An updated CI should be published to the topic so consumers can update their copy of its metadata
+        """
+        mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata_v2
+
+        with patch("app.services.ci_processor_service.settings.CI_CHANGE_EVENTS_ENABLED", True):
+            response = test_client.put(self.url, json=mock_post_ci_schema.model_dump())
+
+        assert response.status_code == status.HTTP_200_OK
+        pubsub_mock.publish_messages.assert_called_once_with([mock_updated_ci_metadata_v2], CiEventType.UPDATED)
+
     def test_endpoint_metadata_not_found(self,
                                          mocked_store_ci_schema: Mock,
                                          mocked_update_ci_metadata: Mock,
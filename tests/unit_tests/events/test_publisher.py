@@ -3,6 +3,7 @@ import json
 import pytest
 
 from app.config import Settings
+from app.events.ci_events import INSTANCE_ID, CiEventType
 from app.events.publisher import Publisher
 from app.exception.exceptions import ExceptionTopicNotFound
 
@@ -47,11 +48,47 @@ class TestPublisher:
         publisher = Publisher(mocked_publisher_client)
         publisher.publish_message(mock_event_message)
         mock_topic_exists.assert_called_once()
-        mocked_publisher_client.publish.assert_called_once_with("project_id/topics/topic_id", data=data)
+        mocked_publisher_client.publish.assert_called_once_with(
+            "project_id/topics/topic_id", data=data, event_type="ci_created", origin=INSTANCE_ID
+        )
         mock_future.result.assert_called_once()
-        expected_message = "Message published. success"
-        actual_message = mock_logger.call_args[0][0]
-        assert actual_message == expected_message
+        mock_logger.assert_called_once_with("Message published. %s", "success")
+
+    def test_publish_message_sets_event_type(self, mocker):
+        mocked_publisher_client = mocker.Mock()
+        mocker.patch("app.events.publisher.Publisher._verify_topic_exists")
+
+        publisher = Publisher(mocked_publisher_client)
+        publisher.publish_message(mock_event_message, CiEventType.DELETED)
+
+        assert mocked_publisher_client.publish.call_args.kwargs["event_type"] == "ci_deleted"
+        assert mocked_publisher_client.publish.call_args.kwargs["origin"] == INSTANCE_ID
+
+    def test_publish_messages_sends_batch_before_waiting(self, mocker):
+        """
+        Every message should be handed to the client before waiting for any of them to be published
+        """
+        mocked_publisher_client = mocker.Mock()
+        mocker.patch("app.events.publisher.Publisher._verify_topic_exists")
+        calls = []
+        mocked_publisher_client.publish.side_effect = lambda *args, **kwargs: calls.append("publish") or mocker.Mock(
+            result=lambda: calls.append("result")
+        )
+
+        publisher = Publisher(mocked_publisher_client)
+        publisher.publish_messages([mock_event_message, mock_event_message], CiEventType.DELETED)
+
+        assert calls == ["publish", "publish", "result", "result"]
+        assert all(call.kwargs["event_type"] == "ci_deleted" for call in mocked_publisher_client.publish.call_args_list)
+
+    def test_publish_messages_does_nothing_if_empty(self, mocker):
+        mocked_publisher_client = mocker.Mock()
+
+        publisher = Publisher(mocked_publisher_client)
+        publisher.publish_messages([], CiEventType.DELETED)
+
+        mocked_publisher_client.get_topic.assert_not_called()
+        mocked_publisher_client.publish.assert_not_called()
 
     def test_publish_message_failure(self, mocker):
         mocked_publisher_client = mocker.Mock()
@@ -89,3 +126,12 @@ class TestPublisher:
 
         with pytest.raises(ExceptionTopicNotFound):
             publisher._verify_topic_exists("")
+
+    def test_topic_exists_verifies_publish_topic(self, mocker):
+        mocked_publisher_client = mocker.Mock()
+        mocked_publisher_client.topic_path.return_value = "project_id/topics/topic_id"
+
+        publisher = Publisher(mocked_publisher_client)
+
+        assert publisher.topic_exists()
+        mocked_publisher_client.get_topic.assert_called_with(request={"topic": "project_id/topics/topic_id"})
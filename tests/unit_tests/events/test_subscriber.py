@@ -0,0 +1,121 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from app.cache.ci_cache import ci_cache
+from app.cache.ci_validator_metadata_snapshot import ValidatorMetadataSnapshot, ci_validator_metadata_snapshot
+from app.events.ci_events import INSTANCE_ID, CiEventType
+from app.events.subscriber import CiEventSubscriber
+from tests.test_data.ci_test_data import (
+    mock_ci_metadata,
+    mock_classifier_type,
+    mock_classifier_value,
+    mock_id,
+    mock_language,
+    mock_next_version_ci_metadata,
+    mock_survey_id,
+)
+
+
+def build_message(ci_metadata, attributes: dict) -> Mock:
+    message = Mock()
+    message.data = json.dumps(ci_metadata.model_dump()).encode("utf-8")
+    message.attributes = attributes
+    return message
+
+
+@pytest.fixture
+def subscriber_client():
+    client = Mock()
+    client.subscription_path.side_effect = lambda project, subscription: f"projects/{project}/subscriptions/{subscription}"
+    client.topic_path.side_effect = lambda project, topic: f"projects/{project}/topics/{topic}"
+    return client
+
+
+@pytest.fixture
+def cached_ci(enabled_ci_cache):
+    enabled_ci_cache.put_metadata(mock_ci_metadata)
+    enabled_ci_cache.put_latest(mock_ci_metadata)
+    enabled_ci_cache.put_schema(f"{mock_id}.json", {"title": "cached"})
+    return enabled_ci_cache
+
+
+class TestCiEventSubscriber:
+    """Tests for the `CiEventSubscriber` class"""
+
+    def test_start_creates_subscription_filtering_out_own_events(self, subscriber_client):
+        """
+        Each worker should have its own subscription, leaving out the events it published
+        """
+        subscriber = CiEventSubscriber(subscriber_client)
+
+        subscriber.start()
+
+        request = subscriber_client.create_subscription.call_args.kwargs["request"]
+        assert request["name"] == subscriber.subscription_path
+        assert request["name"].endswith(f"-cache-{INSTANCE_ID}")
+        assert request["filter"] == f'attributes.origin != "{INSTANCE_ID}"'
+        subscriber_client.subscribe.assert_called_once_with(
+            subscriber.subscription_path, callback=subscriber.handle_message
+        )
+
+    def test_stop_cancels_pull_and_deletes_subscription(self, subscriber_client):
+        subscriber = CiEventSubscriber(subscriber_client)
+        subscriber.start()
+
+        subscriber.stop()
+
+        subscriber_client.subscribe.return_value.cancel.assert_called_once()
+        subscriber_client.delete_subscription.assert_called_once_with(
+            request={"subscription": subscriber.subscription_path}
+        )
+        subscriber_client.close.assert_called_once()
+
+    @pytest.mark.parametrize("attributes", [{"event_type": CiEventType.CREATED.value}, {}])
+    def test_created_event_invalidates_latest_version(self, subscriber_client, cached_ci, attributes):
+        """
+        A new CI version should replace the cached latest version without dropping the previous version,
+        including for messages published without an `event_type`
+        """
+        message = build_message(mock_next_version_ci_metadata, attributes)
+
+        CiEventSubscriber(subscriber_client).handle_message(message)
+
+        assert ci_cache.get_latest(mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language) is None
+        assert ci_cache.get_metadata(mock_id) == mock_ci_metadata
+        message.ack.assert_called_once()
+
+    @pytest.mark.parametrize("event_type", [CiEventType.UPDATED.value, CiEventType.DELETED.value])
+    def test_changed_event_invalidates_metadata_and_schema(self, subscriber_client, cached_ci, event_type):
+        message = build_message(mock_ci_metadata, {"event_type": event_type})
+
+        CiEventSubscriber(subscriber_client).handle_message(message)
+
+        assert ci_cache.get_metadata(mock_id) is None
+        assert ci_cache.get_latest(mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language) is None
+        assert ci_cache.get_schema(f"{mock_id}.json") is None
+        message.ack.assert_called_once()
+
+    @pytest.mark.parametrize("event_type", list(CiEventType))
+    def test_every_event_drops_validator_metadata_snapshot(self, subscriber_client, mocker, event_type):
+        mocker.patch.object(ci_validator_metadata_snapshot, "enabled", True)
+        ci_validator_metadata_snapshot.get(Mock(return_value=ValidatorMetadataSnapshot(b"[]", 1)))
+        rebuild = Mock(return_value=ValidatorMetadataSnapshot(b"[]", 2))
+
+        CiEventSubscriber(subscriber_client).handle_message(
+            build_message(mock_ci_metadata, {"event_type": event_type.value})
+        )
+
+        assert ci_validator_metadata_snapshot.get(rebuild).row_count == 2
+
+    def test_invalid_message_is_acknowledged(self, subscriber_client, cached_ci):
+        """
+        A message that cannot be handled should be logged and acknowledged rather than redelivered
+        """
+        message = Mock(data=b"not json", attributes={})
+
+        CiEventSubscriber(subscriber_client).handle_message(message)
+
+        assert ci_cache.get_metadata(mock_id) == mock_ci_metadata
+        message.ack.assert_called_once()
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from app.exception.exceptions import ValidationException
+from app.services.ci_field_extractor_service import CiFieldExtractor
+
+
+def extract(body: bytes, chunk_size: int = 7) -> dict:
+    extractor = CiFieldExtractor()
+    for start in range(0, len(body), chunk_size):
+        extractor.feed(body[start : start + chunk_size])
+    return extractor.close()
+
+
+def test_extracts_top_level_fields_split_across_chunks():
+    """
+    Only top-level fields should be extracted, with objects and arrays extracted empty, however the body is
+    split into chunks
+    """
+    ci = {
+        "survey_id": "123",
+        "sections": [{"survey_id": "nested", "title": "nested title"}],
+        "title": "title",
+        "navigation": {"visible": True, "sections": [{"title": "nested"}]},
+        "form_type": "0001",
+        "language": "en",
+        "theme": None,
+    }
+
+    assert extract(json.dumps(ci).encode("utf-8")) == {
+        "survey_id": "123",
+        "sections": [],
+        "title": "title",
+        "navigation": {},
+        "form_type": "0001",
+        "language": "en",
+        "theme": None,
+    }
+
+
+def test_extracts_top_level_keys_containing_dots():
+    """
+    A top-level key containing `.` should not be mistaken for a nested key, or the other way around
+    """
+    body = b'{"survey.id": "top", "survey": {"id": "nested"}}'
+
+    assert extract(body) == {"survey.id": "top", "survey": {}}
+
+
+def test_empty_chunks_are_ignored():
+    extractor = CiFieldExtractor()
+    extractor.feed(b'{"survey_id": "1')
+    extractor.feed(b"")
+    extractor.feed(b'23"}')
+
+    assert extractor.close() == {"survey_id": "123"}
+
+
+@pytest.mark.parametrize("body", [b"", b"[]", b'"ci"', b'{"survey_id": "123"', b'{"survey_id": "123"} {}'])
+def test_rejects_body_that_is_not_a_json_object(body):
+    with pytest.raises(ValidationException):
+        extract(body)
@@ -0,0 +1,70 @@
+import pytest
+
+from app.exception.exceptions import ExceptionInvalidJsonPointer, ExceptionNoCIField
+from app.services.ci_json_pointer_service import CiJsonPointerService
+
+# The example document of RFC 6901 section 5
+DOCUMENT = {
+    "foo": ["bar", "baz"],
+    "": 0,
+    "a/b": 1,
+    "c%d": 2,
+    "e^f": 3,
+    "g|h": 4,
+    "i\\j": 5,
+    'k"l': 6,
+    " ": 7,
+    "m~n": 8,
+}
+
+
+@pytest.mark.parametrize(
+    "pointer, expected",
+    [
+        ("", DOCUMENT),
+        ("/foo", ["bar", "baz"]),
+        ("/foo/0", "bar"),
+        ("/", 0),
+        ("/a~1b", 1),
+        ("/c%d", 2),
+        ("/e^f", 3),
+        ("/g|h", 4),
+        ("/i\\j", 5),
+        ('/k"l', 6),
+        ("/ ", 7),
+        ("/m~0n", 8),
+    ],
+)
+def test_resolves_rfc_6901_examples(pointer, expected):
+    tokens = CiJsonPointerService.parse_json_pointer(pointer)
+
+    assert CiJsonPointerService.resolve_json_pointer(DOCUMENT, tokens) == expected
+
+
+@pytest.mark.parametrize("pointer", ["foo", "/foo~", "/foo~2"])
+def test_rejects_invalid_pointers(pointer):
+    with pytest.raises(ExceptionInvalidJsonPointer):
+        CiJsonPointerService.parse_json_pointer(pointer)
+
+
+def test_unescapes_tilde_before_slash():
+    """
+    `~01` should become `~1`, not `/`
+    """
+    assert CiJsonPointerService.parse_json_pointer("/~01") == ["~1"]
+
+
+@pytest.mark.parametrize("pointer", ["/missing", "/foo/2", "/foo/-", "/foo/01", "/foo/bar", "/foo/0/0"])
+def test_raises_if_pointer_does_not_resolve(pointer):
+    tokens = CiJsonPointerService.parse_json_pointer(pointer)
+
+    with pytest.raises(ExceptionNoCIField):
+        CiJsonPointerService.resolve_json_pointer(DOCUMENT, tokens)
+
+
+def test_extract_ci_fields_checks_every_pointer_before_resolving():
+    """
+    An invalid pointer should be reported even if an earlier pointer does not resolve
+    """
+    with pytest.raises(ExceptionInvalidJsonPointer):
+        CiJsonPointerService.extract_ci_fields(DOCUMENT, ["/missing", "foo"])
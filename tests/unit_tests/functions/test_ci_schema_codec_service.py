@@ -0,0 +1,104 @@
+import gzip
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
+from app.services.ci_schema_codec_service import CI_SCHEMA_CODECS, CiSchemaCodecService, zstandard
+
+schema = {"title": "schema", "sections": [{"id": "section-1", "questions": ["q1", "q2"]}]}
+
+
+@pytest.mark.parametrize("codec", [codec for codec in CI_SCHEMA_CODECS if codec != "zstd" or zstandard is not None])
+def test_decode_reads_schema_stored_with_any_codec(codec):
+    """
+    A schema encoded with any codec should decode back to the original schema
+    """
+    data, _ = CiSchemaCodecService.encode(schema, codec, compression_level=6)
+
+    assert CiSchemaCodecService.decode(data) == schema
+
+
+def test_encode_json_pretty_matches_legacy_format():
+    """
+    The default codec should store schemas exactly as they were stored before codecs were introduced
+    """
+    data, content_encoding = CiSchemaCodecService.encode(schema, "json-pretty", compression_level=6)
+
+    assert data == json.dumps(schema, indent=2).encode("utf-8")
+    assert content_encoding is None
+
+
+def test_encode_gzip_sets_content_encoding():
+    """
+    Gzipped schemas should be compact json and set the gzip content encoding
+    """
+    data, content_encoding = CiSchemaCodecService.encode(schema, "gzip", compression_level=6)
+
+    assert content_encoding == "gzip"
+    assert gzip.decompress(data) == json.dumps(schema, separators=(",", ":")).encode("utf-8")
+
+
+def test_encode_unknown_codec_raises_error():
+    with pytest.raises(ValueError):
+        CiSchemaCodecService.encode(schema, "bzip2", compression_level=6)
+
+
+def test_store_ci_schema_uses_configured_codec(mocker):
+    """
+    `store_ci_schema` should upload the schema encoded with `CI_SCHEMA_STORAGE_CODEC`
+    """
+    mocker.patch("app.repositories.buckets.ci_schema_bucket_repository.settings.CI_SCHEMA_STORAGE_CODEC", "gzip")
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+
+    CiSchemaBucketRepository(bucket_loader).store_ci_schema("guid.json", schema)
+
+    uploaded_data = blob.upload_from_string.call_args[0][0]
+    assert blob.content_encoding == "gzip"
+    assert CiSchemaCodecService.decode(uploaded_data) == schema
+
+
+def test_open_ci_schema_writer_opens_chunked_upload():
+    """
+    `open_ci_schema_writer` should open a resumable upload of `CI_UPLOAD_CHUNK_SIZE` parts with the content encoding
+    """
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+
+    writer = CiSchemaBucketRepository(bucket_loader).open_ci_schema_writer("uploads/guid.json", "gzip")
+
+    assert writer == blob.open.return_value
+    assert blob.content_encoding == "gzip"
+    blob.open.assert_called_once_with("wb", chunk_size=1024 * 1024, content_type="application/json")
+
+
+def test_retrieve_ci_schema_decodes_raw_download():
+    """
+    `retrieve_ci_schema` should download the blob without transcoding and decode it
+    """
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+    blob.download_as_bytes.return_value = gzip.compress(json.dumps(schema).encode("utf-8"))
+
+    assert CiSchemaBucketRepository(bucket_loader).retrieve_ci_schema("guid.json") == schema
+    blob.download_as_bytes.assert_called_once_with(raw_download=True)
+
+
+
+@pytest.mark.parametrize("codec", [codec for codec in CI_SCHEMA_CODECS if codec != "zstd" or zstandard is not None])
+def test_stream_compressor_output_decodes_with_any_codec(codec):
+    """
+    A schema compressed in chunks as it is streamed should decode back to the original schema
+    """
+    data = json.dumps(schema).encode("utf-8")
+    compressor, content_encoding = CiSchemaCodecService.stream_compressor(codec, compression_level=6)
+    if compressor is None:
+        stored = data
+    else:
+        stored = b"".join(compressor.compress(data[start : start + 5]) for start in range(0, len(data), 5))
+        stored += compressor.flush()
+
+    assert CiSchemaCodecService.decode(stored) == schema
+    assert content_encoding == {"gzip": "gzip", "zstd": "zstd"}.get(codec)
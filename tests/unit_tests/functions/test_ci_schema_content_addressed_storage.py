@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from app.models.responses import CiMetadataRecord
+from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
+from app.services.ci_schema_codec_service import CiSchemaCodecService
+from app.services.ci_schema_location_service import CiSchemaLocationService
+from tests.test_data.ci_test_data import mock_ci_metadata, mock_id
+
+schema = {"survey_id": "123", "title": "title", "sections": [{"id": "section-1"}]}
+
+
+def test_schema_hash_does_not_depend_on_key_order():
+    reordered_schema = {"sections": [{"id": "section-1"}], "title": "title", "survey_id": "123"}
+
+    assert CiSchemaLocationService.get_ci_schema_hash(schema) == CiSchemaLocationService.get_ci_schema_hash(
+        reordered_schema
+    )
+    assert CiSchemaLocationService.get_ci_schema_hash(schema) != CiSchemaLocationService.get_ci_schema_hash(
+        {**schema, "title": "other title"}
+    )
+
+
+def test_schema_location_uses_schema_hash_if_set():
+    ci_metadata = CiMetadataRecord.from_document({**mock_ci_metadata.model_dump(), "schema_hash": "hash"})
+
+    assert CiSchemaLocationService.get_ci_schema_location(ci_metadata) == "schemas/hash.json"
+    assert CiSchemaLocationService.get_ci_schema_location(mock_ci_metadata) == f"{mock_id}.json"
+
+
+def test_store_content_addressed_ci_schema_skips_upload_if_stored():
+    """
+    A schema already stored should only be marked as referenced
+    """
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+    blob.size = 100
+
+    size = CiSchemaBucketRepository(bucket_loader).store_content_addressed_ci_schema("schemas/hash.json", schema)
+
+    assert size == 100
+    blob.patch.assert_called_once()
+    assert "referenced_at" in blob.metadata
+    blob.upload_from_string.assert_not_called()
+
+
+def test_store_content_addressed_ci_schema_uploads_if_not_stored():
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+    blob.patch.side_effect = NotFound("schemas/hash.json")
+
+    size = CiSchemaBucketRepository(bucket_loader).store_content_addressed_ci_schema("schemas/hash.json", schema)
+
+    uploaded_data = blob.upload_from_string.call_args.args[0]
+    assert CiSchemaCodecService.decode(uploaded_data) == schema
+    assert blob.upload_from_string.call_args.kwargs["if_generation_match"] == 0
+    assert size == len(uploaded_data)
+
+
+def test_store_content_addressed_ci_schema_uses_schema_stored_concurrently():
+    """
+    If the same content is stored by another request after the check, its size should be returned
+    """
+    bucket_loader = Mock()
+    blob = bucket_loader.get_ci_schema_bucket.return_value.blob.return_value
+    blob.patch.side_effect = NotFound("schemas/hash.json")
+    blob.upload_from_string.side_effect = PreconditionFailed("schemas/hash.json")
+    blob.size = 100
+
+    size = CiSchemaBucketRepository(bucket_loader).store_content_addressed_ci_schema("schemas/hash.json", schema)
+
+    blob.reload.assert_called_once()
+    assert size == 100
@@ -0,0 +1,63 @@
+import json
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.cloud import storage
+
+from app.repositories.buckets.bucket_loader import BucketLoader
+from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
+
+SIGNER_EMAIL = "ci-schema-signer@mock-project-id.iam.gserviceaccount.com"
+
+
+@pytest.fixture
+def signing_key_file(tmp_path, mocker):
+    """
+    A service account key file with a freshly generated private key, so urls are signed as they are in production
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_file = tmp_path / "signing-key.json"
+    key_file.write_text(
+        json.dumps(
+            {
+                "type": "service_account",
+                "project_id": "mock-project-id",
+                "private_key_id": "mock-key-id",
+                "private_key": private_key.private_bytes(
+                    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+                ).decode("utf-8"),
+                "client_email": SIGNER_EMAIL,
+                "token_uri": "https://oauth2.googleapis.com/token",
+            }
+        )
+    )
+    mocker.patch("app.repositories.buckets.bucket_loader.settings.CI_SCHEMA_SIGNING_KEY_FILE", str(key_file))
+    return key_file
+
+
+def test_generate_ci_schema_signed_url_signs_locally(signing_key_file):
+    """
+    `generate_ci_schema_signed_url` should sign a V4 url with the local key, without calling the bucket
+    """
+    # An anonymous client never makes a request, so any attempt to reach the bucket or the IAM API would fail
+    storage_client = Mock(get_bucket=Mock(return_value=storage.Client.create_anonymous_client().bucket("ci-bucket")))
+
+    signed_url = CiSchemaBucketRepository(BucketLoader(storage_client)).generate_ci_schema_signed_url("guid.json")
+
+    url = urlparse(signed_url)
+    query = parse_qs(url.query)
+    assert url.path == "/ci-bucket/guid.json"
+    assert query["X-Goog-Algorithm"] == ["GOOG4-RSA-SHA256"]
+    assert query["X-Goog-Credential"][0].startswith(f"{SIGNER_EMAIL}/")
+    assert query["X-Goog-Expires"] == ["300"]
+    assert query["X-Goog-Signature"]
+
+
+def test_signing_credentials_are_loaded_once(signing_key_file):
+    bucket_loader = BucketLoader(Mock())
+
+    assert bucket_loader.get_ci_schema_signing_credentials() is bucket_loader.get_ci_schema_signing_credentials()
+    assert bucket_loader.get_ci_schema_signing_credentials().service_account_email == SIGNER_EMAIL
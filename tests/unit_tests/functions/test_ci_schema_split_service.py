@@ -0,0 +1,79 @@
+from unittest.mock import Mock
+
+from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
+from app.services.ci_schema_codec_service import CiSchemaCodecService
+from app.services.ci_schema_split_service import CiSchemaSplitService
+
+schema = {
+    "survey_id": "123",
+    "title": "title",
+    "metadata": [{"name": "user_id", "type": "string"}],
+    "sections": [{"id": "section-1"}],
+}
+manifest = {
+    "split_fields": ["sections", "metadata"],
+    "schema": {"survey_id": "123", "title": "title"},
+}
+
+
+def test_split_ci_schema_splits_out_fields_present_in_schema():
+    split_fields, split_manifest = CiSchemaSplitService.split_ci_schema(schema, ["sections", "metadata", "navigation"])
+
+    assert split_fields == {"sections": schema["sections"], "metadata": schema["metadata"]}
+    assert split_manifest == manifest
+
+
+def test_join_ci_schema_rebuilds_schema():
+    split_fields, split_manifest = CiSchemaSplitService.split_ci_schema(schema, ["sections", "metadata"])
+
+    assert CiSchemaSplitService.join_ci_schema(split_manifest, split_fields) == schema
+
+
+def test_get_split_fields_needed_only_returns_split_fields_pointers_refer_to():
+    """
+    Fields held in the manifest should never need another blob to be read
+    """
+    pointers = ["/sections/0/id", "/survey_id", "/sections/0", "/missing"]
+
+    assert CiSchemaSplitService.get_split_fields_needed(manifest, pointers) == ["sections"]
+
+
+def test_get_split_fields_needed_returns_none_if_whole_schema_is_needed():
+    assert CiSchemaSplitService.get_split_fields_needed(manifest, ["/sections", ""]) is None
+
+
+def test_store_split_ci_schema_stores_fields_before_manifest(mocker):
+    mocker.patch(
+        "app.repositories.buckets.ci_schema_bucket_repository.settings.CI_SCHEMA_SPLIT_FIELDS", ["sections", "metadata"]
+    )
+    bucket_loader = Mock()
+    bucket = bucket_loader.get_ci_schema_bucket.return_value
+
+    CiSchemaBucketRepository(bucket_loader).store_split_ci_schema("guid", schema)
+
+    assert [call.args[0] for call in bucket.blob.call_args_list] == [
+        "guid/fields/sections.json",
+        "guid/fields/metadata.json",
+        "guid/manifest.json",
+    ]
+    uploaded_manifest = bucket.blob.return_value.upload_from_string.call_args_list[-1].args[0]
+    assert CiSchemaCodecService.decode(uploaded_manifest) == manifest
+
+
+def test_delete_split_ci_schema_deletes_manifest_first():
+    """
+    The manifest should be deleted before the fields it lists, so they are never read once partly deleted
+    """
+    bucket_loader = Mock()
+    bucket = bucket_loader.get_ci_schema_bucket.return_value
+    deleted = []
+    blobs = [Mock(), Mock(), Mock()]
+    for blob, name in zip(blobs, ["guid/fields/metadata.json", "guid/fields/sections.json", "guid/manifest.json"]):
+        blob.name = name
+        blob.delete.side_effect = lambda name=name: deleted.append(name)
+    bucket.list_blobs.return_value = blobs
+
+    CiSchemaBucketRepository(bucket_loader).delete_split_ci_schema("guid")
+
+    bucket.list_blobs.assert_called_once_with(prefix="guid/")
+    assert deleted == ["guid/manifest.json", "guid/fields/metadata.json", "guid/fields/sections.json"]
@@ -0,0 +1,152 @@
+import gzip
+import json
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.compression import CompressionMiddleware, accepts_encoding, get_preferred_encoding
+from tests.test_config.endpoints import ENDPOINTS, GET_CI_METADATA, GET_CI_SCHEMA, GET_STATUS
+from tests.test_config.endpoints_loader import EndpointsLoader
+from tests.test_data.ci_test_data import mock_ci_metadata, mock_id
+
+endpoints_loader = EndpointsLoader(ENDPOINTS)
+
+mock_large_ci_metadata_list = [mock_ci_metadata.model_copy(update={"guid": str(guid)}) for guid in range(50)]
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "encoding", "expected"),
+    [
+        ("gzip, deflate", "gzip", True),
+        ("br;q=1.0, gzip;q=0.5", "gzip", True),
+        ("br;q=1.0, gzip;q=0.5", "br", True),
+        ("*", "br", True),
+        ("gzip;q=0", "gzip", False),
+        ("gzip; q = 0.0", "gzip", False),
+        ("*, gzip;q=0", "gzip", False),
+        ("gzip;q=0, *", "gzip", False),
+        ("*;q=0", "br", False),
+        ("gzip;q=invalid", "gzip", False),
+        ("gzip;q=2", "gzip", False),
+        ("gzip", "br", False),
+        ("identity", "gzip", False),
+        ("", "gzip", False),
+    ],
+)
+def test_accepts_encoding(accept_encoding, encoding, expected):
+    assert accepts_encoding(accept_encoding, encoding) is expected
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip;q=0.5, br;q=0.8", "br"),
+        ("gzip;q=1, *;q=0.1", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("identity", None),
+    ],
+)
+def test_get_preferred_encoding(accept_encoding, expected):
+    """
+    The coding with the highest quality should be preferred, brotli being used if qualities are equal
+    """
+    assert get_preferred_encoding(accept_encoding, ("br", "gzip")) == expected
+
+
+@pytest.fixture
+def compressed_test_client(test_client):
+    """
+    Response compression is disabled by default, so the app is wrapped in the middleware for these tests
+    """
+    compressed_app = CompressionMiddleware(
+        test_client.app,
+        minimum_size=settings.RESPONSE_COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
+    yield TestClient(compressed_app)
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_all_ci_metadata_collection")
+class TestCompressionMiddleware:
+    """Tests for compressing responses with the `CompressionMiddleware`"""
+
+    metadata_url = endpoints_loader.get_url(GET_CI_METADATA)
+
+    @pytest.mark.parametrize(
+        ("accept_encoding", "content_encoding"), [("gzip, br", "br"), ("gzip", "gzip"), ("br;q=0.5, gzip", "gzip")]
+    )
+    def test_large_response_is_compressed(
+        self, mocked_get_all_ci_metadata_collection, accept_encoding, content_encoding, compressed_test_client
+    ):
+        """
+        Responses over the minimum size should be compressed with the coding the client prefers, brotli if it has
+        no preference
+        """
+        mocked_get_all_ci_metadata_collection.return_value = mock_large_ci_metadata_list
+
+        response = compressed_test_client.get(self.metadata_url, headers={"Accept-Encoding": accept_encoding})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == content_encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == [ci_metadata.model_dump() for ci_metadata in mock_large_ci_metadata_list]
+
+    def test_response_is_not_compressed_for_other_clients(
+        self, mocked_get_all_ci_metadata_collection, compressed_test_client
+    ):
+        mocked_get_all_ci_metadata_collection.return_value = mock_large_ci_metadata_list
+
+        response = compressed_test_client.get(self.metadata_url, headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+
+    def test_small_response_is_not_compressed(self, mocked_get_all_ci_metadata_collection, compressed_test_client):
+        """
+        Responses under the minimum size should be sent uncompressed
+        """
+        response = compressed_test_client.get(
+            endpoints_loader.get_url(GET_STATUS), headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        assert "content-encoding" not in response.headers
+
+    def test_response_is_not_compressed_by_default(self, mocked_get_all_ci_metadata_collection, test_client):
+        """
+        Response compression is disabled unless `RESPONSE_COMPRESSION_ENABLED` is set
+        """
+        mocked_get_all_ci_metadata_collection.return_value = mock_large_ci_metadata_list
+
+        response = test_client.get(self.metadata_url, headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_ci_metadata_with_id")
+@patch("app.repositories.buckets.ci_schema_bucket_repository.CiSchemaBucketRepository.retrieve_raw_ci_schema")
+@patch("app.routers.ci_router_restful.settings.CI_SCHEMA_STORAGE_CODEC", "gzip")
+def test_stored_gzip_schema_is_not_compressed_again(
+    mocked_retrieve_raw_ci_schema, mocked_get_ci_metadata_with_id, compressed_test_client
+):
+    """
+    Schemas sent as stored gzipped should not be compressed again, even for clients preferring brotli
+    """
+    schema = {"questions": ["How many employees?"] * 500}
+    gzipped_schema = gzip.compress(json.dumps(schema).encode("utf-8"))
+    mocked_get_ci_metadata_with_id.return_value = mock_ci_metadata
+    mocked_retrieve_raw_ci_schema.return_value = gzipped_schema
+
+    response = compressed_test_client.get(
+        f"{ENDPOINTS[GET_CI_SCHEMA]['url']}?{urlencode({'guid': mock_id})}", headers={"Accept-Encoding": "gzip, br"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == schema
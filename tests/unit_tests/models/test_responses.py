@@ -2,7 +2,7 @@ import datetime
 import uuid
 
 from app.config import Settings
-from app.models.responses import CiMetadata
+from app.models.responses import CiMetadata, CiMetadataRecord
 
 settings = Settings()
 
@@ -93,3 +93,65 @@ class TestCiMetadata:
 
         assert "sds_schema" not in model_dict
         assert "published_at" not in model_dict
+
+    def test_model_dump_excludes_schema_hash(self):
+        """
+        The hash of a content-addressed schema is internal, so it should never be stored with `model_dump` or
+        returned to the user
+        """
+        ci_metadata = CiMetadata(
+            ci_version=mock_ci_version,
+            validator_version=mock_validator_version,
+            data_version=mock_data_version,
+            classifier_type=mock_classifier_type,
+            classifier_value=mock_classifier_value,
+            guid=mock_id,
+            language=mock_language,
+            published_at=mock_published_at,
+            survey_id=mock_survey_id,
+            title=mock_title,
+            schema_hash="hash",
+        )
+
+        assert "schema_hash" not in ci_metadata.model_dump()
+
+
+class TestCiMetadataRecord:
+    """Tests for the `CiMetadataRecord` internal metadata representation"""
+
+    ci_metadata = CiMetadata(
+        ci_version=1,
+        validator_version=mock_validator_version,
+        data_version=mock_data_version,
+        classifier_type=mock_classifier_type,
+        classifier_value=mock_classifier_value,
+        guid=mock_id,
+        language=mock_language,
+        published_at=mock_published_at,
+        survey_id=mock_survey_id,
+        title=mock_title,
+    )
+
+    def test_model_dump_matches_ci_metadata(self):
+        """
+        `model_dump` should return the same dictionary as `CiMetadata`, with and without `sds_schema`
+        """
+        ci_metadata_with_sds_schema = self.ci_metadata.model_copy(update={"sds_schema": mock_sds_schema})
+
+        for ci_metadata in (self.ci_metadata, ci_metadata_with_sds_schema):
+            record = CiMetadataRecord.from_document(ci_metadata.model_dump())
+            assert record.model_dump() == ci_metadata.model_dump()
+
+    def test_from_document_ignores_additional_fields(self):
+        """
+        Fields stored in the document that are not part of the metadata should be ignored
+        """
+        record = CiMetadataRecord.from_document({**self.ci_metadata.model_dump(), "schema_size": 100})
+
+        assert record.model_dump() == self.ci_metadata.model_dump()
+
+    def test_from_document_reads_schema_hash(self):
+        record = CiMetadataRecord.from_document({**self.ci_metadata.model_dump(), "schema_hash": "hash"})
+
+        assert record.schema_hash == "hash"
+        assert record.model_dump() == self.ci_metadata.model_dump()
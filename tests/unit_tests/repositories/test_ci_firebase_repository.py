@@ -1,6 +1,12 @@
+from datetime import timedelta
+
+import pytest
+from google.cloud.firestore import DELETE_FIELD, Increment
+
 from app.config import settings
-from app.models.responses import CiValidatorMetadata
-from app.repositories.firebase.ci_firebase_repository import CiFirebaseRepository
+from app.models.responses import CiMetadataRecord, CiValidatorMetadata
+from app.repositories.firebase.ci_firebase_repository import CHANGE_SEQUENCE_DOCUMENT_ID, CiFirebaseRepository
+from app.services.datetime_service import DatetimeService
 from tests.test_data.ci_test_data import (
     mock_ci_metadata,
     mock_classifier_type,
@@ -9,9 +15,16 @@ from tests.test_data.ci_test_data import (
     mock_language,
     mock_next_version_ci_metadata,
     mock_next_version_id,
+    mock_published_at,
     mock_survey_id,
 )
 
+LATEST_DOCUMENT_ID = CiFirebaseRepository.latest_document_id(
+    mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language
+)
+SURVEY_SUMMARY_DOCUMENT_ID = CiFirebaseRepository.survey_summary_document_id(mock_survey_id)
+SCHEMA_SIZE = 1234
+
 
 class TestCiFirebaseRepository:
     """
@@ -31,7 +44,7 @@ class TestCiFirebaseRepository:
 
         found_ci = mock_ci_firebase_repository.get_ci_metadata_collection_with_survey_id(mock_survey_id)
 
-        assert found_ci == [mock_ci_metadata]
+        assert [ci.model_dump() for ci in found_ci] == [mock_ci_metadata.model_dump()]
 
     def test_query_ci_by_survey_id_returns_multiple_ci_if_found(self, firestore_mock, bucket_mock, mock_firestore_collection):
         """
@@ -47,7 +60,10 @@ class TestCiFirebaseRepository:
 
         found_ci = mock_ci_firebase_repository.get_ci_metadata_collection_with_survey_id(mock_survey_id)
 
-        assert found_ci == [mock_next_version_ci_metadata, mock_ci_metadata]
+        assert [ci.model_dump() for ci in found_ci] == [
+            mock_next_version_ci_metadata.model_dump(),
+            mock_ci_metadata.model_dump(),
+        ]
 
     def test_query_ci_by_survey_id_returns_empty_list_if_ci_not_found(self, firestore_mock, bucket_mock, mock_firestore_collection):
         """
@@ -80,6 +96,27 @@ class TestCiFirebaseRepository:
 
         assert latest_ci_metadata.ci_version == 2
 
+    def test_query_latest_ci_version_reads_latest_version_document(
+        self, firestore_mock, bucket_mock, mock_firestore_collection, mock_firestore_latest_collection
+    ):
+        """
+        `get_latest_ci_metadata` should read the latest version from its document rather than querying every
+        version if the document exists
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document().set(mock_ci_metadata.__dict__)
+        mock_firestore_collection.document().set(mock_next_version_ci_metadata.__dict__)
+        mock_firestore_latest_collection.document(LATEST_DOCUMENT_ID).set(mock_ci_metadata.model_dump())
+
+        latest_ci_metadata = mock_ci_firebase_repository.get_latest_ci_metadata(
+            mock_survey_id,
+            mock_classifier_type,
+            mock_classifier_value,
+            mock_language,
+        )
+
+        assert latest_ci_metadata == mock_ci_metadata
+
     def test_query_latest_ci_version_returns_0(self, firestore_mock, bucket_mock, mock_firestore_collection):
         """
         `get_latest_ci_metadata` should return None if no ci metadata is found for a given
@@ -154,3 +191,477 @@ class TestCiFirebaseRepository:
         ci_metadata = mock_ci_firebase_repository.get_ci_metadata_with_id("wrong_guid")
 
         assert ci_metadata is None
+
+    def test_perform_new_streamed_ci_transaction_creates_metadata_and_copies_schema(
+        self, firestore_mock, bucket_mock, transaction_mock
+    ):
+        """
+        `perform_new_streamed_ci_transaction` should set the CI metadata in the transaction and copy the streamed
+        schema from its staging location to where it is stored
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        bucket = bucket_mock.get_ci_schema_bucket.return_value
+
+        mock_ci_firebase_repository.perform_new_streamed_ci_transaction(
+            mock_id, mock_ci_metadata, f"uploads/{mock_id}.json", f"{mock_id}.json", SCHEMA_SIZE
+        )
+
+        sequence_call, metadata_call, latest_call, survey_summary_call = transaction_mock.set.call_args_list
+        assert sequence_call.args[1] == {"last_position": 1}
+        assert metadata_call.args[1] == {
+            **mock_ci_metadata.model_dump(),
+            "event_type": "ci_created",
+            "updated_at": mock_published_at,
+            "change_position": 1,
+            "schema_size": SCHEMA_SIZE,
+        }
+        assert latest_call.args[0].id == LATEST_DOCUMENT_ID
+        assert latest_call.args[1] == mock_ci_metadata.model_dump()
+        assert survey_summary_call.args[0].id == SURVEY_SUMMARY_DOCUMENT_ID
+        assert survey_summary_call.kwargs == {"merge": True}
+        assert survey_summary_call.args[1] == {
+            "survey_id": mock_survey_id,
+            "version_count": Increment(1),
+            "schema_bytes": Increment(SCHEMA_SIZE),
+            "cis": {
+                LATEST_DOCUMENT_ID: {
+                    "classifier_type": mock_classifier_type,
+                    "classifier_value": mock_classifier_value,
+                    "language": mock_language,
+                    "latest_guid": mock_id,
+                    "latest_ci_version": mock_ci_metadata.ci_version,
+                    "version_count": Increment(1),
+                }
+            },
+        }
+        bucket.blob.assert_called_once_with(f"uploads/{mock_id}.json")
+        bucket.copy_blob.assert_called_once_with(bucket.blob.return_value, bucket, f"{mock_id}.json")
+
+    def test_perform_new_ci_transaction_stores_split_schema_if_enabled(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock
+    ):
+        mocker.patch("app.repositories.firebase.ci_firebase_repository.settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED", True)
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        store_split_ci_schema = mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "store_split_ci_schema")
+        ci = {"survey_id": mock_survey_id, "sections": []}
+
+        mock_ci_firebase_repository.perform_new_ci_transaction(mock_id, mock_ci_metadata, ci, f"{mock_id}.json")
+
+        store_split_ci_schema.assert_called_once_with(mock_id, ci)
+
+    def test_delete_ci_deletes_split_schema_after_commit(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        The split blobs of a CI should be deleted once the transaction deleting it has committed, as listing
+        them is too slow to repeat if the transaction is retried
+        """
+        mocker.patch("app.repositories.firebase.ci_firebase_repository.settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED", True)
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_split_ci_schema = mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "delete_split_ci_schema"
+        )
+        calls = mocker.Mock()
+        calls.attach_mock(transaction_mock._commit, "commit")
+        calls.attach_mock(delete_split_ci_schema, "delete_split_ci_schema")
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+        )
+
+        assert [call[0] for call in calls.mock_calls] == ["commit", "delete_split_ci_schema"]
+        delete_split_ci_schema.assert_called_once_with(mock_id)
+
+    def test_delete_ci_does_not_list_split_schema_if_disabled(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_split_ci_schema = mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "delete_split_ci_schema"
+        )
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+        )
+
+        delete_split_ci_schema.assert_not_called()
+
+    def test_perform_new_ci_transaction_stores_content_addressed_schema(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock
+    ):
+        """
+        A CI with a schema hash should have its schema stored at the hash, and the hash recorded on its metadata
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        store_content_addressed_ci_schema = mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "store_content_addressed_ci_schema", return_value=SCHEMA_SIZE
+        )
+        ci_metadata = mock_ci_metadata.model_copy(update={"schema_hash": "hash"})
+        ci = {"survey_id": mock_survey_id}
+
+        mock_ci_firebase_repository.perform_new_ci_transaction(mock_id, ci_metadata, ci, "schemas/hash.json")
+
+        store_content_addressed_ci_schema.assert_called_once_with("schemas/hash.json", ci)
+        _, metadata_call, latest_call, _ = transaction_mock.set.call_args_list
+        assert metadata_call.args[1]["schema_hash"] == "hash"
+        assert latest_call.args[1]["schema_hash"] == "hash"
+
+    def test_latest_ci_metadata_keeps_schema_hash(
+        self,
+        mocker,
+        firestore_mock,
+        bucket_mock,
+        transaction_mock,
+        mock_firestore_latest_collection,
+    ):
+        """
+        The latest version of a content-addressed CI should be read back with its schema hash, so the location of
+        its schema can be resolved from it
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "store_content_addressed_ci_schema", return_value=SCHEMA_SIZE
+        )
+        ci_metadata = mock_ci_metadata.model_copy(update={"schema_hash": "hash"})
+        mock_ci_firebase_repository.perform_new_ci_transaction(
+            mock_id, ci_metadata, {"survey_id": mock_survey_id}, "schemas/hash.json"
+        )
+
+        # The transaction mock only records writes, so the latest version document is written here
+        latest_reference, latest_document = next(
+            call.args for call in transaction_mock.set.call_args_list if call.args[0].id == LATEST_DOCUMENT_ID
+        )
+        mock_firestore_latest_collection.document(latest_reference.id).set(latest_document)
+
+        latest_ci_metadata = mock_ci_firebase_repository.get_latest_ci_metadata(
+            mock_survey_id, mock_classifier_type, mock_classifier_value, mock_language
+        )
+        latest_ci_metadata_collection = mock_ci_firebase_repository.get_latest_ci_metadata_collection(mock_survey_id)
+
+        assert latest_ci_metadata.schema_hash == "hash"
+        assert [ci_metadata.schema_hash for ci_metadata in latest_ci_metadata_collection] == ["hash"]
+
+    def test_delete_ci_leaves_content_addressed_schema(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        A content-addressed schema may be shared with other CIs, so it should not be deleted with the CI
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_ci_schema = mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "delete_ci_schema")
+        mock_firestore_collection.document(mock_id).set({**mock_ci_metadata.model_dump(), "schema_hash": "hash"})
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document({**mock_ci_metadata.model_dump(), "schema_hash": "hash"})]
+        )
+
+        transaction_mock.delete.assert_called()
+        delete_ci_schema.assert_not_called()
+
+    def test_update_ci_metadata_records_update(self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection):
+        """
+        `update_ci_metadata` should record when the CI was updated for the change feed
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.update_ci_metadata(mock_id, mock_ci_metadata)
+
+        document_reference, document = transaction_mock.update.call_args.args
+        assert document_reference.id == mock_id
+        assert document["event_type"] == "ci_updated"
+        assert document["updated_at"] == mock_published_at
+        assert document["change_position"] == 1
+        # Only the position of the change is reserved, as the CI is not the latest version
+        transaction_mock.set.assert_called_once()
+
+    def test_update_ci_metadata_updates_latest_version(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection, mock_firestore_latest_collection
+    ):
+        """
+        Updating the latest version of a CI should update the latest version document in the same transaction
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+        mock_firestore_latest_collection.document(LATEST_DOCUMENT_ID).set(mock_ci_metadata.model_dump())
+        updated_ci_metadata = mock_ci_metadata.model_copy(update={"validator_version": "0.0.2"})
+
+        mock_ci_firebase_repository.update_ci_metadata(mock_id, updated_ci_metadata)
+
+        latest_reference, latest_ci_metadata = transaction_mock.set.call_args.args
+        assert latest_reference.id == LATEST_DOCUMENT_ID
+        assert latest_ci_metadata == updated_ci_metadata.model_dump()
+
+    def test_update_ci_metadata_records_schema_size_in_same_transaction(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        Storing a new schema for a CI should record its size, and change the survey summary total by the
+        difference in size, in the transaction updating its metadata
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set({**mock_ci_metadata.model_dump(), "schema_size": 1000})
+
+        mock_ci_firebase_repository.update_ci_metadata(mock_id, mock_ci_metadata, SCHEMA_SIZE)
+
+        firestore_mock.set_transaction.assert_called_once()
+        transaction_mock.update.assert_called_once()
+        assert transaction_mock.update.call_args.args[1]["schema_size"] == SCHEMA_SIZE
+        survey_summary_reference, survey_summary_changes = transaction_mock.set.call_args.args
+        assert survey_summary_reference.id == SURVEY_SUMMARY_DOCUMENT_ID
+        assert survey_summary_changes == {"survey_id": mock_survey_id, "schema_bytes": Increment(SCHEMA_SIZE - 1000)}
+
+    def test_update_ci_metadata_leaves_schema_size_if_schema_not_stored(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set({**mock_ci_metadata.model_dump(), "schema_size": 1000})
+
+        mock_ci_firebase_repository.update_ci_metadata(mock_id, mock_ci_metadata)
+
+        assert "schema_size" not in transaction_mock.update.call_args.args[1]
+        assert SURVEY_SUMMARY_DOCUMENT_ID not in [call.args[0].id for call in transaction_mock.set.call_args_list]
+
+    def test_update_validator_version_and_ci_updates_schema_size_with_metadata(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        The schema is stored before the metadata is updated, so its size is recorded in the same transaction,
+        and a failed update leaves the survey summary as it was
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "store_ci_schema", return_value=SCHEMA_SIZE)
+        mock_firestore_collection.document(mock_id).set({**mock_ci_metadata.model_dump(), "schema_size": 1000})
+        transaction_mock._commit.side_effect = Exception("commit failed")
+
+        with pytest.raises(Exception, match="commit failed"):
+            mock_ci_firebase_repository.update_validator_version_and_ci({"survey_id": mock_survey_id}, mock_ci_metadata)
+
+        firestore_mock.set_transaction.assert_called_once()
+        transaction_mock._commit.assert_called_once()
+        assert transaction_mock.update.call_args.args[1]["schema_size"] == SCHEMA_SIZE
+        survey_summary_changes = transaction_mock.set.call_args.args[1]
+        assert survey_summary_changes["schema_bytes"] == Increment(SCHEMA_SIZE - 1000)
+
+    def test_delete_ci_leaves_tombstone(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_tombstone_collection
+    ):
+        """
+        Deleting a CI should write a tombstone with its metadata, expiring after `CI_TOMBSTONE_RETENTION_DAYS`
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        ci_metadata_record = CiMetadataRecord.from_document(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.delete_ci_metadata_collection_in_transaction(transaction_mock, ci_metadata_record, 2)
+
+        transaction_mock.delete.assert_called_once()
+        tombstone_reference, tombstone = transaction_mock.set.call_args.args
+        assert tombstone_reference.id == mock_id
+        assert tombstone == {
+            **mock_ci_metadata.model_dump(),
+            "event_type": "ci_deleted",
+            "updated_at": mock_published_at,
+            "change_position": 2,
+            "expire_at": DatetimeService.get_current_date_and_time() + timedelta(days=settings.CI_TOMBSTONE_RETENTION_DAYS),
+        }
+
+    def test_reserve_change_positions_continues_from_last_position(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_change_sequence_collection
+    ):
+        """
+        Positions in the change feed should follow the last position reserved, and the sequence document should
+        be moved past every position reserved
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_change_sequence_collection.document(CHANGE_SEQUENCE_DOCUMENT_ID).set({"last_position": 41})
+
+        change_positions = mock_ci_firebase_repository.reserve_change_positions_in_transaction(transaction_mock, 3)
+
+        assert list(change_positions) == [42, 43, 44]
+        sequence_reference, sequence = transaction_mock.set.call_args.args
+        assert sequence_reference.id == CHANGE_SEQUENCE_DOCUMENT_ID
+        assert sequence == {"last_position": 44}
+
+    def test_delete_ci_replaces_latest_version_with_previous_version(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        Deleting the latest version of a CI should make the previous version the latest in the same transaction
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+        mock_firestore_collection.document(mock_next_version_id).set(
+            {**mock_next_version_ci_metadata.model_dump(), "schema_size": SCHEMA_SIZE}
+        )
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_next_version_ci_metadata.model_dump())]
+        )
+
+        latest_reference, latest_ci_metadata = transaction_mock.set.call_args_list[-2].args
+        assert latest_reference.id == LATEST_DOCUMENT_ID
+        assert latest_ci_metadata == mock_ci_metadata.model_dump()
+
+        survey_summary_reference, survey_summary_changes = transaction_mock.set.call_args_list[-1].args
+        assert survey_summary_reference.id == SURVEY_SUMMARY_DOCUMENT_ID
+        assert survey_summary_changes["version_count"] == Increment(-1)
+        assert survey_summary_changes["schema_bytes"] == Increment(-SCHEMA_SIZE)
+        assert survey_summary_changes["cis"][LATEST_DOCUMENT_ID]["latest_guid"] == mock_id
+        assert survey_summary_changes["cis"][LATEST_DOCUMENT_ID]["version_count"] == Increment(-1)
+
+    def test_delete_only_ci_version_removes_latest_version(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+        )
+
+        deleted_references = [call.args[0].id for call in transaction_mock.delete.call_args_list]
+        assert deleted_references == [mock_id, LATEST_DOCUMENT_ID]
+
+        survey_summary_changes = transaction_mock.set.call_args_list[-1].args[1]
+        assert survey_summary_changes["version_count"] == Increment(-1)
+        # CIs created before schema sizes were recorded are taken off the survey summary as empty
+        assert survey_summary_changes["schema_bytes"] == Increment(0)
+        assert survey_summary_changes["cis"] == {LATEST_DOCUMENT_ID: DELETE_FIELD}
+
+    def test_delete_ci_collection_deletes_every_ci_in_one_transaction(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        Every CI of a survey should be deleted in a single transaction, with one write to the survey summary,
+        and their schemas deleted from the bucket once it has committed
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_ci_schema = mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "delete_ci_schema")
+        calls = mocker.Mock()
+        calls.attach_mock(transaction_mock._commit, "commit")
+        calls.attach_mock(delete_ci_schema, "delete_ci_schema")
+        other_language_ci_metadata = mock_next_version_ci_metadata.model_copy(update={"language": "other_language"})
+        mock_firestore_collection.document(mock_id).set({**mock_ci_metadata.model_dump(), "schema_size": SCHEMA_SIZE})
+        mock_firestore_collection.document(mock_next_version_id).set(
+            {**other_language_ci_metadata.model_dump(), "schema_size": SCHEMA_SIZE}
+        )
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [
+                CiMetadataRecord.from_document(mock_ci_metadata.model_dump()),
+                CiMetadataRecord.from_document(other_language_ci_metadata.model_dump()),
+            ]
+        )
+
+        firestore_mock.set_transaction.assert_called_once()
+        transaction_mock._commit.assert_called_once()
+        assert [call[0] for call in calls.mock_calls] == ["commit", "delete_ci_schema", "delete_ci_schema"]
+
+        other_language_latest_document_id = CiFirebaseRepository.latest_document_id(
+            mock_survey_id, mock_classifier_type, mock_classifier_value, "other_language"
+        )
+        deleted_references = [call.args[0].id for call in transaction_mock.delete.call_args_list]
+        assert deleted_references == [mock_id, LATEST_DOCUMENT_ID, mock_next_version_id, other_language_latest_document_id]
+
+        sequence_reference, sequence = transaction_mock.set.call_args_list[0].args
+        assert sequence_reference.id == CHANGE_SEQUENCE_DOCUMENT_ID
+        assert sequence == {"last_position": 2}
+        summary_calls = [call for call in transaction_mock.set.call_args_list if call.args[0].id == SURVEY_SUMMARY_DOCUMENT_ID]
+        assert len(summary_calls) == 1
+        survey_summary_changes = summary_calls[0].args[1]
+        assert survey_summary_changes["version_count"] == Increment(-2)
+        assert survey_summary_changes["schema_bytes"] == Increment(-2 * SCHEMA_SIZE)
+        assert survey_summary_changes["cis"] == {
+            LATEST_DOCUMENT_ID: DELETE_FIELD,
+            other_language_latest_document_id: DELETE_FIELD,
+        }
+
+    def test_delete_every_ci_version_removes_latest_version(
+        self, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        Deleting every version of a CI together should remove its latest version, rather than replace it with a
+        version deleted in the same transaction
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+        mock_firestore_collection.document(mock_next_version_id).set(mock_next_version_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [
+                CiMetadataRecord.from_document(mock_ci_metadata.model_dump()),
+                CiMetadataRecord.from_document(mock_next_version_ci_metadata.model_dump()),
+            ]
+        )
+
+        deleted_references = [call.args[0].id for call in transaction_mock.delete.call_args_list]
+        assert deleted_references == [mock_next_version_id, mock_id, LATEST_DOCUMENT_ID]
+        tombstone_positions = [
+            call.args[1]["change_position"] for call in transaction_mock.set.call_args_list if "change_position" in call.args[1]
+        ]
+        assert tombstone_positions == [1, 2]
+        survey_summary_changes = transaction_mock.set.call_args_list[-1].args[1]
+        assert survey_summary_changes["version_count"] == Increment(-2)
+        assert survey_summary_changes["cis"] == {LATEST_DOCUMENT_ID: DELETE_FIELD}
+
+    def test_delete_ci_leaves_schema_if_transaction_fails(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        A schema should only be deleted once the transaction deleting its CI has committed
+        """
+        mocker.patch("app.repositories.firebase.ci_firebase_repository.settings.CI_SCHEMA_SPLIT_STORAGE_ENABLED", True)
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_ci_schema = mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "delete_ci_schema")
+        delete_split_ci_schema = mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "delete_split_ci_schema"
+        )
+        transaction_mock._commit.side_effect = Exception("commit failed")
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        with pytest.raises(Exception, match="commit failed"):
+            mock_ci_firebase_repository.perform_delete_ci_transaction(
+                [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+            )
+
+        delete_ci_schema.assert_not_called()
+        delete_split_ci_schema.assert_not_called()
+
+    def test_delete_ci_already_deleted_writes_nothing(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        Repeating the delete of a CI that is no longer stored should not write a second tombstone or change the
+        survey summary again
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        delete_ci_schema = mocker.patch.object(mock_ci_firebase_repository.ci_bucket_repository, "delete_ci_schema")
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+        )
+
+        transaction_mock.delete.assert_not_called()
+        transaction_mock.set.assert_not_called()
+        delete_ci_schema.assert_not_called()
+
+    def test_delete_ci_logs_failure_to_delete_schema(
+        self, mocker, firestore_mock, bucket_mock, transaction_mock, mock_firestore_collection
+    ):
+        """
+        The CI is already deleted once the transaction has committed, so failing to delete its schema should
+        not fail the delete
+        """
+        mock_ci_firebase_repository = CiFirebaseRepository(firebase_loader=firestore_mock, bucket_loader=bucket_mock)
+        mocker.patch.object(
+            mock_ci_firebase_repository.ci_bucket_repository, "delete_ci_schema", side_effect=Exception("not found")
+        )
+        mock_firestore_collection.document(mock_id).set(mock_ci_metadata.model_dump())
+
+        mock_ci_firebase_repository.perform_delete_ci_transaction(
+            [CiMetadataRecord.from_document(mock_ci_metadata.model_dump())]
+        )
+
+        transaction_mock._commit.assert_called_once()
@@ -0,0 +1,40 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.telemetry.metrics import observe_backend_latency
+
+
+class TestObserveBackendLatency:
+    """Tests for the `observe_backend_latency` decorator"""
+
+    labels = {"component": "TestComponent", "method": "fetch"}
+
+    def test_records_latency_of_successful_call(self):
+        """
+        The decorated function's return value should be passed through and its duration recorded
+        """
+
+        @observe_backend_latency("TestComponent")
+        def fetch():
+            return "result"
+
+        before = REGISTRY.get_sample_value("cir_backend_call_duration_seconds_count", self.labels) or 0
+
+        assert fetch() == "result"
+        assert REGISTRY.get_sample_value("cir_backend_call_duration_seconds_count", self.labels) == before + 1
+
+    def test_records_latency_of_failed_call(self):
+        """
+        The duration of calls that raise should be recorded and the exception re-raised
+        """
+
+        @observe_backend_latency("TestComponent")
+        def fetch():
+            raise RuntimeError("backend unavailable")
+
+        before = REGISTRY.get_sample_value("cir_backend_call_duration_seconds_count", self.labels) or 0
+
+        with pytest.raises(RuntimeError):
+            fetch()
+
+        assert REGISTRY.get_sample_value("cir_backend_call_duration_seconds_count", self.labels) == before + 1
@@ -0,0 +1,63 @@
+import json
+import logging
+
+from app.telemetry.structured_logging import (
+    DebugSamplingFilter,
+    JsonFormatter,
+    TruncatingFormatter,
+    truncate_payload,
+)
+
+
+def make_record(message: str, *args, level: int = logging.DEBUG) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, message, args, None)
+
+
+class TestStructuredLogging:
+    def test_truncate_payload_keeps_short_messages(self):
+        """
+        Messages within the limit should be logged unchanged
+        """
+        assert truncate_payload("short", 10) == "short"
+        assert truncate_payload("x" * 100, 0) == "x" * 100
+
+    def test_truncate_payload_notes_dropped_characters(self):
+        """
+        Messages over the limit should be cut and record how much was dropped
+        """
+        assert truncate_payload("x" * 15, 10) == f"{'x' * 10}... [truncated 5 chars]"
+
+    def test_text_formatter_truncates_lazily_formatted_payload(self):
+        """
+        Large payloads passed as logging arguments should be truncated once formatted
+        """
+        record = make_record("get_schema data: %s", {"questionnaire": "x" * 1000})
+
+        formatted = TruncatingFormatter(max_payload_chars=50).format(record)
+
+        assert formatted.endswith("[truncated 988 chars]")
+        assert " - app.test - DEBUG - get_schema data: {'questionnaire': 'xxx" in formatted
+
+    def test_json_formatter_outputs_single_json_object(self):
+        """
+        The JSON formatter should output the level, logger and truncated message as one JSON object
+        """
+        record = make_record("Message published. %s", "success", level=logging.INFO)
+
+        log_entry = json.loads(JsonFormatter(max_payload_chars=10).format(record))
+
+        assert log_entry["level"] == "INFO"
+        assert log_entry["logger"] == "app.test"
+        assert log_entry["message"] == "Message pu... [truncated 16 chars]"
+        assert "exception" not in log_entry
+
+    def test_debug_sampling_filter_only_samples_debug_records(self, mocker):
+        """
+        DEBUG records should be dropped outside the sample while higher levels are always kept
+        """
+        mocker.patch("app.telemetry.structured_logging.random.random", return_value=0.5)
+        sampling_filter = DebugSamplingFilter(sample_rate=0.1)
+
+        assert not sampling_filter.filter(make_record("debug"))
+        assert sampling_filter.filter(make_record("info", level=logging.INFO))
+        assert DebugSamplingFilter(sample_rate=0.6).filter(make_record("debug"))
@@ -0,0 +1,96 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.repositories.buckets.ci_schema_bucket_repository import CiSchemaBucketRepository
+from app.telemetry.tracing import traced
+from tests.test_config.endpoints import ENDPOINTS, POST_CI
+from tests.test_config.endpoints_loader import EndpointsLoader
+from tests.test_data.ci_test_data import mock_id, mock_post_ci_schema, mock_survey_id
+
+endpoints_loader = EndpointsLoader(ENDPOINTS)
+
+
+class TestTraced:
+    """Tests for the `traced` decorator"""
+
+    def test_call_runs_inside_named_span(self, span_exporter):
+        """
+        The decorated function should run inside a span named after the component and function
+        """
+
+        @traced("TestComponent")
+        def fetch():
+            return "result"
+
+        assert fetch() == "result"
+        assert [span.name for span in span_exporter.get_finished_spans()] == ["TestComponent.fetch"]
+
+    def test_exception_is_recorded_on_span(self, span_exporter):
+        """
+        Exceptions should be recorded on the span and re-raised
+        """
+
+        @traced("TestComponent")
+        def fetch():
+            raise RuntimeError("backend unavailable")
+
+        with pytest.raises(RuntimeError):
+            fetch()
+
+        (span,) = span_exporter.get_finished_spans()
+        assert not span.status.is_ok
+        assert span.events[0].name == "exception"
+
+
+class TestRepositorySpans:
+    def test_store_ci_schema_span_has_blob_attributes(self, span_exporter):
+        """
+        Storing a schema should create a span recording the blob name and size
+        """
+        bucket_loader = Mock()
+        repository = CiSchemaBucketRepository(bucket_loader)
+
+        repository.store_ci_schema(f"{mock_id}.json", {"title": "schema"})
+
+        (span,) = span_exporter.get_finished_spans()
+        assert span.name == "CiSchemaBucketRepository.store_ci_schema"
+        assert span.attributes["ci.blob_name"] == f"{mock_id}.json"
+        assert span.attributes["ci.blob_size"] > 0
+
+
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.get_latest_ci_metadata")
+@patch("app.repositories.firebase.ci_firebase_repository.CiFirebaseRepository.perform_new_ci_transaction")
+class TestRequestSpans:
+    url = endpoints_loader.get_url(POST_CI)
+
+    def test_post_ci_creates_nested_spans(
+        self, mocked_perform_new_ci_transaction, mocked_get_latest_ci_metadata, span_exporter, test_client
+    ):
+        """
+        A POST should produce a server span for the route with the service spans nested below it,
+        breaking down classifier parsing, version calculation, the transaction and publishing
+        """
+        mocked_get_latest_ci_metadata.return_value = None
+
+        test_client.post(
+            self.url,
+            params={"validator_version": "0.0.1", "guid": mock_id},
+            json=mock_post_ci_schema.model_dump(),
+        )
+
+        spans = {span.name: span for span in span_exporter.get_finished_spans()}
+        server_span = spans[f"POST {self.url}"]
+        process_span = spans["CiProcessorService.process_raw_ci"]
+
+        assert server_span.attributes["http.response.status_code"] == 200
+        assert server_span.attributes["ci.guid"] == mock_id
+        assert process_span.parent.span_id == server_span.context.span_id
+        assert process_span.attributes["ci.survey_id"] == mock_survey_id
+        for child_span_name in (
+            "CiClassifierService.parse_classifier",
+            "CiProcessorService.build_next_version_ci_metadata",
+            "CiProcessorService.process_raw_ci_in_transaction",
+            "CiProcessorService.try_publish_ci_metadata_to_topic",
+        ):
+            assert spans[child_span_name].parent.span_id == process_span.context.span_id
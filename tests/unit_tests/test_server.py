@@ -0,0 +1,44 @@
+from app import server
+
+
+class TestServer:
+    """Tests for starting the application with a server profile"""
+
+    def test_development_profile_reloads(self, mocker):
+        """
+        The development profile should run a single reloading worker
+        """
+        mocker.patch("app.server.settings.SERVER_PROFILE", "development")
+        mocked_run = mocker.patch("app.server.uvicorn.run")
+
+        server.run()
+
+        mocked_run.assert_called_once_with("app.main:app", host="0.0.0.0", port=3030, reload=True)
+
+    def test_production_profile_is_tuned_from_settings(self, mocker):
+        """
+        The production profile should run multiple workers without reload, using the `SERVER_*` settings
+        """
+        mocker.patch("app.server.settings.SERVER_PROFILE", "production")
+        mocker.patch("app.server.settings.SERVER_WORKERS", 4)
+        mocked_run = mocker.patch("app.server.uvicorn.run")
+
+        server.run()
+
+        kwargs = mocked_run.call_args.kwargs
+        assert "reload" not in kwargs
+        assert kwargs["workers"] == 4
+        assert kwargs["loop"] == "uvloop"
+        assert kwargs["http"] == "httptools"
+        assert kwargs["timeout_keep_alive"] == 620
+        assert kwargs["timeout_graceful_shutdown"] == 10
+        # Forwarded headers are only trusted from uvicorn's default of the local host
+        assert "forwarded_allow_ips" not in kwargs
+
+    def test_production_profile_runs_single_worker_by_default(self, mocker):
+        mocker.patch("app.server.settings.SERVER_PROFILE", "production")
+        mocked_run = mocker.patch("app.server.uvicorn.run")
+
+        server.run()
+
+        assert mocked_run.call_args.kwargs["workers"] == 1
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+from scripts.benchmark_import_time import DEFERRED_MODULES
+
+
+def test_importing_app_does_not_import_deferred_modules():
+    """
+    The google cloud libraries and tracing SDK should only be imported when they are first used,
+    to keep cold starts fast
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "CONF": "unit"},
+    )
+
+    assert not [module for module in result.stdout.splitlines() if module.startswith(DEFERRED_MODULES)]